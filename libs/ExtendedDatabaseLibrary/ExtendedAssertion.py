@@ -0,0 +1,121 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from robot.api import logger
+from robot.api.deco import keyword
+
+PASS = 'PASS'
+FAIL = 'FAIL'
+
+
+def to_check(check) -> dict:
+    """
+    Returns the check as a dictionary of alias, sql and expected from a dictionary or a list.
+    """
+    if isinstance(check, dict):
+        return {'alias': check['alias'], 'sql': check['sql'], 'expected': check.get('expected')}
+    alias, sql, expected = check
+    return {'alias': alias, 'sql': sql, 'expected': expected}
+
+
+def compare_rows(rows, expected) -> bool:
+    """
+    Compares rows with the expected value as text.
+    A list of lists is compared with all rows, a list of values with the first column
+    and a value with the first column of the first row.
+    """
+    if isinstance(expected, (list, tuple)):
+        if expected and all(isinstance(row, (list, tuple)) for row in expected):
+            return [[str(value) for value in row] for row in rows] == \
+                   [[str(value) for value in row] for row in expected]
+        return [str(row[0]) for row in rows] == [str(value) for value in expected]
+    return bool(rows) and str(rows[0][0]) == str(expected)
+
+
+class ExtendedAssertion:
+
+    @keyword("Verify Queries In Parallel")
+    def verify_queries_in_parallel(self, checks, workers=4, fail_on_error=True):
+        """
+        Runs independent checks of (alias, sql, expected) at the same time on ``workers`` threads.
+        Each thread opens its own connection of the alias of `Connect Sql Server`, so the checks can use
+        different databases. See compare rules below.
+
+        | *Expected*         | *Compared with*                    |
+        | a list of lists    | all rows                           |
+        | a list of values   | the first column of all rows       |
+        | a value            | the first column of the first row  |
+
+        Returns the report of every check (alias, sql, expected, actual, status, seconds, error).
+        Fails with all failed checks if ``fail_on_error`` is true.
+
+        Example usage:
+        | @{check1} = | Create List | pgw | SELECT status FROM payment WHERE id = 1 | SUCCESS |
+        | @{check2} = | Create List | mysql | SELECT COUNT(*) FROM ledger WHERE batch_id = 20200701 | 500 |
+        | @{checks} = | Create List | ${check1} | ${check2} |
+        | ${report} = | Verify Queries In Parallel | ${checks} | workers=8 |
+        """
+
+        checks = [to_check(check) for check in checks]
+        report = [None] * len(checks)
+        pending = iter(enumerate(checks))
+        lock = threading.Lock()
+
+        def run(connections, check):
+            result = dict(check, actual=None, status=FAIL, seconds=0.0, error=None)
+            started = time.perf_counter()
+            connection = None
+            cur = None
+            try:
+                if check['alias'] not in connections:
+                    connections[check['alias']] = self._open_new_connection(check['alias'])
+                connection = connections[check['alias']]
+                cur = connection.cursor()
+                cur.execute(check['sql'])
+                rows = cur.fetchall()
+                result['actual'] = rows
+                result['status'] = PASS if compare_rows(rows, check['expected']) else FAIL
+            except Exception as exception:
+                result['error'] = str(exception)
+            finally:
+                if cur:
+                    cur.close()
+                    connection.rollback()
+            result['seconds'] = round(time.perf_counter() - started, 3)
+            return result
+
+        def work():
+            # a connection is closed by the thread which opened it, sqlite3 does not allow other threads
+            connections = {}
+            try:
+                while True:
+                    with lock:
+                        index, check = next(pending, (None, None))
+                    if check is None:
+                        break
+                    report[index] = run(connections, check)
+            finally:
+                for connection in connections.values():
+                    try:
+                        connection.close()
+                    except Exception as exception:
+                        logger.info('Close connection fail : %s' % exception)
+
+        started = time.perf_counter()
+        workers = max(1, min(int(workers), len(checks)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for future in [executor.submit(work) for _ in range(workers)]:
+                future.result()
+        failed = [result for result in report if result['status'] != PASS]
+        logger.info('Verify %s queries on %s workers in %.3f seconds, %s failed' % (
+            len(report), workers, time.perf_counter() - started, len(failed)))
+        for result in report:
+            logger.info('%s | %s | %s | expected: %s | actual: %s%s' % (
+                result['status'], result['alias'], result['sql'], result['expected'], result['actual'],
+                ' | error: %s' % result['error'] if result['error'] else ''))
+        if failed and fail_on_error:
+            raise AssertionError('%s of %s queries failed:\n%s' % (len(failed), len(report), '\n'.join(
+                '%s: %s expected %s but got %s' % (result['alias'], result['sql'], result['expected'],
+                                                   result['error'] or result['actual']) for result in failed)))
+        return report
@@ -1,4 +1,7 @@
 import importlib
+import os
+import threading
+from functools import partial
 
 try:
     import ConfigParser
@@ -7,6 +10,81 @@ except:
 
 from robot.api import logger
 from robot.api.deco import keyword
+from .ExtendedQuery import clear_prepared_statements, forget_prepared_statements
+
+ODBC_MODULES = ('pyodbc', 'pypyodbc')
+DEFAULT_MODULE = 'pyodbc'
+DEFAULT_DRIVER = '{SQL Server}'
+DEFAULT_SQL_SERVER_PORT = 1433
+
+# shared by all library instances, so connections are reused by every keyword which creates its own library
+_configs = {}
+_connections = {}
+_lock = threading.RLock()
+
+
+def read_config(db_config_file: str):
+    """
+    Returns the parsed config file, a file is parsed again only when it is modified.
+    """
+    try:
+        modified = os.path.getmtime(db_config_file)
+    except OSError:
+        modified = None
+    cached = _configs.get(db_config_file)
+    if cached is None or cached[0] != modified:
+        config = ConfigParser.ConfigParser()
+        config.read([db_config_file])
+        cached = (modified, config)
+        _configs[db_config_file] = cached
+    return cached[1]
+
+
+def get_config_value(db_config_file: str, option: str, fallback=None):
+    """
+    Returns the value of the option in the [default] section of the config file or the fallback.
+    """
+    config = read_config(db_config_file)
+    if config.has_option('default', option):
+        return config.get('default', option) or fallback
+    return fallback
+
+
+def get_odbc_dsn(driver, host, port, database, username, password) -> str:
+    return 'DRIVER=%s;SERVER=%s,%s;DATABASE=%s;UID=%s;PWD=%s' % (driver, host, port, database, username, password)
+
+
+def is_alive(connection) -> bool:
+    """
+    Returns False if the connection was closed, for example by `Disconnect From Database`.
+    """
+    try:
+        connection.cursor().close()
+        return True
+    except Exception:
+        return False
+
+
+def open_connection(module_name, database, username, password, host, port, driver):
+    """
+    Opens a new connection by the DB API 2.0 module.
+    """
+    db_api_2 = importlib.import_module(module_name)
+    if module_name in ODBC_MODULES:
+        logger.info(
+            'Connecting using : %s.connect(DRIVER=%s;SERVER=%s,%s;DATABASE=%s;UID=%s;PWD=***)' % (
+                module_name, driver, host, port, database, username))
+        return db_api_2.connect(get_odbc_dsn(driver, host, port, database, username, password))
+    if module_name == 'sqlite3':
+        logger.info('Connecting using : %s.connect(%s)' % (module_name, database))
+        return db_api_2.connect(database)
+    logger.info('Connecting using : %s.connect(database=%s, user=%s, password=***, host=%s, port=%s)' % (
+        module_name, database, username, host, port))
+    options = dict(database=database, user=username, password=password, host=host)
+    if port:
+        options['port'] = port
+    return db_api_2.connect(**options)
+
 
 class ExtendedConnection:
 
@@ -16,6 +94,8 @@ class ExtendedConnection:
         """
         self._dbconnection = None
         self.db_module_name = None
+        self._aliases = {}
+        self._connectors = {}
 
     @keyword("Connect Sql Server")
     def connect_sql_server(
@@ -27,9 +107,17 @@ class ExtendedConnection:
             db_host=None,
             db_port=None,
             db_driver=None,
-            db_config_file="./resources/db.cfg"
+            db_config_file="./resources/db.cfg",
+            alias=None
     ):
         """
+        Connect to the database by any DB API 2.0 module, pyodbc is used by default.
+        Arguments which are not given are read from the config file, the file is read only once.
+
+        An open connection to the same module, host, port, database and username is reused
+        instead of opening a new one. Use ``alias`` to switch between many connections
+        by `Switch Sql Server Connection`.
+
         Example db.cfg file
         | [default]
         | dbapiModuleName=pymysqlforexample
@@ -42,36 +130,104 @@ class ExtendedConnection:
 
         Example usage:
         | # explicitly specifies all db property values |
-        | Connect Sql Server | pyodbc | PGW | pgwuser01 | pgwuser01 | 172.30.74.33 | 1433 | {ODBC Driver 17 for SQL Server}
+        | Connect Sql Server | pyodbc | PGW | pgwuser01 | pgwuser01 | 172.30.74.33 | 1433 | {ODBC Driver 17 for SQL Server} |
 
         | # loads all property values from default.cfg |
-        | Connect To Database | dbConfigFile=default.cfg |
+        | Connect Sql Server | db_config_file=default.cfg |
 
         | # loads all property values from ./resources/db.cfg |
-        | Connect To Database |
+        | Connect Sql Server |
+
+        | # opens two connections and switches between them |
+        | Connect Sql Server | pyodbc | PGW | pgwuser01 | pgwuser01 | 172.30.74.33 | 1433 | alias=pgw |
+        | Connect Sql Server | sqlite3 | ./resources/offline.db | alias=offline |
+        | Switch Sql Server Connection | pgw |
         """
 
-        config = ConfigParser.ConfigParser()
-        config.read([db_config_file])
+        module_name = db_module or get_config_value(db_config_file, 'dbapiModuleName', DEFAULT_MODULE)
+        database = db_name or get_config_value(db_config_file, 'dbName')
+        username = db_username or get_config_value(db_config_file, 'dbUsername')
+        password = db_password if db_password is not None else get_config_value(db_config_file, 'dbPassword')
+        host = db_host or get_config_value(db_config_file, 'dbHost', 'localhost')
+        port = db_port or get_config_value(db_config_file, 'dbPort')
+        port = int(port) if port else (DEFAULT_SQL_SERVER_PORT if module_name in ODBC_MODULES else None)
+        driver = db_driver or get_config_value(db_config_file, 'dbDriver', DEFAULT_DRIVER)
 
-        module_name = 'pyodbc' or db_module or config.get('default', 'dbapiModuleName')
-        database = db_name or config.get('default', 'dbName')
-        username = db_username or config.get('default', 'dbUsername')
-        password = db_password if db_password is not None else config.get('default', 'dbPassword')
-        host = db_host or config.get('default', 'dbHost') or 'localhost'
-        port = int(db_port or config.get('default', 'dbPort')) or 1433
-        driver = '{SQL Server}' or db_driver or config.get('default', 'dbDriver')
+        key = (module_name, host, port, database, username)
+        with _lock:
+            connection = _connections.get(key)
+            if connection is not None and is_alive(connection):
+                logger.info('Reusing connection : %s.connect(%s, %s, %s, %s)' % key)
+            else:
+                try:
+                    connection = open_connection(module_name, database, username, password, host, port, driver)
+                except ConnectionError:
+                    logger.error('Connect SQL Server Fail')
+                    raise
+                _connections[key] = connection
+        self.__use_connection(module_name, connection)
+        if not hasattr(self, '_aliases'):
+            self._aliases = {}
+            self._connectors = {}
+        self._aliases[alias or database] = key
+        # only what opening another connection needs, sqlite3 does not use the password
+        self._connectors[alias or database] = partial(
+            open_connection, module_name, database, username, None if module_name == 'sqlite3' else password,
+            host, port, driver)
 
+    def __use_connection(self, module_name, connection):
+        # DatabaseLibrary keywords use _dbconnection and db_api_module_name
+        current = getattr(self, '_dbconnection', None)
+        if current is not None and current is not connection:
+            forget_prepared_statements(current)
+        self._dbconnection = connection
         self.db_module_name = module_name
-        db_api_2 = importlib.import_module(module_name)
-
-        try:
-            logger.info(
-                'Connecting using : %s.connect(DRIVER=%s;SERVER=%s,%s;DATABASE=%s;UID=%s;PWD=%s)' % (
-                module_name, driver, host, port, database, username, password))
-            self._dbconnection = db_api_2.connect(
-                'DRIVER=%s;SERVER=%s,%s;DATABASE=%s;UID=%s;PWD=%s' % (
-                driver, host, port, database, username, password))
-        except ConnectionError:
-            logger.error('Connect SQL Server Fail')
+        self.db_api_module_name = module_name
+
+    @keyword("Switch Sql Server Connection")
+    def switch_sql_server_connection(self, alias):
+        """
+        Switch the connection used by database keywords to the connection opened by `Connect Sql Server`
+        with the alias (or the database name when there is no alias).
+
+        Example usage:
+        | Switch Sql Server Connection | offline |
+        """
+
+        key = getattr(self, '_aliases', {}).get(alias)
+        connection = _connections.get(key) if key else None
+        if connection is None:
+            raise ValueError(f"Non-existing database connection '{alias}'")
+        self.__use_connection(key[0], connection)
+
+    def _open_new_connection(self, alias):
+        """
+        Opens another connection with the options of the alias of `Connect Sql Server`, for example
+        one connection for each thread. The caller closes the connection.
+        """
+
+        connector = getattr(self, '_connectors', {}).get(alias)
+        if connector is None:
+            raise ValueError(f"Non-existing database connection '{alias}'")
+        return connector()
+
+    @keyword("Close All Sql Server Connections")
+    def close_all_sql_server_connections(self):
+        """
+        Close all connections opened by `Connect Sql Server`.
 
+        Example usage:
+        | Close All Sql Server Connections |
+        """
+
+        with _lock:
+            clear_prepared_statements()
+            for key, connection in list(_connections.items()):
+                try:
+                    connection.close()
+                except Exception as exception:
+                    logger.info('Close connection %s fail : %s' % (key, exception))
+            _connections.clear()
+        self._aliases = {}
+        self._connectors = {}
+        self._dbconnection = None
@@ -0,0 +1,333 @@
+import importlib
+import time
+import zlib
+from collections import OrderedDict
+from decimal import Decimal
+
+from robot.api import logger
+from robot.api.deco import keyword
+
+STREAM_CURSOR_NAME = 'robot_stream_query'
+NUMBER_TYPES = (int, float, Decimal)
+PREPARED_CACHE_SIZE = 100
+
+# cursors of prepared statements by connection, a driver like pyodbc prepares a statement once per cursor.
+# entries are dropped when the connection is switched or closed, so closed connections are not kept
+_prepared = {}
+
+
+def close_cursors(cursors):
+    for cur in cursors.values():
+        try:
+            cur.close()
+        except Exception:
+            pass
+
+
+def clear_prepared_statements():
+    for connection, cursors in _prepared.values():
+        close_cursors(cursors)
+    _prepared.clear()
+
+
+def forget_prepared_statements(connection):
+    """
+    Closes the prepared statements of the connection, for example when it is closed or switched.
+    """
+    entry = _prepared.get(id(connection))
+    if entry is not None and entry[0] is connection:
+        close_cursors(_prepared.pop(id(connection))[1])
+
+
+def forget_closed_connections():
+    """
+    Drops the prepared statements of connections which were closed by `Disconnect From Database`.
+    """
+    for key, (connection, cursors) in list(_prepared.items()):
+        try:
+            connection.cursor().close()
+        except Exception:
+            close_cursors(cursors)
+            del _prepared[key]
+
+
+def add_numbers(total, value):
+    """
+    Returns total + value, a float and a Decimal (pyodbc returns DECIMAL and MONEY columns as Decimal)
+    are added as Decimal.
+    """
+    if isinstance(total, Decimal) or isinstance(value, Decimal):
+        return Decimal(str(total)) + Decimal(str(value))
+    return total + value
+
+
+def get_paramstyle(module_name) -> str:
+    """
+    Returns the paramstyle of the DB API module, for example qmark for pyodbc and sqlite3.
+    """
+    return getattr(importlib.import_module(module_name), 'paramstyle', 'qmark') if module_name else 'qmark'
+
+
+class ExtendedQuery:
+
+    def _stream_cursor(self):
+        """
+        Returns a server-side cursor when the DB API module needs one to stream rows, otherwise a normal cursor.
+        pyodbc, sqlite3 and cx_Oracle already fetch rows from the server by fetchmany.
+        """
+        module_name = getattr(self, 'db_api_module_name', None)
+        if module_name == 'psycopg2':
+            return self._dbconnection.cursor(name=STREAM_CURSOR_NAME)
+        if module_name in ('pymysql', 'MySQLdb'):
+            cursors = importlib.import_module(f'{module_name}.cursors')
+            return self._dbconnection.cursor(cursors.SSCursor)
+        return self._dbconnection.cursor()
+
+    def _fetch_batches(self, selectStatement, batch_size=1000, sansTran=False):
+        """
+        Yields the cursor description and each list of rows fetched by ``batch_size`` rows at a time.
+        """
+        batch_size = int(batch_size)
+        cur = None
+        try:
+            cur = self._stream_cursor()
+            cur.arraysize = batch_size
+            logger.info('Executing : Stream Query  |  %s ' % selectStatement)
+            cur.execute(selectStatement)
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield cur.description, rows
+        finally:
+            if cur:
+                cur.close()
+                if not sansTran:
+                    self._dbconnection.rollback()
+
+    def _stream_rows(self, selectStatement, batch_size=1000, chunks=False, sansTran=False):
+        """
+        Yields rows (or lists of rows when ``chunks`` is true) of the select statement fetched by
+        ``batch_size`` rows at a time, so the whole result is never kept in memory.
+        """
+        for _, rows in self._fetch_batches(selectStatement, batch_size, sansTran):
+            if chunks:
+                yield rows
+            else:
+                yield from rows
+
+    @keyword("Stream Query")
+    def stream_query(self, selectStatement, batch_size=1000, chunks=False, sansTran=False):
+        """
+        Returns an iterator of rows (or lists of rows when ``chunks`` is true) of the select statement,
+        rows are fetched by ``batch_size`` at a time while they are used. Unlike `Query`, the result is not
+        kept in memory when it is passed to a python keyword which iterates it.
+        Expanding it as ``@{rows}`` makes a list of all rows like `Query`.
+
+        Example usage:
+        | ${chunks} = | Stream Query | SELECT id, amount FROM payment | 5000 | chunks=True |
+        | Verify Payment Chunks | ${chunks} |
+        """
+
+        return self._stream_rows(selectStatement, batch_size, chunks, sansTran)
+
+    @keyword("Query Aggregates")
+    def query_aggregates(self, selectStatement, batch_size=1000, sansTran=False):
+        """
+        Streams the select statement and returns the row count and the aggregates of each column
+        without keeping the rows in memory.
+
+        Each column has ``count`` (not null values), ``min``, ``max``, ``sum`` (numbers only, otherwise None)
+        and ``checksum`` (a CRC32 sum of the values which does not depend on the row order).
+
+        Example usage:
+        | ${result} = | Query Aggregates | SELECT id, amount FROM payment WHERE batch_id = 20200701 |
+        | Should Be Equal As Integers | ${result}[row_count] | 500000 |
+        | Should Be Equal As Numbers | ${result}[columns][amount][sum] | 1250000.50 |
+        """
+
+        names = []
+        columns = []
+        row_count = 0
+        for description, rows in self._fetch_batches(selectStatement, batch_size, sansTran):
+            if not columns:
+                names = [str(item[0]) for item in description]
+                columns = [{'count': 0, 'min': None, 'max': None, 'sum': 0, 'checksum': 0} for _ in names]
+            row_count += len(rows)
+            for row in rows:
+                for column, value in zip(columns, row):
+                    if value is None:
+                        continue
+                    column['count'] += 1
+                    try:
+                        if column['min'] is None or value < column['min']:
+                            column['min'] = value
+                        if column['max'] is None or value > column['max']:
+                            column['max'] = value
+                    except TypeError:
+                        pass
+                    if column['sum'] is not None:
+                        column['sum'] = add_numbers(column['sum'], value) if isinstance(value, NUMBER_TYPES) else None
+                    column['checksum'] = (column['checksum'] + zlib.crc32(str(value).encode('utf-8'))) % 2 ** 64
+        result = {'row_count': row_count, 'columns': dict(zip(names, columns))}
+        logger.info('Query aggregates : %s' % result)
+        return result
+
+    def _get_paramstyle(self) -> str:
+        """
+        Returns the paramstyle of the DB API module of the current connection.
+        """
+        return get_paramstyle(getattr(self, 'db_api_module_name', None))
+
+    def _get_parameter_markers(self, count: int) -> list:
+        """
+        Returns the parameter markers of the DB API module paramstyle, named markers are :p0, :p1, ...
+        """
+        paramstyle = self._get_paramstyle()
+        if paramstyle in ('format', 'pyformat'):
+            return ['%s'] * count
+        if paramstyle == 'numeric':
+            return [f':{index}' for index in range(1, count + 1)]
+        if paramstyle == 'named':
+            return [f':p{index}' for index in range(count)]
+        return ['?'] * count
+
+    def _placeholders(self, columns: list) -> str:
+        return ', '.join(self._get_parameter_markers(len(columns)))
+
+    def _prepared_cursor(self, statement):
+        """
+        Returns the cursor which executed the statement on the current connection before, the least recently
+        used cursor is closed when the connection has more than PREPARED_CACHE_SIZE statements.
+        """
+        entry = _prepared.get(id(self._dbconnection))
+        if entry is None or entry[0] is not self._dbconnection:
+            forget_closed_connections()
+            entry = (self._dbconnection, OrderedDict())
+            _prepared[id(self._dbconnection)] = entry
+        cursors = entry[1]
+        cur = cursors.pop(statement, None)
+        if cur is None:
+            cur = self._dbconnection.cursor()
+            if len(cursors) >= PREPARED_CACHE_SIZE:
+                cursors.popitem(last=False)[1].close()
+        cursors[statement] = cur
+        return cur
+
+    @keyword("Query With Parameters")
+    def query_with_parameters(self, selectStatement, parameters=None, sansTran=False, returnAsDict=False):
+        """
+        Uses the parameterized select statement with the parameters bound by the DB API module like `Query`.
+        The statement text stays the same when only values are changed, so it is prepared once per connection
+        and the database reuses its plan.
+
+        Example usage:
+        | @{parameters} = | Create List | 1 | See |
+        | @{queryResults} = | Query With Parameters | SELECT * FROM person WHERE id = ? AND last_name = ? | ${parameters} |
+        """
+
+        parameters = parameters if parameters is not None else []
+        cur = None
+        try:
+            cur = self._prepared_cursor(selectStatement)
+            logger.info('Executing : Query With Parameters  |  %s  |  %s ' % (selectStatement, parameters))
+            cur.execute(selectStatement, parameters)
+            rows = cur.fetchall()
+            if returnAsDict:
+                names = [item[0] for item in cur.description]
+                return [dict(zip(names, row)) for row in rows]
+            return rows
+        finally:
+            if cur:
+                if not sansTran:
+                    self._dbconnection.rollback()
+
+    @keyword("Bulk Insert Rows")
+    def bulk_insert_rows(self, table_name, rows, columns=None, batch_size=1000, fast_executemany=True):
+        """
+        Inserts rows (dictionaries of column names and values, or lists in the order of ``columns``) into the table
+        by executemany in batches of ``batch_size`` rows inside one transaction. The transaction is rolled back
+        if any batch fails. pyodbc uses fast_executemany unless ``fast_executemany`` is false.
+
+        Returns a dictionary of rows, seconds and rows_per_second.
+
+        Example usage:
+        | &{row1} = | Create Dictionary | id=1 | name=Franz Allan |
+        | &{row2} = | Create Dictionary | id=2 | name=Jerry |
+        | @{rows} = | Create List | ${row1} | ${row2} |
+        | ${result} = | Bulk Insert Rows | person | ${rows} | batch_size=5000 |
+        """
+
+        rows = list(rows)
+        if not rows:
+            return {'rows': 0, 'seconds': 0.0, 'rows_per_second': 0.0}
+        if columns is None:
+            if not isinstance(rows[0], dict):
+                raise ValueError('columns is required when rows are not dictionaries')
+            columns = list(rows[0])
+        columns = list(columns)
+        if isinstance(rows[0], dict):
+            rows = [tuple(row.get(column) for column in columns) for row in rows]
+        placeholders = self._placeholders(columns)
+        if placeholders.startswith(':p'):
+            rows = [dict((f'p{index}', value) for index, value in enumerate(row)) for row in rows]
+        statement = 'INSERT INTO %s (%s) VALUES (%s)' % (table_name, ', '.join(columns), placeholders)
+        batch_size = int(batch_size)
+        logger.info('Executing : Bulk Insert Rows  |  %s  |  %s rows' % (statement, len(rows)))
+        started = time.perf_counter()
+        cur = None
+        try:
+            cur = self._dbconnection.cursor()
+            if fast_executemany and hasattr(cur, 'fast_executemany'):
+                cur.fast_executemany = True
+            for start in range(0, len(rows), batch_size):
+                cur.executemany(statement, rows[start:start + batch_size])
+            self._dbconnection.commit()
+        except Exception:
+            self._dbconnection.rollback()
+            raise
+        finally:
+            if cur:
+                cur.close()
+        seconds = time.perf_counter() - started
+        result = {
+            'rows': len(rows),
+            'seconds': round(seconds, 3),
+            'rows_per_second': round(len(rows) / seconds, 1) if seconds else 0.0
+        }
+        logger.info('Bulk insert %s rows into %s in %s seconds (%s rows/sec)' % (
+            result['rows'], table_name, result['seconds'], result['rows_per_second']))
+        return result
+
+    @staticmethod
+    def _read_excel_rows(excel_filepath, sheet_name) -> list:
+        """
+        Returns every row of the sheet as a dictionary by the headers on the first row, empty cells are None.
+        Rows are read once by ExcelImportLibrary, rows which have no value in the first column are kept as rows.
+        """
+        from ExcelImportLibrary import ExcelImport
+        excel = ExcelImport()
+        excel.open_excel_file(excel_filepath)
+        excel.select_excel_sheet(sheet_name)
+        excel.set_working_rows(2, excel.get_max_row(), excel.get_max_column())
+        rows = []
+        for index in range(excel.get_max_test_cases()):
+            values = dict((header, value) for header, value in excel.get_test_case(index)['values'].items() if header)
+            for row in zip(*values.values()):
+                rows.append(dict((header, None if value == '' else value) for header, value in zip(values, row)))
+        return rows
+
+    @keyword("Bulk Insert Rows From Excel")
+    def bulk_insert_rows_from_excel(self, table_name, excel_filepath, sheet_name, columns=None, batch_size=1000,
+                                    fast_executemany=True):
+        """
+        Inserts every row of the excel sheet (XLSX) into the table like `Bulk Insert Rows`. The headers on
+        the first row are the column names, use ``columns`` to insert only some of them.
+
+        Example usage:
+        | ${result} = | Bulk Insert Rows From Excel | person | ./resources/seed.xlsx | person |
+        | Log | ${result}[rows_per_second] |
+        """
+
+        rows = self._read_excel_rows(excel_filepath, sheet_name)
+        return self.bulk_insert_rows(table_name, rows, columns, batch_size, fast_executemany)
@@ -1,11 +1,15 @@
 from DatabaseLibrary import DatabaseLibrary
+from .ExtendedAssertion import ExtendedAssertion
 from .ExtendedConnection import ExtendedConnection
+from .ExtendedQuery import ExtendedQuery
 
 __version__ = '1.0'
 
-class ExtendedDatabaseLibrary(DatabaseLibrary, ExtendedConnection):
+class ExtendedDatabaseLibrary(DatabaseLibrary, ExtendedConnection, ExtendedQuery, ExtendedAssertion):
     ROBOT_LIBRARY_SCOPE = "GLOBAL"
     ROBOT_LIBRARY_VERSION = __version__
 
-
+    def __init__(self):
+        DatabaseLibrary.__init__(self)
+        ExtendedConnection.__init__(self)
 
@@ -0,0 +1,52 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+import openpyxl
+from ExtendedDatabaseLibrary import ExtendedDatabaseLibrary
+
+
+class BulkInsertTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.library = ExtendedDatabaseLibrary()
+        self.library.connect_sql_server('sqlite3', os.path.join(self.directory.name, 'bulk.db'))
+        self.library._dbconnection.execute('CREATE TABLE person (id INTEGER PRIMARY KEY, name TEXT)')
+
+    def tearDown(self):
+        self.library.close_all_sql_server_connections()
+        self.directory.cleanup()
+
+    def select(self):
+        return self.library._dbconnection.execute('SELECT id, name FROM person ORDER BY id').fetchall()
+
+    def test1(self):
+        rows = [{'id': index, 'name': 'name%s' % index} for index in range(1, 8)]
+        result = self.library.bulk_insert_rows('person', rows, batch_size=3)
+        assert result['rows'] == 7
+        assert self.select() == [(index, 'name%s' % index) for index in range(1, 8)]
+        self.library.bulk_insert_rows('person', [[8, 'Jerry']], columns=['id', 'name'])
+        assert self.select()[-1] == (8, 'Jerry')
+        assert self.library.bulk_insert_rows('person', []) == {'rows': 0, 'seconds': 0.0, 'rows_per_second': 0.0}
+
+    def test2(self):
+        '''A failed batch rolls back every batch of the call'''
+        rows = [{'id': 1, 'name': 'first'}, {'id': 2, 'name': 'second'}, {'id': 1, 'name': 'duplicate'}]
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.library.bulk_insert_rows('person', rows, batch_size=2)
+        assert self.select() == []
+        with self.assertRaises(ValueError):
+            self.library.bulk_insert_rows('person', [[1, 'first']])
+
+    def test3(self):
+        excel_filepath = os.path.join(self.directory.name, 'seed.xlsx')
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.title = 'person'
+        for row in (('id', 'name', 'remark'), (1, 'Franz Allan', 'x'), (2, 'Jerry', None), (None, 'no id', None)):
+            sheet.append(row)
+        workbook.save(excel_filepath)
+        result = self.library.bulk_insert_rows_from_excel('person', excel_filepath, 'person', columns=['id', 'name'])
+        assert result['rows'] == 3
+        assert [name for _, name in self.select()] == ['Franz Allan', 'Jerry', 'no id']
@@ -0,0 +1,82 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from ExtendedDatabaseLibrary import ExtendedDatabaseLibrary
+
+
+def get_keyword_names(library) -> list:
+    names = []
+    for name in dir(library):
+        method = getattr(library, name)
+        if not name.startswith('_') and callable(method):
+            names.append(getattr(method, 'robot_name', None) or name.replace('_', ' ').title())
+    return names
+
+
+class ConnectionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.first = os.path.join(self.directory.name, 'first.db')
+        self.second = os.path.join(self.directory.name, 'second.db')
+        self.library = ExtendedDatabaseLibrary()
+
+    def tearDown(self):
+        self.library.close_all_sql_server_connections()
+        self.directory.cleanup()
+
+    def test1(self):
+        '''An open connection is reused by every library instance'''
+        self.library.connect_sql_server('sqlite3', self.first)
+        connection = self.library._dbconnection
+        self.library.connect_sql_server('sqlite3', self.first)
+        other = ExtendedDatabaseLibrary()
+        other.connect_sql_server('sqlite3', self.first)
+        assert self.library._dbconnection is connection
+        assert other._dbconnection is connection
+        assert self.library.db_api_module_name == 'sqlite3'
+
+    def test2(self):
+        self.library.connect_sql_server('sqlite3', self.first, alias='first')
+        first = self.library._dbconnection
+        self.library.connect_sql_server('sqlite3', self.second, alias='second')
+        second = self.library._dbconnection
+        assert first is not second
+        self.library.switch_sql_server_connection('first')
+        assert self.library._dbconnection is first
+        with self.assertRaises(ValueError):
+            self.library.switch_sql_server_connection('third')
+
+    def test3(self):
+        '''Close All closes every connection and a closed connection is opened again'''
+        self.library.connect_sql_server('sqlite3', self.first)
+        connection = self.library._dbconnection
+        self.library.close_all_sql_server_connections()
+        with self.assertRaises(sqlite3.ProgrammingError):
+            connection.cursor()
+        assert self.library._dbconnection is None
+        self.library.connect_sql_server('sqlite3', self.first)
+        assert self.library._dbconnection is not connection
+        self.library.disconnect_from_database()
+        self.library.connect_sql_server('sqlite3', self.first)
+        self.library._dbconnection.cursor().close()
+
+    def test4(self):
+        self.library.connect_sql_server('sqlite3', self.first, db_password='secret', alias='first')
+        connection = self.library._open_new_connection('first')
+        try:
+            assert connection is not self.library._dbconnection
+            assert 'secret' not in self.library._connectors['first'].args
+        finally:
+            connection.close()
+        with self.assertRaises(ValueError):
+            self.library._open_new_connection('second')
+
+    def test5(self):
+        '''Helpers are not keywords and every keyword name is defined once'''
+        names = get_keyword_names(self.library)
+        assert len(names) == len(set(name.lower() for name in names))
+        assert 'Stream Query' in names
+        for name in ('Open New Connection', 'Get Paramstyle', 'Get Parameter Markers'):
+            assert name not in names
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import threading
+import unittest
+from ExtendedDatabaseLibrary import ExtendedDatabaseLibrary
+
+
+class TrackedConnection:
+    def __init__(self, connection, closed):
+        self.connection = connection
+        self.closed = closed
+        self.thread = threading.get_ident()
+
+    def cursor(self):
+        return self.connection.cursor()
+
+    def rollback(self):
+        self.connection.rollback()
+
+    def close(self):
+        self.connection.close()
+        self.closed.append(self.thread == threading.get_ident())
+
+
+class ParallelTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.library = ExtendedDatabaseLibrary()
+        self.library.connect_sql_server('sqlite3', os.path.join(self.directory.name, 'parallel.db'), alias='db')
+        self.library._dbconnection.execute('CREATE TABLE ledger (id INTEGER, status TEXT)')
+        self.library._dbconnection.executemany('INSERT INTO ledger VALUES (?, ?)', [(1, 'SUCCESS'), (2, 'FAIL')])
+        self.library._dbconnection.commit()
+
+    def tearDown(self):
+        self.library.close_all_sql_server_connections()
+        self.directory.cleanup()
+
+    def test1(self):
+        checks = [['db', 'SELECT COUNT(*) FROM ledger', 2],
+                  {'alias': 'db', 'sql': 'SELECT status FROM ledger ORDER BY id', 'expected': ['SUCCESS', 'FAIL']},
+                  ['db', 'SELECT id, status FROM ledger ORDER BY id', [[1, 'SUCCESS'], [2, 'FAIL']]]] * 3
+        report = self.library.verify_queries_in_parallel(checks, workers=3)
+        assert [result['sql'] for result in report] == [check['sql'] if isinstance(check, dict) else check[1]
+                                                         for check in checks]
+        assert all(result['status'] == 'PASS' for result in report)
+
+    def test2(self):
+        '''Failures are reported together and every connection is closed by the thread which opened it'''
+        closed = []
+        connector = self.library._connectors['db']
+        self.library._connectors['db'] = lambda: TrackedConnection(connector(), closed)
+        checks = [['db', 'SELECT COUNT(*) FROM ledger', 3], ['db', 'SELECT * FROM notExist', 1],
+                  ['db', 'SELECT COUNT(*) FROM ledger', 2]]
+        with self.assertRaises(AssertionError) as context:
+            self.library.verify_queries_in_parallel(checks, workers=2)
+        assert '2 of 3 queries failed' in str(context.exception)
+        report = self.library.verify_queries_in_parallel(checks, workers=2, fail_on_error=False)
+        assert [result['status'] for result in report] == ['FAIL', 'FAIL', 'PASS']
+        assert 'no such table' in report[1]['error']
+        assert closed and all(closed)
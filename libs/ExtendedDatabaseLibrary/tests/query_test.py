@@ -0,0 +1,73 @@
+import os
+import sys
+import tempfile
+import unittest
+from decimal import Decimal
+from ExtendedDatabaseLibrary import ExtendedDatabaseLibrary
+from ExtendedDatabaseLibrary.ExtendedQuery import add_numbers
+
+extended_query = sys.modules['ExtendedDatabaseLibrary.ExtendedQuery']
+
+
+class QueryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.library = ExtendedDatabaseLibrary()
+        self.library.connect_sql_server('sqlite3', os.path.join(self.directory.name, 'query.db'))
+        cur = self.library._dbconnection.cursor()
+        cur.execute('CREATE TABLE payment (id INTEGER PRIMARY KEY, amount REAL, status TEXT)')
+        cur.executemany('INSERT INTO payment VALUES (?, ?, ?)',
+                        [(index, index * 1.5, 'SUCCESS' if index % 2 else None) for index in range(1, 11)])
+        self.library._dbconnection.commit()
+        cur.close()
+
+    def tearDown(self):
+        self.library.close_all_sql_server_connections()
+        self.directory.cleanup()
+
+    def test1(self):
+        rows = self.library.stream_query('SELECT id FROM payment ORDER BY id', 3)
+        assert next(rows) == (1,)
+        assert list(rows) == [(index,) for index in range(2, 11)]
+        chunks = list(self.library.stream_query('SELECT id FROM payment ORDER BY id', 4, chunks=True))
+        assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+
+    def test2(self):
+        result = self.library.query_aggregates('SELECT id, amount, status FROM payment', 4)
+        assert result['row_count'] == 10
+        assert result['columns']['id'] == dict(result['columns']['id'], count=10, min=1, max=10, sum=55)
+        assert result['columns']['amount']['sum'] == 82.5
+        assert result['columns']['status']['count'] == 5
+        assert result['columns']['status']['sum'] is None
+        reversed_result = self.library.query_aggregates('SELECT id, amount, status FROM payment ORDER BY id DESC')
+        assert reversed_result['columns']['status']['checksum'] == result['columns']['status']['checksum']
+
+    def test3(self):
+        '''Decimal columns of pyodbc are added to float and int values'''
+        assert add_numbers(Decimal('1.10'), 2.5) == Decimal('3.60')
+        assert add_numbers(0, Decimal('1.10')) == Decimal('1.10')
+        assert add_numbers(1.5, 2) == 3.5
+
+    def test4(self):
+        statement = 'SELECT id, status FROM payment WHERE id = ? AND status = ?'
+        assert self.library.query_with_parameters(statement, [1, 'SUCCESS']) == [(1, 'SUCCESS')]
+        assert self.library.query_with_parameters(statement, [3, 'SUCCESS'], returnAsDict=True) == \
+               [{'id': 3, 'status': 'SUCCESS'}]
+        cursor = self.library._prepared_cursor(statement)
+        assert self.library._prepared_cursor(statement) is cursor
+        assert self.library._get_parameter_markers(2) == ['?', '?']
+
+    def test5(self):
+        '''Prepared statements of a switched or closed connection are released'''
+        self.library.query_with_parameters('SELECT 1')
+        first = self.library._dbconnection
+        assert id(first) in extended_query._prepared
+        self.library.connect_sql_server('sqlite3', ':memory:', alias='memory')
+        assert id(first) not in extended_query._prepared
+        self.library.query_with_parameters('SELECT 1')
+        memory = self.library._dbconnection
+        memory.close()
+        self.library.connect_sql_server('sqlite3', os.path.join(self.directory.name, 'query.db'))
+        self.library.query_with_parameters('SELECT 1')
+        assert all(connection is not memory for connection, _ in extended_query._prepared.values())
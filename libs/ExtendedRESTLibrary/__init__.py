@@ -1,5 +1,6 @@
 from REST import REST
 from .extendedkeywords import ExtendedKeywords
+from Utilities.http_session import import_http_session, HTTPCache
 from REST.version import __version__
 from REST.compat import IS_PYTHON_2, STRING_TYPES
 if IS_PYTHON_2:
@@ -24,10 +25,31 @@ class ExtendedRESTLibrary(REST, ExtendedKeywords):
         schema={},
         spec={},
         instances=[],
-        timeout=10
+        timeout=10,
+        pool_connections=10,
+        pool_maxsize=10,
+        max_retries=0,
+        backoff_factor=0,
+        lightweight=False,
+        max_instances=100,
+        cache=False,
+        cache_size=256,
+        cache_headers="Accept, Authorization"
     ):
         """
         Default value for timeouts used with GET, POST, PATCH, PUT, DELETE, OPTIONS, HEAD keywords.
+
+        Requests are sent by one HTTP session which keeps connections alive, ``pool_connections``,
+        ``pool_maxsize``, ``max_retries`` and ``backoff_factor`` are the same as `Configure HTTP Session`.
+        The session is shared by all suites, it is replaced only when another import gives different options.
+
+        If ``lightweight`` is true, only the last ``max_instances`` instances are kept and the schema of an instance
+        is not made when no expectations are set, it is made when an assertion keyword or `Output Schema` uses it.
+
+        If ``cache`` is true, up to ``cache_size`` GET and HEAD responses are kept for the test suite by their
+        Cache-Control, Expires, ETag and Last-Modified headers, keyed by the method, URL, query, ``cache_headers``
+        and the Cookie header, and by the request headers named by Vary.
+        See `Get HTTP Cache Statistics`.
         """
         self.request = {
             "method": None,
@@ -77,3 +99,11 @@ class ExtendedRESTLibrary(REST, ExtendedKeywords):
         self.spec.update(self._input_object(spec))
         self.instances = self._input_array(instances)
         self.timeout = timeout
+        self.lightweight = self._input_boolean(lightweight)
+        self.max_instances = int(max_instances) if max_instances else None
+        self.cache = None
+        if self._input_boolean(cache):
+            if isinstance(cache_headers, STRING_TYPES):
+                cache_headers = [header.strip() for header in cache_headers.split(",") if header.strip()]
+            self.cache = HTTPCache(cache_size, cache_headers)
+        import_http_session(pool_connections, pool_maxsize, max_retries, backoff_factor)
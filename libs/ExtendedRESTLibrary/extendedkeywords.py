@@ -1,19 +1,272 @@
 """Add all libraries"""
 import base64
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
+from datetime import datetime
+from json import dumps
+from os import path, getcwd
+from pytz import utc, UnknownTimeZoneError
+from requests.exceptions import SSLError, Timeout
+from tzlocal import get_localzone
 from robot.api.deco import keyword
 from robot.api import logger
+from robot.libraries.BuiltIn import BuiltIn, RobotNotRunningError
 from REST.keywords import Keywords
-from REST.compat import STRING_TYPES
+from REST.compat import IS_PYTHON_2, STRING_TYPES
 from JSONLibrary import JSONLibrary
 from Utilities.dict_management import get_dict_diffs
+from Utilities.http_session import get_http_session
 from Utilities.utilities import print_friendly_message
+if IS_PYTHON_2:
+    from urlparse import parse_qsl, urljoin, urlparse
+else:
+    from urllib.parse import parse_qsl, urljoin, urlparse
 
 
 class ExtendedKeywords(Keywords):
     """This class is extended from Keywords"""
     def __init__(self):
         self.timeout = None
+        self.lightweight = False
+        self.max_instances = None
+        self.cache = None
+
+    def _send(self, request, stream=False):
+        """Sends the request by the shared HTTP session which keeps connections alive, GET and HEAD
+        responses are returned from the cache if it is enabled"""
+        def send(headers):
+            return get_http_session().request(
+                request["method"],
+                request["url"],
+                params=request["query"],
+                json=request["body"],
+                headers=headers,
+                proxies=request["proxies"],
+                cert=request["cert"],
+                timeout=tuple(request["timeout"]),
+                allow_redirects=request["allowRedirects"],
+                verify=request["sslVerify"],
+                stream=stream,
+            )
+        if self.cache is None or stream:
+            return send(request["headers"])
+        return self.cache.request(request["method"], request["url"], request["query"], request["headers"], send)
+
+    def _request(self, endpoint, request, validate=True):
+        """The copy of RESTinstance `_request` but the request is sent by `_send`"""
+        self._prepare_url(endpoint, request)
+        response = self._send_or_fail(request)
+        return self._record(request, response, validate)
+
+    def _prepare_url(self, endpoint, request):
+        """Joins the endpoint with the URL given on library init and sets the URL parts of the request"""
+        if not endpoint.startswith(("http://", "https://")):
+            base_url = self.request["scheme"] + "://" + self.request["netloc"]
+            if not endpoint.startswith("/"):
+                endpoint = "/" + endpoint
+            endpoint = urljoin(base_url, self.request["path"]) + endpoint
+        request["url"] = endpoint
+        url_parts = urlparse(request["url"])
+        request["scheme"] = url_parts.scheme
+        request["netloc"] = url_parts.netloc
+        request["path"] = url_parts.path
+
+    def _send_or_fail(self, request, stream=False):
+        """Sends the request, SSL errors and timeouts fail as assertions"""
+        try:
+            return self._send(request, stream)
+        except SSLError as e:
+            raise AssertionError(
+                "%s to %s SSL certificate verify failed:\n%s"
+                % (request["method"], request["url"], e)
+            )
+        except Timeout as e:
+            raise AssertionError(
+                "%s to %s timed out:\n%s"
+                % (request["method"], request["url"], e)
+            )
+
+    def _record(self, request, response, validate=True):
+        """Validates the response and appends it to the instances like RESTinstance `_request`"""
+        utc_datetime = datetime.now(tz=utc)
+        request["timestamp"] = {}
+        request["timestamp"]["utc"] = utc_datetime.isoformat()
+        try:
+            request["timestamp"]["local"] = utc_datetime.astimezone(
+                get_localzone()
+            ).isoformat()
+        except UnknownTimeZoneError as e:
+            logger.info("Cannot infer local timestamp! tzlocal:%s" % str(e))
+        if validate and self.spec:
+            self._assert_spec(self.spec, response)
+        instance = self._instantiate(request, response, validate)
+        self.instances.append(instance)
+        if self.lightweight and self.max_instances and len(self.instances) > self.max_instances:
+            del self.instances[:len(self.instances) - self.max_instances]
+        return instance
+
+    def _has_expectations(self):
+        """Returns True if request or response properties are expected by `Expect Request`, `Expect Response`..."""
+        properties = self.schema["properties"]
+        return any(properties[part].get("properties") for part in ("request", "response") if part in properties)
+
+    def _instantiate(self, request, response, validate_schema=True):
+        """RESTinstance `_instantiate`, in lightweight mode the schema is made only when it is used"""
+        if not self.lightweight or self._has_expectations():
+            return Keywords._instantiate(self, request, response, validate_schema)
+        try:
+            response_body = response.json()
+        except ValueError:
+            response_body = response.text
+            if response_body:
+                logger.warn(
+                    "Response body content is not JSON. "
+                    + "Content-Type is: %s" % response.headers["Content-Type"]
+                )
+        response = {
+            "seconds": response.elapsed.microseconds / 1000 / 1000,
+            "status": response.status_code,
+            "body": response_body,
+            "headers": dict(response.headers),
+        }
+        return {
+            "request": request,
+            "response": response,
+            "schema": None,
+            "spec": self.spec,
+        }
+
+    def _instance_schema(self, instance):
+        """Makes the schema of a lightweight instance the same as RESTinstance `_instantiate`"""
+        if instance["schema"] is not None:
+            return instance["schema"]
+        request = instance["request"]
+        schema = deepcopy(self.schema)
+        schema["title"] = "%s %s" % (request["method"], request["url"])
+        try:
+            schema["description"] = "%s: %s" % (
+                BuiltIn().get_variable_value("${SUITE NAME}"),
+                BuiltIn().get_variable_value("${TEST NAME}"),
+            )
+        except RobotNotRunningError:
+            schema["description"] = ""
+        request_properties = schema["properties"]["request"]["properties"]
+        response_properties = schema["properties"]["response"]["properties"]
+        request_properties["body"] = self._new_schema(request["body"])
+        request_properties["query"] = self._new_schema(request["query"])
+        response_properties["body"] = self._new_schema(instance["response"]["body"])
+        if "default" in schema and schema["default"]:
+            self._add_defaults_to_schema(schema, instance["response"])
+        instance["schema"] = schema
+        return schema
+
+    def _find_by_field(self, field, return_schema=True, print_found=True):
+        if return_schema:
+            self._instance_schema(self._last_instance_or_error())
+        return Keywords._find_by_field(self, field, return_schema, print_found)
+
+    def _build_request(self, method, endpoint, query=None, body=None, timeout=None, allow_redirects=None,
+                       headers=None):
+        """Returns the endpoint and the request of the method the same as GET, POST, PUT... keywords"""
+        endpoint = self._input_string(endpoint)
+        request = deepcopy(self.request)
+        request["method"] = method.upper()
+        request["query"] = OrderedDict()
+        query_in_url = OrderedDict(parse_qsl(urlparse(endpoint).query))
+        if query_in_url:
+            request["query"].update(query_in_url)
+            endpoint = endpoint.rsplit("?", 1)[0]
+        if query:
+            request["query"].update(self._input_object(query))
+        if body is not None:
+            request["body"] = self.input(body)
+        if request["method"] == "HEAD":
+            request["allowRedirects"] = False
+        if allow_redirects is not None:
+            request["allowRedirects"] = self._input_boolean(allow_redirects)
+        timeout = self.timeout if timeout is None else timeout
+        if timeout is not None:
+            request["timeout"] = self._input_timeout(timeout)
+        if headers:
+            request["headers"].update(self._input_object(headers))
+        return endpoint, request
+
+    @keyword(name="Send Requests Concurrently")
+    def send_requests_concurrently(self, requests, workers=10, validate=True, fail_on_error=True):
+        """*Sends independent requests at the same time on ``workers`` threads.*
+
+        Requests are sent by the shared HTTP session, then validated and appended to the instances
+        in the given order, so expectation keywords, a spec and `Output` work the same as with
+        GET, POST, PUT... keywords.
+
+        *Options*
+
+        ``requests``: A list of requests. A request is a dictionary of ``method``, ``endpoint`` and optional
+        ``query``, ``body``, ``headers``, ``timeout`` and ``allow_redirects``, or a list of
+        (method, endpoint, body).
+
+        ``workers``: The maximum number of requests sent at the same time.
+
+        ``validate``: If false, skips any request and response validations set
+        by expectation keywords and a spec given on library init.
+
+        ``fail_on_error``: If true, fails with all failed requests after every request is done.
+
+        Returns the responses in the given order. A response is a dictionary of status, body, headers,
+        seconds, ``elapsed`` (the seconds measured around sending) and ``error``.
+
+        *Examples*
+
+        | &{user} = | Create Dictionary | method=GET | endpoint=/users/1 |
+        | @{new_user} = | Create List | POST | /users | { "name": "Gil Alexander" } |
+        | @{requests} = | Create List | ${user} | ${new_user} |
+        | @{responses} = | `Send Requests Concurrently` | ${requests} | workers=20 |
+        | Should Be Equal As Integers | ${responses}[0][status] | 200 |
+        """
+        prepared = []
+        for spec in requests:
+            if not isinstance(spec, dict):
+                spec = dict(zip(("method", "endpoint", "body"), spec))
+            endpoint, request = self._build_request(
+                spec["method"], spec["endpoint"], spec.get("query"), spec.get("body"), spec.get("timeout"),
+                spec.get("allow_redirects"), spec.get("headers"))
+            self._prepare_url(endpoint, request)
+            prepared.append(request)
+        validate = self._input_boolean(validate)
+
+        def send(request):
+            started = time.perf_counter()
+            try:
+                response, error = self._send_or_fail(request), None
+            except Exception as e:
+                response, error = None, str(e)
+            return response, error, round(time.perf_counter() - started, 3)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, int(workers))) as executor:
+            sent = list(executor.map(send, prepared))
+        responses = []
+        for request, (response, error, elapsed) in zip(prepared, sent):
+            result = {"status": None, "body": None, "headers": {}, "seconds": 0.0}
+            if response is not None:
+                try:
+                    result.update(self._record(request, response, validate)["response"])
+                except AssertionError as e:
+                    result.update(status=response.status_code)
+                    error = str(e)
+            result.update(elapsed=elapsed, error=error)
+            responses.append(result)
+        failed = [(request, result) for request, result in zip(prepared, responses) if result["error"]]
+        logger.info("Sent %s requests on %s workers in %.3f seconds, %s failed" % (
+            len(responses), workers, time.perf_counter() - started, len(failed)))
+        if failed and self._input_boolean(fail_on_error):
+            raise AssertionError("%s of %s requests failed:\n%s" % (len(failed), len(responses), "\n".join(
+                "%s %s: %s" % (request["method"], request["url"], result["error"]) for request, result in failed)))
+        return responses
 
     @keyword
     def get_response_body(self):
@@ -60,15 +313,108 @@ class ExtendedKeywords(Keywords):
         self.request["headers"] = {}
         return self.request["headers"]
 
+    @keyword(name="Get HTTP Cache Statistics")
+    def get_http_cache_statistics(self):
+        """*Returns the statistics of the response cache enabled by the library argument ``cache``.*
+
+        ``hits`` are fresh responses returned without a request, ``revalidated`` are responses
+        confirmed by 304 Not Modified and ``misses`` are responses sent by the server.
+
+        Returns a dictionary of hits, revalidated, misses, stored, evicted, entries and hit_ratio.
+
+        *Examples*
+
+        | ${statistics} = | `Get HTTP Cache Statistics` |
+        | Log | ${statistics}[hit_ratio] |
+        """
+        if self.cache is None:
+            raise RuntimeError("The response cache is not enabled, import the library with cache=true")
+        statistics = self.cache.statistics()
+        logger.info("HTTP cache statistics: %s" % statistics)
+        return statistics
+
+    @keyword(name="Clear HTTP Cache")
+    def clear_http_cache(self):
+        """*Removes all responses from the cache enabled by the library argument ``cache``.*"""
+        if self.cache is not None:
+            self.cache.clear()
+
+    @keyword(name="Download Response To File")
+    def download_response_to_file(self, endpoint, file_path, query=None, timeout=None, allow_redirects=None,
+                                  headers=None, chunk_size=1048576):
+        """*Sends a GET request and writes the response body to a file in chunks.*
+
+        The body is not loaded into memory and no instance is added, so it is used for large exports.
+        The file is replaced only when the whole body is downloaded. Values can be read from
+        a JSON file by `Get Values From JSON File` without loading the whole file.
+
+        *Options*
+
+        ``query``, ``timeout``, ``allow_redirects`` and ``headers`` are the same as `GET`.
+
+        ``chunk_size``: The number of bytes read and written at a time.
+
+        Returns a dictionary of status, headers, path, size in bytes and seconds.
+
+        *Examples*
+
+        | ${download} = | `Download Response To File` | /exports/users | ${OUTPUT DIR}/users.json |
+        | Should Be Equal As Integers | ${download}[status] | 200 |
+        | ${names} = | Get Values From JSON File | ${download}[path] | $.users[*].name |
+        """
+        endpoint, request = self._build_request("GET", endpoint, query, None, timeout, allow_redirects, headers)
+        self._prepare_url(endpoint, request)
+        file_path = path.join(getcwd(), file_path)
+        started = time.perf_counter()
+        response = self._send_or_fail(request, stream=True)
+        size = 0
+        handle, temp_path = tempfile.mkstemp(dir=path.dirname(file_path), suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as file:
+                for chunk in response.iter_content(int(chunk_size)):
+                    file.write(chunk)
+                    size += len(chunk)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        finally:
+            response.close()
+        download = {
+            "status": response.status_code,
+            "headers": dict(response.headers),
+            "path": file_path,
+            "size": size,
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+        logger.info("Downloaded %s bytes from %s %s to %s in %.3f seconds" % (
+            size, request["method"], request["url"], file_path, download["seconds"]))
+        return download
+
+    @keyword(name=None, tags=("I/O",))
+    def output_schema(self, what="", file_path=None, append=False, sort_keys=False):
+        """*Outputs JSON Schema to terminal or a file.*
+
+        The same as RESTinstance `Output Schema`, the schema of the last instance is made first
+        if it was skipped by the lightweight mode.
+
+        *Examples*
+
+        | `Output Schema` | response | ${CURDIR}/response_schema.json |
+        | `Output Schema` | $.email |
+        """
+        if self.instances:
+            self._instance_schema(self._last_instance_or_error())
+        return Keywords.output_schema(self, what, file_path, append, sort_keys)
+
     @keyword
     def get_value_from_rest(self, what="", file_path=None, append=False, sort_keys=False):
         """The copy of the `Output` keyword but is not printed to terminal."""
         if isinstance(what, (STRING_TYPES)):
             if what == "":
                 try:
-                    json = deepcopy(self._last_instance_or_error())
-                    json.pop("schema")
-                    json.pop("spec")
+                    instance = self._last_instance_or_error()
+                    json = deepcopy({"request": instance["request"], "response": instance["response"]})
                 except IndexError:
                     raise RuntimeError(no_instances_error)
             elif what.startswith("schema"):
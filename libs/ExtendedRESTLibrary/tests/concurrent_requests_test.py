@@ -0,0 +1,64 @@
+import json
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler
+from ExtendedRESTLibrary import ExtendedRESTLibrary
+from Utilities.tests.server_fixture import HTTPServerTestCase
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.startswith('/slow'):
+            time.sleep(0.2)
+        self.reply(200, {'path': self.path})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'null')
+        self.reply(201, {'path': self.path, 'body': body})
+
+
+class ConcurrentRequestsTest(HTTPServerTestCase):
+    handler = EchoHandler
+
+    def setUp(self):
+        self.library = ExtendedRESTLibrary(self.url, instances=[])
+
+    def test1(self):
+        '''Responses and instances are in the given order while requests are sent at the same time'''
+        requests = [{'method': 'GET', 'endpoint': '/slow/%s?a=1' % index, 'query': {'b': 2}} for index in range(8)]
+        requests.append(['POST', '/users', {'name': 'Gil Alexander'}])
+        started = time.perf_counter()
+        responses = self.library.send_requests_concurrently(requests, workers=8)
+        assert time.perf_counter() - started < 1.2
+        assert [response['body']['path'] for response in responses[:8]] == \
+               ['/slow/%s?a=1&b=2' % index for index in range(8)]
+        assert responses[8]['status'] == 201 and responses[8]['body']['body'] == {'name': 'Gil Alexander'}
+        assert all(response['error'] is None and response['elapsed'] >= 0 for response in responses)
+        assert [instance['request']['path'] for instance in self.library.instances] == \
+               ['/slow/%s' % index for index in range(8)] + ['/users']
+
+    def test2(self):
+        '''Expectations are validated and errors are reported together'''
+        self.library.expect_response({'properties': {'status': {'enum': [200]}}})
+        requests = [['GET', '/users/1'], ['POST', '/users', {}], ['GET', 'http://127.0.0.1:1/closed']]
+        with self.assertRaises(AssertionError) as context:
+            self.library.send_requests_concurrently(requests)
+        assert str(context.exception).startswith('2 of 3 requests failed')
+        responses = self.library.send_requests_concurrently(requests, validate=False, fail_on_error=False)
+        assert [response['status'] for response in responses] == [200, 201, None]
+        assert responses[2]['error']
+        responses = self.library.send_requests_concurrently(requests, fail_on_error=False)
+        assert responses[1]['status'] == 201 and '201 is not one of [200]' in responses[1]['error']
@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+import unittest
+from http.server import BaseHTTPRequestHandler
+from ExtendedRESTLibrary import ExtendedRESTLibrary
+from Utilities import get_values_from_json_file
+from Utilities.tests.server_fixture import HTTPServerTestCase
+
+
+class ExportHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        count = int(self.path.rsplit('/', 1)[-1])
+        data = json.dumps({'users': [{'id': index, 'name': 'user%s' % index} for index in range(count)]}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        if self.path.startswith('/broken'):
+            # the connection is closed before the whole body is sent
+            self.send_header('Content-Length', str(len(data) * 2))
+            self.send_header('Connection', 'close')
+        else:
+            self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class DownloadTest(HTTPServerTestCase):
+    handler = ExportHandler
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, 'users.json')
+        self.library = ExtendedRESTLibrary(self.url, instances=[])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test1(self):
+        download = self.library.download_response_to_file('/export/5000', self.file_path, chunk_size=4096)
+        assert download['status'] == 200
+        assert download['path'] == self.file_path
+        assert download['size'] == os.path.getsize(self.file_path)
+        assert self.library.instances == []
+        assert get_values_from_json_file(self.file_path, '$.users[*].id', limit=3) == [0, 1, 2]
+        assert get_values_from_json_file(self.file_path, 'users 4999 name') == ['user4999']
+
+    def test2(self):
+        '''A failed download keeps the previous file and removes the temporary file'''
+        with open(self.file_path, 'w') as file:
+            file.write('previous')
+        with self.assertRaises(Exception):
+            self.library.download_response_to_file('/broken/5000', self.file_path, chunk_size=4096)
+        with open(self.file_path) as file:
+            assert file.read() == 'previous'
+        assert os.listdir(self.directory.name) == ['users.json']
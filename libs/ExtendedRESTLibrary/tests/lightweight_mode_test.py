@@ -0,0 +1,63 @@
+import json
+import unittest
+from http.server import BaseHTTPRequestHandler
+from ExtendedRESTLibrary import ExtendedRESTLibrary
+from Utilities.tests.server_fixture import HTTPServerTestCase
+
+
+class UserHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        index = int(self.path.rsplit('/', 1)[-1])
+        data = json.dumps({'id': index, 'name': 'user%s' % index, 'roles': ['admin', 'user']}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class LightweightModeTest(HTTPServerTestCase):
+    handler = UserHandler
+
+    def test1(self):
+        '''Only the last max_instances instances are kept'''
+        library = ExtendedRESTLibrary(self.url, instances=[], lightweight=True, max_instances=3)
+        for index in range(10):
+            library.get('/users/%s' % index)
+        assert len(library.instances) == 3
+        assert [instance['response']['body']['id'] for instance in library.instances] == [7, 8, 9]
+        library = ExtendedRESTLibrary(self.url, instances=[])
+        for index in range(5):
+            library.get('/users/%s' % index)
+        assert len(library.instances) == 5
+
+    def test2(self):
+        '''The schema is not made until an assertion keyword or Output Schema uses it'''
+        library = ExtendedRESTLibrary(self.url, instances=[], lightweight=True)
+        library.get('/users/1')
+        assert library.instances[-1]['schema'] is None
+        assert library.get_value_from_rest('') == {'request': library.instances[-1]['request'],
+                                                   'response': library.instances[-1]['response']}
+        assert library.instances[-1]['schema'] is None
+        assert library.integer('response body id', 1) == [1]
+        assert library.string('$.roles[0]', 'admin') == ['admin']
+        schema = library.instances[-1]['schema']
+        assert schema['title'] == 'GET %s/users/1' % self.url
+        assert schema['properties']['response']['properties']['body']['properties']['id']['enum'] == [1]
+        with self.assertRaises(AssertionError):
+            library.integer('response body id', minimum=2)
+        library.get('/users/2')
+        library.output_schema('response body')
+        assert library.instances[-1]['schema'] is not None
+
+    def test3(self):
+        '''The schema is made for every request when expectations are set'''
+        library = ExtendedRESTLibrary(self.url, instances=[], lightweight=True)
+        library.expect_response_body({'properties': {'id': {'type': 'integer'}}})
+        library.get('/users/1')
+        assert library.instances[-1]['schema'] is not None
@@ -8,7 +8,16 @@ import random
 from robot.api import logger
 import pytz
 from base64 import urlsafe_b64decode
+from collections import OrderedDict
 from ExtendedDatabaseLibrary import ExtendedDatabaseLibrary
+from ExtendedDatabaseLibrary.ExtendedQuery import get_paramstyle
+
+# tags which are values in sql, other words in brackets are identifiers like [dbo].[table]
+SQL_VALUE_TAGS = ('[AUTO_GEN', '[EXIST_', '[NOW_', '[SAVE', '[LOAD', '[QUERY:', '[IMAGE-FILE]')
+# a tag can have a days suffix like [NOW_UTC_DATE]+1D, it is a part of the value
+SQL_TOKEN = re.compile(r"'(?:[^']|'')*'|\[[^\[\]]+\](?:[+-]\d+D)?")
+SQL_TAG = re.compile(r"\[[^\[\]]+\](?:[+-]\d+D)?$")
+SQL_TEMPLATE_CACHE_SIZE = 100
 
 
 class TagGenerate:
@@ -73,6 +82,7 @@ class TagGenerate:
         'COOKIE': {},
         'COOKIE_LAST': {}
     }
+    __sql_templates = OrderedDict()
 
     @keyword("Get Saved Cookies")
     def get_saved_cookies(self):
@@ -371,8 +381,6 @@ class TagGenerate:
                 logger.warn(f'Have no SQL match with {tag} : {ex}')
                 return ""
             return tag
-        sql = self.generate_tag_inside_string(sql)
-        sql = sql.replace(';', '')
         db_connector = ExtendedDatabaseLibrary()
         try:
             # decode for DB_PASSWORD only
@@ -389,8 +397,9 @@ class TagGenerate:
             # db_connector.connect_sql_server(db_config_file='./db.cfg')
         except KeyError:
             raise KeyError(f'sheet setting require DB_MODULE, DB_HOST, DB_NAME, DB_USERNAME, DB_PASSWORD, DB_PORT. please check test data and try again later.')
-        result = db_connector.query(sql)
-        db_connector.disconnect_from_database()
+        # tags are bound as parameters, so the statement is prepared once and the connection is reused
+        statement, parameters = self.generate_sql_parameters(sql.replace(';', ''), get_paramstyle(DB_MODILE))
+        result = db_connector.query_with_parameters(statement, parameters)
         try:
             one_result = result[0]
         except IndexError:
@@ -628,4 +637,76 @@ class TagGenerate:
         for inside_tag in inside_tags:
             value = str(self.generate_value_for_tag(inside_tag, None))
             valid_string = str(valid_string).replace(inside_tag, value)
-        return valid_string
\ No newline at end of file
+        return valid_string
+
+    def __is_sql_value_tag(self, token):
+        return str(token).upper().startswith(SQL_VALUE_TAGS)
+
+    def __parse_sql_tags(self, sql, paramstyle):
+        """
+        Returns the statement with parameter markers and the templates of parameter values.
+        A quoted text with tags becomes one parameter, for example 'ROBOT[LOAD_ID]%' --> ?
+        """
+        statement = []
+        templates = []
+        position = 0
+        escape = paramstyle in ('format', 'pyformat')
+        for match in SQL_TOKEN.finditer(sql):
+            token = match.group()
+            if token.startswith("'"):
+                template = token[1:-1].replace("''", "'")
+                is_value = any(self.__is_sql_value_tag(tag) for tag in self.get_tags_in_string(template))
+            else:
+                template = token
+                is_value = self.__is_sql_value_tag(token)
+            if not is_value:
+                continue
+            text = sql[position:match.start()]
+            statement.append(text.replace('%', '%%') if escape else text)
+            if paramstyle == 'numeric':
+                statement.append(f':{len(templates) + 1}')
+            elif paramstyle == 'named':
+                statement.append(f':p{len(templates)}')
+            else:
+                statement.append('%s' if escape else '?')
+            templates.append(template)
+            position = match.end()
+        text = sql[position:]
+        statement.append(text.replace('%', '%%') if escape else text)
+        return ''.join(statement), templates
+
+    @keyword("Generate Sql Parameters From Tags")
+    def generate_sql_parameters(self, sql, paramstyle='qmark'):
+        """
+        Generate tags inside sql as parameters instead of text, so the statement is the same for every value.
+        The parsed statement is cached by the sql, the least recently used one is dropped after 100 statements.
+        A days suffix is a part of the tag, for example [NOW_UTC_DATE]+1D is one parameter.
+
+        *Options*
+
+        ``sql``: SQL statement with tags
+
+        ``paramstyle``: paramstyle of the DB API module, qmark (pyodbc, sqlite3), format, numeric or named
+
+        *Examples*
+
+        |  ${STATEMENT}  |  ${PARAMETERS} =  |  `Generate Sql Parameters From Tags`  |  SELECT * FROM [dbo].[payment] WHERE id = '[LOAD_ID]' AND ref LIKE 'ROBOT[EXIST_ROBOT_ID]%'  |
+        |  `log to console`  |  ${STATEMENT}  |  # SELECT * FROM [dbo].[payment] WHERE id = ? AND ref LIKE ?  |
+        """
+        key = (sql, paramstyle)
+        if key in self.__sql_templates:
+            self.__sql_templates.move_to_end(key)
+        else:
+            if len(self.__sql_templates) >= SQL_TEMPLATE_CACHE_SIZE:
+                self.__sql_templates.popitem(last=False)
+            self.__sql_templates[key] = self.__parse_sql_tags(sql, paramstyle)
+        statement, templates = self.__sql_templates[key]
+        values = []
+        for template in templates:
+            if self.__is_sql_value_tag(template) and SQL_TAG.match(template):
+                values.append(self.generate_value_for_tag(template, None))
+            else:
+                values.append(self.generate_tag_inside_string(template))
+        if paramstyle == 'named':
+            return statement, dict((f'p{index}', value) for index, value in enumerate(values))
+        return statement, values
@@ -1,4 +1,12 @@
 # encoding=utf8
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import tempfile
+from datetime import datetime
+from xml.etree import ElementTree
 from robot.api import logger
 from robot.api.deco import keyword
 
@@ -17,9 +25,15 @@ class TCReloader:
     """
 
     ROBOT_LIBRARY_SCOPE = 'TEST SUITE'
+    TEST_CASES_HEADER = "*** Test Cases ***"
+    WRITE_BUFFER_SIZE = 1024 * 1024
+    MANIFEST_EXTENSION = ".manifest.json"
+    SHARDS_EXTENSION = ".shards.json"
+    OUTPUT_TIME_FORMAT = "%Y%m%d %H:%M:%S.%f"
 
     def __init__(self):
         self.status = None
+        self.__step_files = {}
 
     @staticmethod
     def __log_error(message: str):
@@ -87,29 +101,45 @@ class TCReloader:
         """
         Used for clear all test case from robot file but still keep Settings,
         Variables and Keywords.
+        The file is copied line by line up to *** Test Cases *** into a temporary file which replaces it,
+        and the kept and dropped bytes are logged. The file is not changed if there is no *** Test Cases ***.
         """
 
         try:
-            with open(str(robot_filepath), "r+") as script:
-                script_lines = script.readlines()
-                script.truncate(0)
-                found = False
-                script.seek(0)
-                for line in script_lines:
-                    if not found:
-                        script.write(line)
-                    line = str(line).lower()
-                    if "*** test cases ***" in line:
-                        found = True
-                        script.write("")
-                        break
-                if not found:
-                    self.status = False
-                script.close()
+            robot_filepath = str(robot_filepath)
+            header = self.TEST_CASES_HEADER.lower().encode()
+            found = False
+            kept = 0
+            total = os.path.getsize(robot_filepath)
+            folder = os.path.dirname(os.path.abspath(robot_filepath))
+            handle, temp_filepath = tempfile.mkstemp(suffix=".robot", dir=folder)
+            try:
+                # copy lines up to *** Test Cases *** without reading the whole file into memory
+                with open(robot_filepath, "rb") as script, os.fdopen(handle, "wb") as kept_script:
+                    for line in script:
+                        kept_script.write(line)
+                        kept += len(line)
+                        if header in line.lower():
+                            found = True
+                            break
+                if found:
+                    self.__replace_file(temp_filepath, robot_filepath)
+                else:
+                    os.remove(temp_filepath)
+            except Exception:
+                if os.path.exists(temp_filepath):
+                    os.remove(temp_filepath)
+                raise
+            self.status = found
+            if found:
+                self.__log_info(
+                    f"Clear test cases from file '{robot_filepath}' : kept {kept} bytes, dropped {total - kept} bytes"
+                )
+            else:
                 self.__log_info(
-                    f"Clear test cases from file '{robot_filepath}'"
+                    f"There is no {self.TEST_CASES_HEADER} on file '{robot_filepath}', the file is not changed"
                 )
-                return self.status
+            return self.status
         except Exception as exception:
             self.__log_error(
                 f"There are error occur while clear testcases on file '{robot_filepath}' : {exception}"
@@ -132,24 +162,9 @@ class TCReloader:
         """
 
         try:
+            testcase = self.__format_testcase(test_name, documentation, tags, self.__read_steps(step_filepath))
             with open(str(robot_filepath), "a") as script:
-                script.write(f'{test_name}\n')
-                if documentation != '':
-                    documentation = str(documentation).replace('\n', '\n  ...  \\n')
-                    script.write(f"  [Documentation]  {documentation}\n")
-                script.write(f"  [Tags]  ")
-                if len(tags) > 0:
-                    for tag in tags:
-                        script.write(f"{tag}  ")
-                script.write("\n")
-                with open(str(step_filepath), "r") as steps:
-                    step_lines = steps.readlines()
-                    for line in step_lines:
-                        script.write(line)
-                    script.write('\n')
-                    self.status = True
-                script.write("\n")
-                script.close()
+                script.write(testcase)
                 self.status = True
             self.__log_info(
                 f"[{test_name}] has been created"
@@ -160,3 +175,436 @@ class TCReloader:
                 f"There are error occur while add test case '{test_name}' on file '{robot_filepath}' : {exception}"
             )
             raise
+
+    def __read_steps(self, step_filepath: str) -> str:
+        """
+        Returns the content of the step file, files are kept in memory until they are modified.
+        """
+        step_filepath = str(step_filepath)
+        modified = os.path.getmtime(step_filepath)
+        cached = self.__step_files.get(step_filepath)
+        if cached is None or cached[0] != modified:
+            with open(step_filepath, "r") as steps:
+                cached = (modified, steps.read())
+            self.__step_files[step_filepath] = cached
+        return cached[1]
+
+    @staticmethod
+    def __format_testcase(test_name: str, documentation: str, tags: list, steps: str) -> str:
+        """
+        Returns the test case block in the same format as `Write Test Case`.
+        """
+        lines = [f'{test_name}\n']
+        if documentation:
+            documentation = str(documentation).replace('\n', '\n  ...  \\n')
+            lines.append(f"  [Documentation]  {documentation}\n")
+        lines.append("  [Tags]  " + "".join(f"{tag}  " for tag in tags or []) + "\n")
+        lines.append(steps)
+        lines.append("\n\n")
+        return "".join(lines)
+
+    def __format_spec(self, spec: dict) -> str:
+        name = spec.get("name") or spec.get("test_name")
+        if not name:
+            raise ValueError(f"Test case should have a name : {spec}")
+        steps = spec.get("steps")
+        if steps is None:
+            step_filepath = spec.get("step_filepath") or spec.get("steps_file")
+            if step_filepath is None:
+                raise ValueError(f"Test case '{name}' should have steps or step_filepath")
+            steps = self.__read_steps(step_filepath)
+        elif not isinstance(steps, str):
+            steps = "".join(f"{line}\n" for line in steps)
+        tags = spec.get("tags") or []
+        if isinstance(tags, str):
+            tags = [tag.strip() for tag in tags.split(",") if tag.strip()]
+        return self.__format_testcase(name, spec.get("documentation", spec.get("doc", "")), tags, steps)
+
+    def __read_header(self, header_filepath: str = None) -> str:
+        if header_filepath:
+            with open(str(header_filepath), "r") as headers:
+                return headers.read() + "\n"
+        return f"{self.TEST_CASES_HEADER}\n"
+
+    @staticmethod
+    def __replace_file(temp_filepath: str, robot_filepath: str):
+        # keep permissions of the replaced file, mkstemp creates the file for the owner only
+        os.chmod(temp_filepath, os.stat(robot_filepath).st_mode if os.path.exists(robot_filepath) else 0o644)
+        os.replace(temp_filepath, robot_filepath)
+
+    def __write_atomic(self, robot_filepath: str, parts) -> int:
+        """
+        Writes all parts through one buffered writer into a temporary file which replaces the robot file.
+        Returns the number of written bytes.
+        """
+        robot_filepath = str(robot_filepath)
+        folder = os.path.dirname(os.path.abspath(robot_filepath))
+        handle, temp_filepath = tempfile.mkstemp(suffix=".robot", dir=folder)
+        try:
+            with os.fdopen(handle, "w", buffering=self.WRITE_BUFFER_SIZE) as script:
+                for part in parts:
+                    script.write(part)
+                size = script.tell()
+            self.__replace_file(temp_filepath, robot_filepath)
+        except Exception:
+            os.remove(temp_filepath)
+            raise
+        return size
+
+    @staticmethod
+    def __hash(content: str) -> str:
+        return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+    def __read_manifest(self, robot_filepath: str):
+        """
+        Returns the manifest of the robot file, or None if there is no manifest or the robot file was changed
+        after the manifest was written.
+        """
+        try:
+            with open(f"{robot_filepath}{self.MANIFEST_EXTENSION}", "r") as manifest_file:
+                manifest = json.load(manifest_file)
+            stat = os.stat(robot_filepath)
+        except (OSError, ValueError):
+            return None
+        if manifest.get("size") != stat.st_size or manifest.get("mtime_ns") != stat.st_mtime_ns:
+            return None
+        return manifest
+
+    def __write_manifest(self, robot_filepath: str, header_hash: str, testcase_hashes: list):
+        stat = os.stat(robot_filepath)
+        manifest = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "header": header_hash,
+            "testcases": testcase_hashes
+        }
+        with open(f"{robot_filepath}{self.MANIFEST_EXTENSION}", "w") as manifest_file:
+            json.dump(manifest, manifest_file, indent=1)
+
+    @staticmethod
+    def __compare_manifest(manifest: dict, testcase_hashes: list) -> tuple:
+        """
+        Returns the number of changed, added and removed test cases by name.
+        """
+        old_hashes = dict((name, content_hash) for name, content_hash in manifest["testcases"])
+        new_hashes = dict((name, content_hash) for name, content_hash in testcase_hashes)
+        changed = sum(1 for name, content_hash in new_hashes.items() if name in old_hashes
+                      and old_hashes[name] != content_hash)
+        added = sum(1 for name in new_hashes if name not in old_hashes)
+        removed = sum(1 for name in old_hashes if name not in new_hashes)
+        return changed, added, removed
+
+    @keyword("Generate Robot File")
+    def generate_robot_file(self, robot_filepath: str, testcases: list, header_filepath: str = None,
+                            incremental: bool = False) -> int:
+        """
+        Used for write the whole robot file with many test cases at once. The header file is written first
+        like `Add Test Case Header`, then each test case is written like `Write Test Case`.
+        The file is replaced only when all test cases are written.
+
+        Each test case is a dictionary of ``name``, ``documentation``, ``tags`` (list or comma separated text)
+        and either ``step_filepath`` or ``steps`` (text or list of lines). Step files are read once.
+        If there is no header file, only the *** Test Cases *** line is written.
+
+        If ``incremental`` is true, the hashes of the header and each test case are kept in
+        {robot_filepath}.manifest.json. The robot file is not written when nothing is changed, otherwise
+        the changed, added and removed test cases are logged.
+
+        Return the number of test cases.
+
+        TCReloader.generate_robot_file(
+            "~/project/template_testcases.robot",
+            [{"name": "Example Test Case #001", "tags": ["tag#1"], "step_filepath": "~/project/_generate_parts/teststeps.txt"}],
+            "~/project/_generate_parts/header.txt"
+        )
+        """
+
+        try:
+            robot_filepath = str(robot_filepath)
+            header = self.__read_header(header_filepath)
+            # test cases are formatted while they are written, the list is only kept for the hashes
+            blocks = (self.__format_spec(spec) for spec in testcases)
+            if incremental:
+                blocks = list(blocks)
+                header_hash = self.__hash(header)
+                testcase_hashes = [[block[:block.index("\n")], self.__hash(block)] for block in blocks]
+                manifest = self.__read_manifest(robot_filepath)
+                if manifest is not None:
+                    if manifest["header"] == header_hash and manifest["testcases"] == testcase_hashes:
+                        self.__log_info(
+                            f"Test cases on file '{robot_filepath}' are not changed"
+                        )
+                        return len(testcases)
+                    changed, added, removed = self.__compare_manifest(manifest, testcase_hashes)
+                    self.__log_info(
+                        f"Test cases on file '{robot_filepath}' : {changed} changed, {added} added, {removed} removed"
+                    )
+            size = self.__write_atomic(robot_filepath, itertools.chain([header], blocks))
+            if incremental:
+                self.__write_manifest(robot_filepath, header_hash, testcase_hashes)
+            self.__log_info(
+                f"Generated {len(testcases)} test cases ({size} bytes) on file '{robot_filepath}'"
+            )
+            return len(testcases)
+        except Exception as exception:
+            self.__log_error(
+                f"There are error occur while generate robot file '{robot_filepath}' : {exception}"
+            )
+            raise
+
+    @staticmethod
+    def __balance_shards(weights: list, shards: int) -> list:
+        """
+        Returns the indexes of the weights for each shard. The heaviest item is given to the lightest shard first
+        (longest processing time first), indexes in each shard keep the original order.
+        """
+        shards = max(1, min(int(shards), len(weights))) if weights else 1
+        loads = [(0.0, shard) for shard in range(shards)]
+        groups = [[] for _ in range(shards)]
+        for index in sorted(range(len(weights)), key=lambda item: weights[item], reverse=True):
+            load, shard = heapq.heappop(loads)
+            groups[shard].append(index)
+            heapq.heappush(loads, (load + float(weights[index]), shard))
+        return [sorted(group) for group in groups]
+
+    @staticmethod
+    def __shard_filepath(robot_filepath: str, shard: int, shards: int) -> str:
+        """
+        Returns the file path of the shard number (from 1), the robot file path is used when there is one shard.
+        """
+        if shards <= 1:
+            return str(robot_filepath)
+        root, extension = os.path.splitext(str(robot_filepath))
+        return f"{root}_{shard}{extension or '.robot'}"
+
+    def __remove_stale_shards(self, filepath: str, shard_filepaths: list) -> list:
+        """
+        Removes the shard files (and their manifests) recorded by the previous run in {filepath}.shards.json
+        which are not generated by this run, then records the shard files of this run.
+        Files which are not recorded are never removed.
+        """
+        filepath = str(filepath)
+        folder = os.path.dirname(os.path.abspath(filepath))
+        shards_filepath = f"{filepath}{self.SHARDS_EXTENSION}"
+        try:
+            with open(shards_filepath, "r") as shards_file:
+                recorded = json.load(shards_file)
+        except (OSError, ValueError):
+            recorded = []
+        generated = [os.path.basename(str(shard_filepath)) for shard_filepath in shard_filepaths]
+        removed = []
+        for filename in recorded:
+            if filename in generated:
+                continue
+            stale_filepath = os.path.join(folder, filename)
+            for stale_file in (stale_filepath, f"{stale_filepath}{self.MANIFEST_EXTENSION}"):
+                if os.path.exists(stale_file):
+                    os.remove(stale_file)
+            removed.append(stale_filepath)
+        with open(shards_filepath, "w") as shards_file:
+            json.dump(generated, shards_file, indent=1)
+        if removed:
+            self.__log_info(
+                f"Removed {len(removed)} stale shard files of '{filepath}'"
+            )
+        return removed
+
+    @staticmethod
+    def __read_excel_testcases(excel_filepath: str, sheet_name: str) -> list:
+        """
+        Returns all test cases of the sheet like `Get Test Case` by reading the sheet once.
+        """
+        from ExcelImportLibrary import ExcelImport
+        excel = ExcelImport()
+        excel.open_excel_file(excel_filepath)
+        excel.select_excel_sheet(sheet_name)
+        excel.set_working_rows(2, excel.get_max_row(), excel.get_max_column())
+        return [excel.get_test_case(index) for index in range(excel.get_max_test_cases())]
+
+    @staticmethod
+    def __first_value(values: dict, column: str):
+        if not column:
+            return None
+        for value in values.get(column) or []:
+            if value not in (None, ""):
+                return value
+        return None
+
+    def __excel_spec(self, testcase: dict, step_filepath: str, name_column: str, documentation_column: str,
+                     tags_column: str, steps_column: str, step_filepath_column: str) -> dict:
+        values = testcase["values"]
+        spec = {
+            "name": self.__first_value(values, name_column),
+            "documentation": self.__first_value(values, documentation_column) or "",
+            "tags": ",".join(str(tag) for tag in values.get(tags_column) or [] if tag not in (None, ""))
+        }
+        steps = [str(step) for step in values.get(steps_column) or [] if step not in (None, "")]
+        if steps:
+            spec["steps"] = steps
+        else:
+            spec["step_filepath"] = self.__first_value(values, step_filepath_column) or step_filepath
+        return spec
+
+    @keyword("Generate Robot Files From Excel")
+    def generate_robot_files_from_excel(self, excel_filepath: str, sheet_name: str, robot_filepath: str,
+                                        header_filepath: str = None, step_filepath: str = None, shards: int = 1,
+                                        balance_by: str = "rows", name_column: str = "Test Case",
+                                        documentation_column: str = "Documentation", tags_column: str = "Tags",
+                                        steps_column: str = None, step_filepath_column: str = None,
+                                        duration_column: str = None, incremental: bool = False) -> list:
+        """
+        Used for generate robot files from test cases in the excel sheet (XLSX) read by ExcelImportLibrary.
+        A test case starts at the row which has the first column like `Set Working Rows`.
+
+        The name, documentation and tags (comma separated) are read from their columns. Steps are the lines of
+        ``steps_column``, otherwise the file in ``step_filepath_column``, otherwise ``step_filepath``.
+
+        The test cases can be split into ``shards`` files named robot_1.robot, robot_2.robot, ... for running in
+        parallel. The generated files are recorded in {robot_filepath}.shards.json and recorded files which are
+        not generated again, like shards above a smaller number of shards, are removed. Shards are balanced by the
+        number of excel rows of each test case (``balance_by=rows``) or by the estimated duration in
+        ``duration_column`` (``balance_by=duration``).
+
+        If ``incremental`` is true, only changed robot files are written like `Generate Robot File`.
+
+        Return the list of generated robot files.
+
+        TCReloader.generate_robot_files_from_excel(
+            "~/project/testdata.xlsx",
+            "Transfer",
+            "~/project/transfer.robot",
+            header_filepath="~/project/_generate_parts/header.txt",
+            step_filepath="~/project/_generate_parts/teststeps.txt",
+            shards=4
+        )
+        """
+
+        try:
+            if balance_by not in ("rows", "duration"):
+                raise ValueError(f"balance_by should be rows or duration but got '{balance_by}'")
+            if balance_by == "duration" and not duration_column:
+                raise ValueError("duration_column is required to balance by duration")
+            testcases = self.__read_excel_testcases(excel_filepath, sheet_name)
+            specs = [self.__excel_spec(testcase, step_filepath, name_column, documentation_column, tags_column,
+                                       steps_column, step_filepath_column) for testcase in testcases]
+            if balance_by == "duration":
+                weights = [float(self.__first_value(testcase["values"], duration_column) or 0)
+                           for testcase in testcases]
+            else:
+                weights = [testcase["end_row"] - int(testcase["start_row"]) + 1 for testcase in testcases]
+            groups = self.__balance_shards(weights, int(shards))
+            robot_filepaths = []
+            for shard, group in enumerate(groups, 1):
+                shard_filepath = self.__shard_filepath(robot_filepath, shard, len(groups))
+                self.generate_robot_file(shard_filepath, [specs[index] for index in group], header_filepath,
+                                         incremental)
+                robot_filepaths.append(shard_filepath)
+            self.__remove_stale_shards(robot_filepath, robot_filepaths)
+            self.__log_info(
+                f"Generated {len(specs)} test cases from sheet '{sheet_name}' into {len(robot_filepaths)} files"
+            )
+            return robot_filepaths
+        except Exception as exception:
+            self.__log_error(
+                f"There are error occur while generate robot files from '{excel_filepath}' : {exception}"
+            )
+            raise
+
+    @classmethod
+    def __status_duration(cls, status) -> float:
+        """
+        Returns the seconds of the status element of Robot Framework 3, 4 (starttime, endtime) or 7 (elapsed).
+        """
+        if status is None:
+            return None
+        if status.get("elapsed") is not None:
+            return float(status.get("elapsed"))
+        try:
+            start = datetime.strptime(status.get("starttime"), cls.OUTPUT_TIME_FORMAT)
+            end = datetime.strptime(status.get("endtime"), cls.OUTPUT_TIME_FORMAT)
+        except (TypeError, ValueError):
+            return None
+        return (end - start).total_seconds()
+
+    @keyword("Get Test Durations From Output")
+    def get_test_durations(self, output_filepaths) -> dict:
+        """
+        Used for read the duration in seconds of each test case from output.xml files of previous runs.
+        Files are read as a stream and each test case is cleared after it is read, so big files use little memory.
+        The duration is the average of all files, test cases are keyed by the long name (suite.test).
+
+        TCReloader.get_test_durations(["results/output.xml", "history/output.xml"])
+        """
+
+        if isinstance(output_filepaths, str):
+            output_filepaths = [output_filepaths]
+        durations = {}
+        for output_filepath in output_filepaths:
+            suites = []
+            try:
+                for event, element in ElementTree.iterparse(str(output_filepath), events=("start", "end")):
+                    if element.tag == "suite":
+                        if event == "start":
+                            suites.append(element.get("name"))
+                        else:
+                            suites.pop()
+                            element.clear()
+                    elif element.tag == "test" and event == "end":
+                        # the status of the test is its last direct child, statuses of keywords are nested
+                        statuses = element.findall("status")
+                        duration = self.__status_duration(statuses[-1] if statuses else None)
+                        if duration is not None:
+                            name = ".".join(suites + [element.get("name")])
+                            durations.setdefault(name, []).append(duration)
+                        element.clear()
+            except Exception as exception:
+                self.__log_error(
+                    f"There are error occur while read output file '{output_filepath}' : {exception}"
+                )
+                raise
+        return dict((name, sum(values) / len(values)) for name, values in durations.items())
+
+    @keyword("Create Test Shards From Output")
+    def create_test_shards(self, output_filepaths, shards: int, argument_filepath: str = "shard.args",
+                           tests: list = None) -> list:
+        """
+        Used for split test cases into balanced shards for running in parallel by their durations from
+        output.xml files of previous runs (`Get Test Durations From Output`). The longest test case is given
+        to the shortest shard first.
+
+        Each shard is written as an argument file (shard_1.args, shard_2.args, ...) of ``--test`` options,
+        which is run by ``robot -P libs -d results_1 --argumentfile shard_1.args tests``.
+        ``tests`` are long names of test cases to split, test cases without duration are counted
+        with the average duration. All test cases in output files are split if it is not given.
+        Fails if there is no test case to split, because an argument file without ``--test`` runs all tests.
+        Argument files are recorded like `Generate Robot Files From Excel`, so stale shards are removed.
+
+        Return the list of argument files.
+
+        TCReloader.create_test_shards("results/output.xml", 4, "results/shard.args")
+        """
+
+        try:
+            durations = self.get_test_durations(output_filepaths)
+            tests = list(tests) if tests else list(durations)
+            if not tests:
+                raise ValueError("There is no test case to split into shards")
+            default_duration = sum(durations.values()) / len(durations) if durations else 1.0
+            weights = [durations.get(test, default_duration) for test in tests]
+            groups = self.__balance_shards(weights, int(shards))
+            argument_filepaths = []
+            for shard, group in enumerate(groups, 1):
+                shard_filepath = self.__shard_filepath(argument_filepath, shard, max(2, len(groups)))
+                self.__write_atomic(shard_filepath, [f"--test {tests[index]}\n" for index in group])
+                argument_filepaths.append(shard_filepath)
+                self.__log_info(
+                    f"Shard '{shard_filepath}' has {len(group)} test cases,"
+                    f" estimated {sum(weights[index] for index in group):.3f} seconds"
+                )
+            self.__remove_stale_shards(argument_filepath, argument_filepaths)
+            return argument_filepaths
+        except Exception as exception:
+            self.__log_error(
+                f"There are error occur while create test shards from '{output_filepaths}' : {exception}"
+            )
+            raise
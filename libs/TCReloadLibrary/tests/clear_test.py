@@ -0,0 +1,53 @@
+import os
+import stat
+import tempfile
+import unittest
+from TCReloadLibrary import TCReloadLibrary
+
+HEADER = '*** Settings ***\nLibrary  Collections\n\n*** Variables ***\n${NAME}  value\n\n*** test cases ***\n'
+
+
+class ClearTestCasesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.library = TCReloadLibrary()
+        self.robot_filepath = os.path.join(self.directory.name, 'clear.robot')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, content):
+        with open(self.robot_filepath, 'w') as file:
+            file.write(content)
+
+    def read(self):
+        with open(self.robot_filepath) as file:
+            return file.read()
+
+    def test1(self):
+        self.write(HEADER + ''.join('Case %s\n  Log  %s\n\n' % (index, 'x' * 100) for index in range(1000)))
+        os.chmod(self.robot_filepath, 0o640)
+        assert self.library.clear_testcases(self.robot_filepath) is True
+        assert self.read() == HEADER
+        assert stat.S_IMODE(os.stat(self.robot_filepath).st_mode) == 0o640
+        assert os.listdir(self.directory.name) == ['clear.robot']
+        assert self.library.clear_testcases(self.robot_filepath) is True
+        assert self.read() == HEADER
+
+    def test2(self):
+        '''The file is not changed if there is no test cases header'''
+        content = '*** Keywords ***\nMy Keyword\n  No Operation\n'
+        self.write(content)
+        assert self.library.clear_testcases(self.robot_filepath) is False
+        assert self.read() == content
+        assert os.listdir(self.directory.name) == ['clear.robot']
+
+    def test3(self):
+        with self.assertRaises(OSError):
+            self.library.clear_testcases(os.path.join(self.directory.name, 'missing.robot'))
+        assert os.listdir(self.directory.name) == []
+
+
+if __name__ == '__main__':
+    unittest.main()
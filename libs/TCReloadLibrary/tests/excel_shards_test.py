@@ -0,0 +1,100 @@
+import os
+import tempfile
+import unittest
+import openpyxl
+from TCReloadLibrary import TCReloadLibrary
+
+
+class ExcelShardsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.library = TCReloadLibrary()
+        self.robot_filepath = self.path('sheet.robot')
+        self.excel_filepath = self.path('testdata.xlsx')
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.title = 'Transfer'
+        sheet.append(['Test Case', 'Documentation', 'Tags', 'Steps', 'Duration'])
+        # rows of test cases A, B, C and D are 3, 1, 1 and 1, durations are 1, 5, 4 and 2
+        sheet.append(['A', 'doc A', 'smoke', '  Log  A1', 1])
+        sheet.append([None, None, 'api', '  Log  A2', None])
+        sheet.append([None, None, None, '  Log  A3', None])
+        sheet.append(['B', None, None, '  Log  B', 5])
+        sheet.append(['C', None, None, '  Log  C', 4])
+        sheet.append(['D', None, None, '  Log  D', 2])
+        workbook.save(self.excel_filepath)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, filename):
+        return os.path.join(self.directory.name, filename)
+
+    def names(self, robot_filepath):
+        with open(robot_filepath) as file:
+            return [line.strip() for line in file if line.strip() in ('A', 'B', 'C', 'D')]
+
+    def generate(self, shards, **options):
+        return self.library.generate_robot_files_from_excel(self.excel_filepath, 'Transfer', self.robot_filepath,
+                                                            shards=shards, steps_column='Steps', **options)
+
+    def test1(self):
+        assert self.generate(1) == [self.robot_filepath]
+        assert self.names(self.robot_filepath) == ['A', 'B', 'C', 'D']
+        with open(self.robot_filepath) as file:
+            content = file.read()
+        assert 'A\n  [Documentation]  doc A\n  [Tags]  smoke  api  \n  Log  A1\n  Log  A2\n  Log  A3\n' in content
+
+    def test2(self):
+        '''Shards are balanced by excel rows'''
+        robot_filepaths = self.generate(2)
+        assert robot_filepaths == [self.path('sheet_1.robot'), self.path('sheet_2.robot')]
+        assert [self.names(robot_filepath) for robot_filepath in robot_filepaths] == [['A'], ['B', 'C', 'D']]
+
+    def test3(self):
+        '''Shards are balanced by durations, test cases keep the order of the sheet'''
+        robot_filepaths = self.generate(2, balance_by='duration', duration_column='Duration')
+        assert [self.names(robot_filepath) for robot_filepath in robot_filepaths] == [['A', 'B'], ['C', 'D']]
+        robot_filepaths = self.generate(3, balance_by='duration', duration_column='Duration')
+        assert [self.names(robot_filepath) for robot_filepath in robot_filepaths] == [['B'], ['C'], ['A', 'D']]
+        with self.assertRaises(ValueError):
+            self.generate(2, balance_by='duration')
+        with self.assertRaises(ValueError):
+            self.generate(2, balance_by='name')
+
+    def test4(self):
+        '''Recorded shard files above the new number of shards are removed'''
+        self.generate(4, incremental=True)
+        assert os.path.exists(self.path('sheet_4.robot.manifest.json'))
+        self.generate(2, incremental=True)
+        assert sorted(os.listdir(self.directory.name)) == [
+            'sheet.robot.shards.json', 'sheet_1.robot', 'sheet_1.robot.manifest.json', 'sheet_2.robot',
+            'sheet_2.robot.manifest.json', 'testdata.xlsx']
+        self.generate(1)
+        assert sorted(os.listdir(self.directory.name)) == ['sheet.robot', 'sheet.robot.shards.json', 'testdata.xlsx']
+
+    def test6(self):
+        '''Files which are not generated by the keyword are kept even if they are named like shards'''
+        for filename in ('sheet_2.robot', 'sheet_7.robot'):
+            with open(self.path(filename), 'w') as file:
+                file.write('*** Test Cases ***\nHand Written\n  No Operation\n')
+        self.generate(1)
+        self.generate(1)
+        assert sorted(os.listdir(self.directory.name)) == [
+            'sheet.robot', 'sheet.robot.shards.json', 'sheet_2.robot', 'sheet_7.robot', 'testdata.xlsx']
+        self.generate(2)
+        self.generate(1)
+        assert sorted(os.listdir(self.directory.name)) == [
+            'sheet.robot', 'sheet.robot.shards.json', 'sheet_7.robot', 'testdata.xlsx']
+
+    def test5(self):
+        '''Shard helpers are not keywords'''
+        names = [name for name in dir(self.library) if not name.startswith('_')]
+        assert 'generate_robot_files_from_excel' in names
+        assert 'balance_shards' not in names
+        assert 'shard_filepath' not in names
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+from TCReloadLibrary import TCReloadLibrary
+
+
+class GenerateRobotFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.library = TCReloadLibrary()
+        self.robot_filepath = self.path('generated.robot')
+        self.step_filepath = self.write('steps.txt', '  Log  from step file\n')
+        self.header_filepath = self.write('header.txt', '*** Settings ***\nLibrary  Collections\n\n*** Test Cases ***')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, filename):
+        return os.path.join(self.directory.name, filename)
+
+    def write(self, filename, content):
+        with open(self.path(filename), 'w') as file:
+            file.write(content)
+        return self.path(filename)
+
+    def read(self, filepath):
+        with open(filepath) as file:
+            return file.read()
+
+    def test1(self):
+        testcases = [
+            {'name': 'First', 'documentation': 'first line\nsecond line', 'tags': ['smoke', 'api'],
+             'steps': ['  Log  one', '  Log  two']},
+            {'name': 'Second', 'tags': 'regression, ui', 'step_filepath': self.step_filepath},
+            {'name': 'Third', 'step_filepath': self.step_filepath}
+        ]
+        assert self.library.generate_robot_file(self.robot_filepath, testcases, self.header_filepath) == 3
+        assert self.read(self.robot_filepath) == (
+            '*** Settings ***\nLibrary  Collections\n\n*** Test Cases ***\n'
+            'First\n  [Documentation]  first line\n  ...  \\nsecond line\n  [Tags]  smoke  api  \n'
+            '  Log  one\n  Log  two\n\n\n'
+            'Second\n  [Tags]  regression  ui  \n  Log  from step file\n\n\n'
+            'Third\n  [Tags]  \n  Log  from step file\n\n\n')
+
+    def test2(self):
+        '''Generate Robot File writes the same test case as Write Test Case'''
+        self.library.generate_robot_file(self.robot_filepath, [
+            {'name': 'Case', 'documentation': 'doc', 'tags': ['tag'], 'step_filepath': self.step_filepath}])
+        written_filepath = self.path('written.robot')
+        self.library.create_robot_file(written_filepath)
+        with open(written_filepath, 'w') as file:
+            file.write('*** Test Cases ***\n')
+        self.library.add_testcase(written_filepath, 'Case', 'doc', ['tag'], self.step_filepath)
+        assert self.read(self.robot_filepath) == self.read(written_filepath)
+
+    def test3(self):
+        '''The robot file is kept when a test case is invalid'''
+        self.library.generate_robot_file(self.robot_filepath, [{'name': 'Kept', 'steps': '  No Operation\n'}])
+        before = self.read(self.robot_filepath)
+        with self.assertRaises(ValueError):
+            self.library.generate_robot_file(self.robot_filepath, [
+                {'name': 'New', 'steps': '  No Operation\n'}, {'documentation': 'no name'}])
+        with self.assertRaises(ValueError):
+            self.library.generate_robot_file(self.robot_filepath, [{'name': 'No steps'}])
+        assert self.read(self.robot_filepath) == before
+        assert sorted(os.listdir(self.directory.name)) == ['generated.robot', 'header.txt', 'steps.txt']
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import json
+import os
+import tempfile
+import unittest
+from TCReloadLibrary import TCReloadLibrary
+
+
+class ManifestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.library = TCReloadLibrary()
+        self.robot_filepath = os.path.join(self.directory.name, 'incremental.robot')
+        self.manifest_filepath = self.robot_filepath + '.manifest.json'
+        self.testcases = [{'name': 'First', 'steps': '  Log  one\n'}, {'name': 'Second', 'steps': '  Log  two\n'}]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def generate(self, testcases):
+        self.library.generate_robot_file(self.robot_filepath, testcases, incremental=True)
+        return os.stat(self.robot_filepath).st_mtime_ns
+
+    def age(self):
+        '''Moves the robot file and its manifest back in time so a rewrite has a new mtime'''
+        stat = os.stat(self.robot_filepath)
+        os.utime(self.robot_filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10 ** 9))
+        with open(self.manifest_filepath) as file:
+            manifest = json.load(file)
+        manifest['mtime_ns'] = os.stat(self.robot_filepath).st_mtime_ns
+        with open(self.manifest_filepath, 'w') as file:
+            json.dump(manifest, file)
+        return manifest['mtime_ns']
+
+    def test1(self):
+        self.generate(self.testcases)
+        with open(self.manifest_filepath) as file:
+            manifest = json.load(file)
+        assert [name for name, content_hash in manifest['testcases']] == ['First', 'Second']
+        assert manifest['size'] == os.path.getsize(self.robot_filepath)
+        old = self.age()
+        assert self.generate([dict(testcase) for testcase in self.testcases]) == old
+
+    def test2(self):
+        '''Changed, added and removed test cases rewrite the file'''
+        self.generate(self.testcases)
+        old = self.age()
+        assert self.generate([{'name': 'First', 'steps': '  Log  changed\n'}, self.testcases[1]]) != old
+        with open(self.robot_filepath) as file:
+            assert 'Log  changed' in file.read()
+        old = self.age()
+        assert self.generate(self.testcases[1:]) != old
+        old = self.age()
+        assert self.generate(self.testcases[1:]) == old
+
+    def test3(self):
+        '''A robot file edited after the manifest was written is regenerated'''
+        self.generate(self.testcases)
+        with open(self.robot_filepath, 'a') as file:
+            file.write('Edited\n  No Operation\n')
+        self.generate(self.testcases)
+        with open(self.robot_filepath) as file:
+            assert 'Edited' not in file.read()
+        os.remove(self.manifest_filepath)
+        self.generate(self.testcases)
+        assert os.path.exists(self.manifest_filepath)
+
+    def test4(self):
+        '''Without incremental there is no manifest'''
+        self.library.generate_robot_file(self.robot_filepath, self.testcases)
+        assert not os.path.exists(self.manifest_filepath)
+
+
+if __name__ == '__main__':
+    unittest.main()
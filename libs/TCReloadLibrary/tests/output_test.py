@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+from TCReloadLibrary import TCReloadLibrary
+
+# output.xml of Robot Framework 3 and 4 keeps starttime and endtime of each status
+OUTPUT_RF3 = '''<?xml version="1.0" encoding="UTF-8"?>
+<robot generator="Robot 3.1.2">
+<suite name="Tests">
+<suite name="Transfer">
+<test name="Slow">
+<kw name="Sleep"><status status="PASS" starttime="20240101 10:00:00.000" endtime="20240101 10:00:01.000"/></kw>
+<status status="PASS" starttime="20240101 10:00:00.000" endtime="20240101 10:00:06.000"/>
+</test>
+<test name="Fast">
+<status status="FAIL" starttime="20240101 10:00:06.000" endtime="20240101 10:00:07.500">failed</status>
+</test>
+<status status="FAIL" starttime="20240101 10:00:00.000" endtime="20240101 10:00:07.500"/>
+</suite>
+<status status="FAIL" starttime="20240101 10:00:00.000" endtime="20240101 10:00:07.500"/>
+</suite>
+</robot>
+'''
+
+# output.xml of Robot Framework 7 keeps start and elapsed seconds
+OUTPUT_RF7 = '''<?xml version="1.0" encoding="UTF-8"?>
+<robot generator="Robot 7.0">
+<suite name="Tests">
+<suite name="Transfer">
+<test name="Slow">
+<kw name="Sleep"><status status="PASS" start="2024-01-02T10:00:00.000000" elapsed="1.0"/></kw>
+<status status="PASS" start="2024-01-02T10:00:00.000000" elapsed="4.0"/>
+</test>
+<test name="Medium">
+<status status="PASS" start="2024-01-02T10:00:04.000000" elapsed="3.0"/>
+</test>
+<status status="PASS" start="2024-01-02T10:00:00.000000" elapsed="7.0"/>
+</suite>
+<status status="PASS" start="2024-01-02T10:00:00.000000" elapsed="7.0"/>
+</suite>
+</robot>
+'''
+
+
+class OutputTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.library = TCReloadLibrary()
+        self.output_rf3 = self.write('output_rf3.xml', OUTPUT_RF3)
+        self.output_rf7 = self.write('output_rf7.xml', OUTPUT_RF7)
+        self.argument_filepath = self.path('shard.args')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, filename):
+        return os.path.join(self.directory.name, filename)
+
+    def write(self, filename, content):
+        with open(self.path(filename), 'w') as file:
+            file.write(content)
+        return self.path(filename)
+
+    def read(self, filepath):
+        with open(filepath) as file:
+            return file.read()
+
+    def test1(self):
+        assert self.library.get_test_durations(self.output_rf3) == {
+            'Tests.Transfer.Slow': 6.0, 'Tests.Transfer.Fast': 1.5}
+        assert self.library.get_test_durations(self.output_rf7) == {
+            'Tests.Transfer.Slow': 4.0, 'Tests.Transfer.Medium': 3.0}
+        assert self.library.get_test_durations([self.output_rf3, self.output_rf7]) == {
+            'Tests.Transfer.Slow': 5.0, 'Tests.Transfer.Fast': 1.5, 'Tests.Transfer.Medium': 3.0}
+
+    def test2(self):
+        '''Shards are balanced by durations'''
+        argument_filepaths = self.library.create_test_shards([self.output_rf3, self.output_rf7], 2,
+                                                             self.argument_filepath)
+        assert argument_filepaths == [self.path('shard_1.args'), self.path('shard_2.args')]
+        assert self.read(argument_filepaths[0]) == '--test Tests.Transfer.Slow\n'
+        assert self.read(argument_filepaths[1]) == '--test Tests.Transfer.Fast\n--test Tests.Transfer.Medium\n'
+        # a test case without duration is counted with the average duration
+        argument_filepaths = self.library.create_test_shards(self.output_rf3, 1, self.argument_filepath,
+                                                             tests=['Tests.Transfer.Fast', 'Tests.New'])
+        assert argument_filepaths == [self.path('shard_1.args')]
+        assert self.read(argument_filepaths[0]) == '--test Tests.Transfer.Fast\n--test Tests.New\n'
+        assert sorted(os.listdir(self.directory.name)) == [
+            'output_rf3.xml', 'output_rf7.xml', 'shard.args.shards.json', 'shard_1.args']
+
+    def test3(self):
+        '''Nothing to split fails instead of writing an argument file which runs all tests'''
+        empty_output = self.write('empty.xml', '<robot><suite name="Empty"><status status="PASS"/></suite></robot>')
+        assert self.library.get_test_durations(empty_output) == {}
+        with self.assertRaises(ValueError):
+            self.library.create_test_shards(empty_output, 2, self.argument_filepath)
+        with self.assertRaises(ValueError):
+            self.library.create_test_shards(empty_output, 2, self.argument_filepath, tests=[])
+        assert not [filename for filename in os.listdir(self.directory.name) if filename.endswith('.args')]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,3 +4,7 @@ from .dt_management import *
 from .xml_management import *
 from .socket_management import *
 from .tag_generator import *
+from .socket_load import *
+from .message_builder import *
+from .http_session import *
+from .json_stream import *
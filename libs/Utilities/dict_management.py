@@ -19,6 +19,9 @@ __all__ = [
     'update_the_value_for_selected_key',
     'get_the_value_for_selected_key',
     'get_keys',
+    'build_key_index',
+    'get_values_by_key_from_index',
+    'get_paths_by_key_from_index',
     'get_list_diffs',
     'delete_key_in_dictionary',
     'update_value_from_original_dictionary',
@@ -29,7 +32,7 @@ __all__ = [
 
 @keyword(name="Verify Response Body", tags=(TAG,))
 def verify_response_body(actual, expect, ignores=None, nonignores=None, check_key=True, check_datatype=True,
-                         check_value=True):
+                         check_value=True, max_messages=None, report_file=None):
     """Verify an actual result against an expected result.
 
     *Options*
@@ -44,6 +47,10 @@ def verify_response_body(actual, expect, ignores=None, nonignores=None, check_ke
 
     - ``check_value``: If false, skips any value validations for all keys.
 
+    - ``max_messages``: the maximum number of differences in the error message, the rest is summarized.
+
+    - ``report_file``: the file path to write all differences, the error message keeps the first 10 by default.
+
     Arguments:
 
     - ``actual``: Should be the actual response.
@@ -65,7 +72,7 @@ def verify_response_body(actual, expect, ignores=None, nonignores=None, check_ke
     """
     diffs = get_dict_diffs(actual, expect, ignores, nonignores, check_key, check_datatype, check_value)
     if diffs:
-        raise AssertionError(print_friendly_message(diffs))
+        raise AssertionError(print_friendly_message(diffs, max_messages, report_file))
 
 
 def get_dict_diffs(actual, expect, ignores=None, nonignores=None, check_key=True, check_datatype=True,
@@ -361,32 +368,187 @@ def get_keys(mydict):
         logger.error('Get Keys method: ' + str(e))
 
 
+class KeyIndex:
+    """
+    This is a class for recording every location of every key in a nested dictionary.
+    The payload is walked once when the index is built, then each lookup is a single dictionary access.
+
+    A path is a list of keys and list indexes from the root, the same format as dictdiffer uses.
+    Values are the objects inside the payload, not copies.
+    """
+
+    def __init__(self, mydict):
+        self.__locations = {}
+        self.__build(mydict)
+
+    def __build(self, mydict):
+        # (key, path, value), key is None for the root and for list items
+        stack = [(None, [], mydict)]
+        while stack:
+            key, path, node = stack.pop()
+            if key is not None:
+                self.__locations.setdefault(key, []).append((path, node))
+            if isinstance(node, dict):
+                children = [(k, path + [k], v) for k, v in node.items()]
+            elif isinstance(node, list):
+                children = [(None, path + [i], v) for i, v in enumerate(node)]
+            else:
+                continue
+            # push in reverse so that keys are indexed in document order
+            stack.extend(reversed(children))
+
+    def get_values(self, keyid) -> list:
+        """Returns all values of the key in document order."""
+        return [value for _, value in self.__locations.get(keyid, [])]
+
+    def get_paths(self, keyid) -> list:
+        """Returns all paths of the key in document order."""
+        return [list(path) for path, _ in self.__locations.get(keyid, [])]
+
+    def keys(self) -> list:
+        return list(self.__locations.keys())
+
+    def __contains__(self, keyid):
+        return keyid in self.__locations
+
+    def __len__(self):
+        return len(self.__locations)
+
+    def __str__(self):
+        return f'KeyIndex: {len(self.__locations)} keys'
+
+
+@keyword(name="Build Key Index", tags=(TAG,))
+def build_key_index(mydict) -> KeyIndex:
+    """
+    Build a key index from the dictionary for looking up many keys from the same payload.
+
+    Argument:
+
+    ``mydict``: the dictionary which you want to index.
+
+    Example:
+
+    | ${index} = | Build Key Index | {data: {funcName: API123, accounts: [{accNumber: 123456}, {accNumber: 654321}]}} |
+    | ${values} = | Get Values By Key From Index | ${index} | accNumber |
+
+    =>
+
+    | ${values} = [123456, 654321]
+    """
+    return KeyIndex(mydict)
+
+
+@keyword(name="Get Values By Key From Index", tags=(TAG,))
+def get_values_by_key_from_index(index: KeyIndex, keyid) -> list:
+    """
+    Get all values of the key from the index created by `Build Key Index`.
+
+    Arguments:
+
+    - ``index``: the key index.
+
+    - ``keyid``: the key which you want to get the values.
+
+    Return an empty list when the key does not exist.
+    """
+    return index.get_values(keyid)
+
+
+@keyword(name="Get Paths By Key From Index", tags=(TAG,))
+def get_paths_by_key_from_index(index: KeyIndex, keyid) -> list:
+    """
+    Get all paths of the key from the index created by `Build Key Index`.
+
+    Arguments:
+
+    - ``index``: the key index.
+
+    - ``keyid``: the key which you want to get the paths.
+
+    Example:
+
+    | ${paths} = | Get Paths By Key From Index | ${index} | accNumber |
+
+    =>
+
+    | ${paths} = [['data', 'accounts', 0, 'accNumber'], ['data', 'accounts', 1, 'accNumber']]
+    """
+    return index.get_paths(keyid)
+
+
 @keyword(name="Get List Diffs", tags=(TAG,))
-def get_list_diffs(list1, list2):
+def get_list_diffs(list1, list2, symmetric=False):
     """
     Custom python code to check if list one is equal to list two by taking difference.
 
+    Every item of ``list1`` which is not found in ``list2`` is returned in the original order,
+    duplicated items are returned as many times as they are in ``list1``.
+    Items are compared by hashing so that large lists (ex. 100,000 account IDs) are compared in linear time.
+    Dictionaries and lists inside the lists are compared by their content.
+
     Arguments:
 
     - ``list1``: the comparing list.
 
     - ``list2``: the standard list.
 
+    - ``symmetric``: If true, the items of ``list2`` which are not found in ``list1`` are appended to the result.
+
     Example:
 
     | list_dif = | Get List Diffs | {10, 15, 20, 25, 30, 35, 40} | {25, 40, 35} |
+    | list_dif = | Get List Diffs | {10, 15, 20} | {15, 20, 25} | symmetric=True |
 
     =>
 
-    | list_dif = False
+    | list_dif = [10, 15, 20, 30]
+    | list_dif = [10, 25]
     """
     try:
-        list_dif = [i for i in list1 if i not in list2]
+        list_dif = subtract_list(list1, list2)
+        if symmetric:
+            list_dif += subtract_list(list2, list1)
         return list_dif
     except Exception as e:
         logger.error('Get Difference Between Two Lists method: ' + str(e))
 
 
+_DICT = object()
+_LIST = object()
+_TUPLE = object()
+
+
+def canonical_hash_key(value):
+    """
+    Returns a hashable key of the value. Two values get the same key when they are equal.
+
+    Dictionaries, lists, sets and tuples with unhashable items are converted recursively.
+    """
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        pass
+    if isinstance(value, dict):
+        return _DICT, frozenset((k, canonical_hash_key(v)) for k, v in value.items())
+    elif isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    elif isinstance(value, list):
+        return _LIST, tuple(canonical_hash_key(i) for i in value)
+    elif isinstance(value, tuple):
+        return _TUPLE, tuple(canonical_hash_key(i) for i in value)
+    raise TypeError(f'Can not compare unhashable type: {type(value).__name__}')
+
+
+def subtract_list(list1, list2) -> list:
+    """
+    Returns the items of ``list1`` which are not in ``list2`` with the same order and duplicated items.
+    """
+    excludes = set(canonical_hash_key(i) for i in list2)
+    return [i for i in list1 if canonical_hash_key(i) not in excludes]
+
+
 @keyword(name="Delete Key In Dictionary", tags=(TAG,))
 def delete_key_in_dictionary(original_source, key):
     """Delete the key in dictionary which you want.
@@ -556,7 +718,7 @@ def recursive_update_the_value_for_selected_key_to_decimal(mydict, keyid):
 
 @keyword(name="Validate Response Body", tags=(TAG,))
 def validate_response_body(actual, expect, ignores=None, nonignores=None, check_key=True, check_datatype=True,
-                           check_value=True):
+                           check_value=True, max_messages=None, report_file=None):
     """Created By Thai Team
 
     Verify an actual result against an expected result.
@@ -577,6 +739,10 @@ def validate_response_body(actual, expect, ignores=None, nonignores=None, check_
 
         ``check_value``: set to False if you don't want to compare value between two dicts.
 
+        ``max_messages``: the maximum number of differences in the error message, the rest is summarized.
+
+        ``report_file``: the file path to write all differences, the error message keeps the first 10 by default.
+
         *Examples*
 
         | `Validate_Response_Body` | actual | expect |
@@ -585,11 +751,12 @@ def validate_response_body(actual, expect, ignores=None, nonignores=None, check_
         | `Validate_Response_Body` | actual | expect | check_key=False |
         | `Validate_Response_Body` | actual | expect | check_datatype=False |
         | `Validate_Response_Body` | actual | expect | check_value=False |
+        | `Validate_Response_Body` | actual | expect | max_messages=50 | report_file=${OUTPUT_DIR}/diffs.txt |
     """
 
     diffs = get_diffs(actual, expect, ignores, nonignores, check_key, check_datatype, check_value)
     if diffs:
-        raise AssertionError(print_friendly_message(diffs))
+        raise AssertionError(print_friendly_message(diffs, max_messages, report_file))
 
 
 def get_diffs(actual, expect, ignores=None, nonignores=None, check_key=True, check_datatype=True, check_value=True):
@@ -0,0 +1,330 @@
+"""
+This module provides one pooled HTTP session shared by REST keywords and utility keywords,
+and a cache of GET and HEAD responses.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from email.utils import parsedate_to_datetime
+from http.cookiejar import DefaultCookiePolicy
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from robot.api import logger
+from robot.api.deco import keyword
+from urllib3.util.retry import Retry
+
+TAG = 'http'
+__all__ = [
+    'configure_http_session',
+    'get_http_session_statistics']
+
+RETRY_STATUSES = (502, 503, 504)
+IDEMPOTENT_METHODS = ('HEAD', 'GET', 'PUT', 'DELETE', 'OPTIONS', 'TRACE')
+CACHEABLE_METHODS = ('GET', 'HEAD')
+CACHE_KEY_HEADERS = ('Accept', 'Authorization')
+REVALIDATION_HEADERS = ('Cache-Control', 'Expires', 'Date', 'ETag', 'Last-Modified')
+
+_session = None
+_requests = 0
+# connections opened by sessions which were replaced by a library import
+_replaced_connections = 0
+_imported_options = None
+_lock = threading.Lock()
+
+
+def create_retry(max_retries: int, backoff_factor: float) -> Retry:
+    """
+    Returns the retry of idempotent methods for connection errors and 502, 503 and 504 statuses.
+    """
+    options = dict(total=int(max_retries), backoff_factor=float(backoff_factor), status_forcelist=RETRY_STATUSES,
+                   raise_on_status=False)
+    try:
+        return Retry(allowed_methods=IDEMPOTENT_METHODS, **options)
+    except TypeError:
+        # urllib3 before 1.26
+        return Retry(method_whitelist=IDEMPOTENT_METHODS, **options)
+
+
+def count_response(response, *args, **kwargs):
+    global _requests
+    with _lock:
+        _requests += 1
+
+
+def create_http_session(pool_connections: int = 10, pool_maxsize: int = 10, max_retries: int = 0,
+                        backoff_factor: float = 0) -> requests.Session:
+    """
+    Returns a new session which keeps connections alive in pools of the adapter.
+    Cookies are not kept between requests like requests.request, the session is shared by all tests.
+    """
+    session = requests.Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = HTTPAdapter(pool_connections=int(pool_connections), pool_maxsize=int(pool_maxsize),
+                          max_retries=create_retry(max_retries, backoff_factor))
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.hooks['response'].append(count_response)
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """
+    Returns the shared session, it is created with default options on the first use.
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            _session = create_http_session()
+        return _session
+
+
+def count_connections(session: requests.Session) -> int:
+    connections = 0
+    for adapter in set(session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                connections += pool.num_connections
+    return connections
+
+
+def import_http_session(pool_connections: int = 10, pool_maxsize: int = 10, max_retries: int = 0,
+                        backoff_factor: float = 0):
+    """
+    Creates the shared session for a library import. The session is replaced only when the import options
+    are different from the previous import, so `Configure HTTP Session` and the statistics are kept
+    when another suite imports the library.
+    """
+    global _session, _imported_options, _replaced_connections
+    options = (int(pool_connections), int(pool_maxsize), int(max_retries), float(backoff_factor))
+    with _lock:
+        if _session is not None and options == _imported_options:
+            return
+        if _session is not None:
+            _replaced_connections += count_connections(_session)
+            _session.close()
+        _session = create_http_session(*options)
+        _imported_options = options
+
+
+@keyword(name="Configure HTTP Session", tags=(TAG,))
+def configure_http_session(pool_connections: int = 10, pool_maxsize: int = 10, max_retries: int = 0,
+                           backoff_factor: float = 0):
+    """
+    Replace the shared HTTP session used by ExtendedRESTLibrary and `Upload Image Without Data`
+    and reset `Get HTTP Session Statistics`. Connections are kept alive and reused by the next requests
+    to the same host, cookies are not kept.
+
+    Arguments:
+
+    - ``pool_connections``: the number of hosts which have a connection pool.
+
+    - ``pool_maxsize``: the maximum connections kept alive for each host.
+
+    - ``max_retries``: the number of retries of HEAD, GET, PUT, DELETE, OPTIONS and TRACE requests
+      on connection errors and 502, 503 or 504 responses.
+
+    - ``backoff_factor``: the retries wait backoff_factor * (2 ** (retry - 1)) seconds.
+
+    Example:
+    | Configure HTTP Session | pool_maxsize=50 | max_retries=3 | backoff_factor=0.5 |
+    """
+    global _session, _requests, _replaced_connections
+    with _lock:
+        if _session is not None:
+            _session.close()
+        _session = create_http_session(pool_connections, pool_maxsize, max_retries, backoff_factor)
+        _requests = 0
+        _replaced_connections = 0
+
+
+@keyword(name="Get HTTP Session Statistics", tags=(TAG,))
+def get_http_session_statistics() -> dict:
+    """
+    Get the number of requests and opened connections of the shared HTTP session.
+    ``reused`` is the number of requests which did not open a new connection.
+
+    Example:
+    | ${statistics} = | Get HTTP Session Statistics |
+    | Log | ${statistics}[reuse_ratio] |
+
+    Return: A dictionary of requests, connections, reused and reuse_ratio.
+    """
+    connections = _replaced_connections + count_connections(get_http_session())
+    reused = max(0, _requests - connections)
+    statistics = {
+        'requests': _requests,
+        'connections': connections,
+        'reused': reused,
+        'reuse_ratio': round(reused / _requests, 3) if _requests else 0.0}
+    logger.info(f'HTTP session statistics: {statistics}')
+    return statistics
+
+
+def parse_cache_control(value: str) -> dict:
+    """
+    Returns the directives of a Cache-Control header, for example {'max-age': '60', 'no-cache': True}.
+    """
+    directives = {}
+    for directive in (value or '').split(','):
+        name, _, argument = directive.strip().partition('=')
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else True
+    return directives
+
+
+def get_freshness_lifetime(headers) -> float:
+    """
+    Returns the seconds a response is fresh by max-age (minus Age) or Expires, 0 if it must be revalidated.
+    """
+    directives = parse_cache_control(headers.get('Cache-Control'))
+    if 'no-cache' in directives:
+        return 0
+    try:
+        if 'max-age' in directives:
+            return max(0, int(directives['max-age']) - int(headers.get('Age', 0)))
+        if 'Expires' in headers:
+            expires = parsedate_to_datetime(headers['Expires'])
+            date = parsedate_to_datetime(headers['Date']) if 'Date' in headers else None
+            if date is None:
+                return max(0, expires.timestamp() - time.time())
+            return max(0, (expires - date).total_seconds())
+    except (TypeError, ValueError):
+        pass
+    return 0
+
+
+def get_vary_values(response, headers: dict) -> tuple:
+    """
+    Returns the values of the request headers named by the Vary header of the response.
+    """
+    names = [name.strip().lower() for name in response.headers.get('Vary', '').split(',') if name.strip()]
+    if not names:
+        return ()
+    headers = {str(name).lower(): str(value) for name, value in (headers or {}).items()}
+    return tuple((name, headers.get(name)) for name in names)
+
+
+def copy_response(response, started: float = None):
+    """
+    Returns a copy of the response with its own headers, cookies and history, so a cached response is not changed
+    by a caller. The copy has ``elapsed`` from started, not the time of the first request, if started is given.
+    """
+    copied = copy.copy(response)
+    # the body is read once and the bytes are shared, they cannot be changed
+    copied._content = response.content
+    copied.headers = CaseInsensitiveDict(response.headers)
+    copied.cookies = response.cookies.copy()
+    copied.history = list(response.history)
+    if started is not None:
+        copied.elapsed = timedelta(seconds=time.perf_counter() - started)
+    return copied
+
+
+class HTTPCache:
+    """
+    This is a class for an LRU cache of GET and HEAD responses, keyed by the method, URL, query,
+    the key headers and the Cookie header of the request. A cached response is used only when the
+    request headers named by its Vary header are the same. A response is stored if it is 200 without
+    no-store or Vary: *, and is fresh by Cache-Control or Expires, or has an ETag or Last-Modified
+    to revalidate it. Entries are never changed, a response from the cache is a copy with its own headers
+    and ``elapsed`` of the cache lookup or the revalidation.
+    """
+
+    def __init__(self, max_entries: int = 256, key_headers=CACHE_KEY_HEADERS):
+        self.max_entries = int(max_entries)
+        self.key_headers = tuple(header.lower() for header in key_headers)
+        if 'cookie' not in self.key_headers:
+            self.key_headers += ('cookie',)
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__statistics = dict.fromkeys(('hits', 'revalidated', 'misses', 'stored', 'evicted'), 0)
+
+    def key(self, method: str, url: str, query: dict, headers: dict) -> tuple:
+        headers = {str(name).lower(): str(value) for name, value in (headers or {}).items()}
+        return (method.upper(), url, tuple(sorted((str(name), str(value)) for name, value in (query or {}).items())),
+                tuple(headers.get(name) for name in self.key_headers))
+
+    def request(self, method: str, url: str, query: dict, headers: dict, send):
+        """
+        Returns the response from the cache or by send(headers), a stale response is revalidated
+        with If-None-Match and If-Modified-Since. Other methods remove the responses of the URL.
+        """
+        method = method.upper()
+        if method not in CACHEABLE_METHODS:
+            self.invalidate(url)
+            return send(headers)
+        started = time.perf_counter()
+        key = self.key(method, url, query, headers)
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[2] != get_vary_values(entry[0], headers):
+                entry = None
+            if entry is not None:
+                self.__entries.move_to_end(key)
+                if entry[1] > time.monotonic():
+                    self.__statistics['hits'] += 1
+                    return copy_response(entry[0], started)
+        if entry is not None:
+            cached = entry[0]
+            conditions = {}
+            if 'ETag' in cached.headers:
+                conditions['If-None-Match'] = cached.headers['ETag']
+            if 'Last-Modified' in cached.headers:
+                conditions['If-Modified-Since'] = cached.headers['Last-Modified']
+            response = send(dict(headers or {}, **conditions))
+            if response.status_code == 304:
+                # the revalidated response is a new entry, the cached one may be read by other threads
+                revalidated = copy_response(cached, started)
+                for name in REVALIDATION_HEADERS:
+                    if name in response.headers:
+                        revalidated.headers[name] = response.headers[name]
+                with self.__lock:
+                    self.__statistics['revalidated'] += 1
+                self.store(key, revalidated, headers)
+                return copy_response(revalidated, started)
+        else:
+            response = send(headers)
+        with self.__lock:
+            self.__statistics['misses'] += 1
+        self.store(key, response, headers)
+        return response
+
+    def store(self, key: tuple, response, headers: dict = None):
+        if response.status_code != 200 or 'no-store' in parse_cache_control(response.headers.get('Cache-Control')):
+            return
+        if response.headers.get('Vary', '').strip() == '*':
+            return
+        lifetime = get_freshness_lifetime(response.headers)
+        if not lifetime and 'ETag' not in response.headers and 'Last-Modified' not in response.headers:
+            return
+        # a copy is kept, so the returned response can be changed by the caller
+        entry = (copy_response(response), time.monotonic() + lifetime, get_vary_values(response, headers))
+        with self.__lock:
+            self.__entries[key] = entry
+            self.__entries.move_to_end(key)
+            self.__statistics['stored'] += 1
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+                self.__statistics['evicted'] += 1
+
+    def invalidate(self, url: str):
+        with self.__lock:
+            for key in [key for key in self.__entries if key[1] == url]:
+                del self.__entries[key]
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+    def statistics(self) -> dict:
+        with self.__lock:
+            statistics = dict(self.__statistics, entries=len(self.__entries))
+        requests_count = statistics['hits'] + statistics['revalidated'] + statistics['misses']
+        statistics['hit_ratio'] = round(statistics['hits'] / requests_count, 3) if requests_count else 0.0
+        return statistics
@@ -0,0 +1,129 @@
+"""
+This module provides keywords to query large JSON files without loading them into memory.
+"""
+
+import re
+from itertools import islice
+import ijson
+from ijson.common import ObjectBuilder
+from robot.api import logger
+from robot.api.deco import keyword
+
+TAG = 'json'
+__all__ = [
+    'get_values_from_json_file']
+
+WILDCARD = '*'
+RECURSIVE = '..'
+JSON_PATH_TOKEN = re.compile(r"(\.\.|\.)(\*|[^.\[]+)?|\[(\*|\d+)\]|\[['\"]([^'\"]*)['\"]\]")
+
+
+def parse_json_query(query: str) -> list:
+    """
+    Returns the segments of a JSONPath (``$.items[*].name``, ``$..name``, ``$['key']``)
+    or a key path (``items.*.name`` or ``items 0 name``).
+    Segments are keys or indexes as text, ``*`` for any key or index and ``..`` for any levels.
+    """
+    query = query.strip()
+    if not query.startswith('$'):
+        return [segment for segment in re.split(r'[.\s]+', query) if segment]
+    segments = []
+    position = 1
+    while position < len(query):
+        match = JSON_PATH_TOKEN.match(query, position)
+        if not match or match.group(1) == '.' and not match.group(2):
+            raise ValueError(f"Unsupported JSONPath '{query}' at '{query[position:]}'")
+        dots, key, index, quoted_key = match.groups()
+        if dots == RECURSIVE:
+            segments.append(RECURSIVE)
+        if dots is None or key:
+            segments.append(key or index or quoted_key)
+        position = match.end()
+    return segments
+
+
+def match_json_path(segments: list, path: list) -> bool:
+    """
+    Returns True if the path of keys and indexes is matched by the segments of `parse_json_query`.
+    """
+    if not segments:
+        return not path
+    segment = segments[0]
+    if segment == RECURSIVE:
+        return any(match_json_path(segments[1:], path[start:]) for start in range(len(path) + 1))
+    if not path:
+        return False
+    return (segment == WILDCARD or segment == str(path[0])) and match_json_path(segments[1:], path[1:])
+
+
+def iter_json_values(file, query: str):
+    """
+    Yields the values matched by the query from a JSON file object or path while it is parsed.
+    Only one matched value is kept in memory at a time.
+    """
+    segments = parse_json_query(query)
+    if isinstance(file, str):
+        with open(file, 'rb') as opened:
+            yield from iter_json_values_from_events(ijson.basic_parse(opened, use_float=True), segments)
+    else:
+        yield from iter_json_values_from_events(ijson.basic_parse(file, use_float=True), segments)
+
+
+def iter_json_values_from_events(events, segments: list):
+    # each frame is [is_array, current key or index]
+    stack = []
+    builder = None
+    depth = 0
+    for event, value in events:
+        if builder is not None:
+            builder.event(event, value)
+            if event in ('start_map', 'start_array'):
+                depth += 1
+            elif event in ('end_map', 'end_array'):
+                depth -= 1
+        if event == 'map_key':
+            stack[-1][1] = value
+            continue
+        if event in ('end_map', 'end_array'):
+            stack.pop()
+            if builder is not None and depth == 0:
+                yield builder.value
+                builder = None
+            continue
+        if stack and stack[-1][0]:
+            stack[-1][1] += 1
+        if builder is None and match_json_path(segments, [frame[1] for frame in stack]):
+            if event in ('start_map', 'start_array'):
+                builder = ObjectBuilder()
+                builder.event(event, value)
+                depth = 1
+            else:
+                yield value
+        if event == 'start_map':
+            stack.append([False, None])
+        elif event == 'start_array':
+            stack.append([True, -1])
+
+
+@keyword(name="Get Values From JSON File", tags=(TAG,))
+def get_values_from_json_file(file_path: str, query: str, limit: int = None) -> list:
+    """
+    Get values from a JSON file by a JSONPath or a key path. The file is read incrementally,
+    so a file of hundreds of megabytes can be queried with only the matched values in memory.
+
+    Supported JSONPath: ``$``, ``.key``, ``['key']``, ``[0]``, ``[*]``, ``.*`` and ``..key``.
+    A key path is keys and indexes separated by dots or spaces, ``*`` matches any key or index.
+
+    - ``limit``: stop reading the file after this number of values.
+
+    Example:
+
+    | ${names} = | Get Values From JSON File | ${OUTPUT DIR}/export.json | $.items[*].name |
+    | ${names} = | Get Values From JSON File | ${OUTPUT DIR}/export.json | items.*.name |
+    | ${first} = | Get Values From JSON File | ${OUTPUT DIR}/export.json | $..accountNo | limit=1 |
+
+    Return: A list of the matched values.
+    """
+    values = list(islice(iter_json_values(file_path, query), int(limit) if limit else None))
+    logger.info(f"Found {len(values)} values of '{query}' in {file_path}")
+    return values
@@ -0,0 +1,403 @@
+"""
+This module provides keywords to build and parse fixed-width socket messages by field layouts.
+"""
+
+import json
+import os
+from robot.api import logger
+from robot.api.deco import keyword
+from .socket_management import read_message, encode_base64, decode_base64, TIS_620, SPACE
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+TAG = 'socket'
+__all__ = [
+    'load_message_layout',
+    'encode_message_fields',
+    'decode_message_fields',
+    'create_message_builder',
+    'set_message_field',
+    'set_message_fields',
+    'get_message_field',
+    'get_message_from_builder']
+
+_layouts = {}
+
+
+class MessageField:
+    """
+    This is a class for recording a field of a fixed-width message.
+    """
+
+    def __init__(self, name: str, offset: int, length: int, encode: str = TIS_620):
+        self.name = name
+        self.offset = int(offset)
+        self.length = int(length)
+        self.encode = encode or TIS_620
+        self.end = self.offset + self.length
+        # TIS-620 is padded with spaces on the right, hex is a big-endian number padded with zeros on the left
+        self.is_text = self.encode == TIS_620
+        self.blank = (SPACE.encode() if self.is_text else b'\x00') * self.length
+        # the encoder is chosen once, the padding is sliced from the precomputed blank
+        self.__encoder = self.__encode_text if self.is_text else self.__encode_hex
+
+    def encode_value(self, value) -> bytes:
+        """
+        Returns the value as bytes of the field length, the same bytes as `Update Message Socket`.
+        """
+        return self.__encoder('' if value is None else value)
+
+    def __encode_text(self, value) -> bytes:
+        data = str(value).encode(self.encode)
+        if len(data) > self.length:
+            raise ValueError(f'Length of {value} should not greater than {self.length}')
+        return data + self.blank[len(data):]
+
+    def __encode_hex(self, value) -> bytes:
+        try:
+            return int(value).to_bytes(self.length, 'big')
+        except OverflowError:
+            raise ValueError(f'Length of {value} should not greater than {2 * self.length}')
+
+    def decode_value(self, data: bytes) -> str:
+        """
+        Returns the text of the field bytes, trailing spaces are removed for TIS-620.
+        """
+        if self.is_text:
+            return bytes(data).decode(self.encode).rstrip(SPACE)
+        return str(int.from_bytes(data, 'big'))
+
+    def __str__(self):
+        return f'name: {self.name}, offset: {self.offset}, length: {self.length}, encode: {self.encode}'
+
+
+class MessageLayout:
+    """
+    This is a class for recording all fields of a fixed-width message format.
+    """
+
+    def __init__(self, fields: list, name: str = None):
+        self.name = name
+        self.fields = sorted((to_message_field(field) for field in fields), key=lambda field: field.offset)
+        self.by_name = {field.name: field for field in self.fields}
+        self.size = max((field.end for field in self.fields), default=0)
+        blank = bytearray(SPACE.encode() * self.size)
+        for field in self.fields:
+            blank[field.offset:field.end] = field.blank
+        self.blank = bytes(blank)
+
+    def encode(self, values: dict, template: bytes = None) -> bytes:
+        """
+        Returns the message with the values of the fields. Other fields are kept from the template or blank.
+        """
+        message = bytearray(self.blank if template is None else template)
+        if len(message) < self.size:
+            message += self.blank[len(message):]
+        view = memoryview(message)
+        for name, value in values.items():
+            field = self.by_name[name]
+            view[field.offset:field.end] = field.encode_value(value)
+        view.release()
+        return bytes(message)
+
+    def decode(self, data: bytes) -> dict:
+        """
+        Returns a dictionary of all fields from the message. Fields after the end of the message are skipped.
+        """
+        view = memoryview(data)
+        size = len(view)
+        return {field.name: field.decode_value(view[field.offset:field.end])
+                for field in self.fields if field.end <= size}
+
+    def __str__(self):
+        return f'MessageLayout: {self.name}, {len(self.fields)} fields, {self.size} bytes'
+
+
+def to_message_field(field) -> MessageField:
+    """
+    Returns a MessageField from a MessageField or a dictionary of name, offset, length and encode.
+    """
+    if isinstance(field, MessageField):
+        return field
+    return MessageField(field['name'], field['offset'], field['length'], field.get('encode') or TIS_620)
+
+
+def read_layout_file(path: str, sheet_name: str = None) -> list:
+    """
+    Returns a list of field dictionaries from a JSON, YAML or Excel (XLSX) file.
+
+    A JSON or YAML file has a list of fields or a dictionary with ``fields``.
+    An Excel sheet has the headers name, offset, length and encode in the first row.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.xlsx':
+        from ExcelImportLibrary import ExcelImport
+        excel = ExcelImport()
+        excel.open_excel_file(path)
+        excel.select_excel_sheet(sheet_name or excel.get_sheet_names()[0])
+        excel.set_working_rows(2, excel.get_max_row(), excel.get_max_column())
+        fields = []
+        for index in range(excel.get_max_test_cases()):
+            values = excel.get_test_case(index)['values']
+            fields.append({str(header).lower(): value[0] for header, value in values.items() if header})
+        return fields
+    with open(path, encoding='utf-8') as layout_file:
+        if extension in ('.yaml', '.yml'):
+            if yaml is None:
+                raise ImportError('PyYAML is required to load a YAML layout, please use pip install pyyaml')
+            layout = yaml.safe_load(layout_file)
+        else:
+            layout = json.load(layout_file)
+    if isinstance(layout, dict):
+        layout = layout['fields']
+    return layout
+
+
+def get_message_layout(layout) -> MessageLayout:
+    """
+    Returns the layout by a name loaded by `Load Message Layout`, a MessageLayout or a list of fields.
+    """
+    if isinstance(layout, MessageLayout):
+        return layout
+    if isinstance(layout, str):
+        try:
+            return _layouts[layout]
+        except KeyError:
+            raise KeyError(f'Message layout {layout} is not loaded, please use Load Message Layout first')
+    return MessageLayout(layout)
+
+
+@keyword(name="Load Message Layout", tags=(TAG,))
+def load_message_layout(name: str, path: str, sheet_name: str = None, reload: bool = False) -> MessageLayout:
+    """
+    Load field definitions of a fixed-width message once and keep them by the name.
+
+    Arguments:
+
+    - ``name``: a layout name to use in other keywords.
+
+    - ``path``: a JSON, YAML or Excel (XLSX) file. Each field has ``name``, ``offset``, ``length``
+      and ``encode`` (TIS-620 or hex, the default is TIS-620).
+
+    - ``sheet_name``: the sheet of an Excel file, the first sheet is used if it is not given.
+
+    - ``reload``: If true, read the file again even if the layout is loaded.
+
+    Example:
+
+    | Load Message Layout | transfer | ${CURDIR}/layouts/transfer.json |
+    | Load Message Layout | inquiry | ${CURDIR}/layouts/layouts.xlsx | sheet_name=inquiry |
+    """
+    if name in _layouts and not reload:
+        return _layouts[name]
+    layout = MessageLayout(read_layout_file(path, sheet_name), name)
+    _layouts[name] = layout
+    logger.info(f'Loaded {layout} from {path}')
+    return layout
+
+
+@keyword(name="Encode Message Fields", tags=(TAG,))
+def encode_message_fields(layout, values: dict, template: bytes = None) -> bytes:
+    """
+    Encode many fields into one message by the layout.
+
+    Arguments:
+
+    - ``layout``: a layout name from `Load Message Layout` or a list of fields.
+
+    - ``values``: a dictionary of field names and values.
+
+    - ``template``: the original message encoding by base64. Fields are blank if it is not given.
+
+    Return: Text has been encoded by base64.
+
+    Example:
+
+    | &{values} = | Create Dictionary | acctId=0012000030 | amount=103050 |
+    | ${message} = | Encode Message Fields | transfer | ${values} |
+    """
+    layout = get_message_layout(layout)
+    template = decode_base64(template) if template else None
+    return encode_base64(layout.encode(values, template))
+
+
+@keyword(name="Decode Message Fields", tags=(TAG,))
+def decode_message_fields(layout, message) -> dict:
+    """
+    Decode all fields of a message by the layout in one pass.
+
+    Arguments:
+
+    - ``layout``: a layout name from `Load Message Layout` or a list of fields.
+
+    - ``message``: a message encoding by base64 or a message builder.
+
+    Return: A dictionary of field names and texts. Hex fields are decimal texts.
+
+    Example:
+
+    | ${response} = | Send Message On Socket Connection | ${message} |
+    | &{fields} = | Decode Message Fields | transfer | ${response} |
+    | Should Be Equal | ${fields.respCode} | 00 |
+    """
+    return get_message_layout(layout).decode(read_message(message))
+
+
+class MessageBuilder:
+    """
+    This is a class for updating many fields of a fixed-width message in one buffer.
+
+    Fields are written in place, the message is converted to bytes only when it is sent
+    or to base64 by `get_base64`. The builder can be sent by socket keywords directly.
+    """
+
+    def __init__(self, template: bytes = b'', fields: list = None, size: int = 0):
+        self.__buffer = bytearray(template)
+        if len(self.__buffer) < int(size):
+            self.__buffer += SPACE.encode() * (int(size) - len(self.__buffer))
+        self.__view = memoryview(self.__buffer)
+        self.fields = {}
+        for field in fields or []:
+            self.add_field(field)
+
+    def add_field(self, field):
+        """
+        Add a field to the layout. The field is a MessageField or a dictionary of name, offset, length and encode.
+        """
+        field = to_message_field(field)
+        if field.end > len(self.__buffer):
+            raise ValueError(f'Field {field.name} ends at {field.end} but the message size is {len(self.__buffer)}')
+        self.fields[field.name] = field
+
+    def get_field(self, field, length: int = None, encode: str = TIS_620) -> MessageField:
+        """
+        Returns the field by its name, or a new field by an offset and a length.
+        """
+        if field in self.fields:
+            return self.fields[field]
+        if length is None:
+            raise KeyError(f'Field {field} is not in the layout, the length is required for an offset')
+        return MessageField(str(field), field, length, encode)
+
+    def set(self, field, value, length: int = None, encode: str = TIS_620):
+        """
+        Write the value of the field in place.
+        """
+        field = self.get_field(field, length, encode)
+        if field.end > len(self.__buffer):
+            raise ValueError(f'Field {field.name} ends at {field.end} but the message size is {len(self.__buffer)}')
+        self.__view[field.offset:field.end] = field.encode_value(value)
+
+    def set_many(self, values: dict):
+        """
+        Write the values of many fields by their names.
+        """
+        for name, value in values.items():
+            self.set(name, value)
+
+    def get(self, field, length: int = None, encode: str = TIS_620) -> str:
+        """
+        Returns the text of the field.
+        """
+        field = self.get_field(field, length, encode)
+        return field.decode_value(self.__view[field.offset:field.end])
+
+    def get_base64(self) -> bytes:
+        return encode_base64(self.__buffer)
+
+    def __bytes__(self):
+        return bytes(self.__buffer)
+
+    def __len__(self):
+        return len(self.__buffer)
+
+    def __str__(self):
+        return f'MessageBuilder: {len(self.__buffer)} bytes, {len(self.fields)} fields'
+
+
+@keyword(name="Create Message Builder", tags=(TAG,))
+def create_message_builder(template: bytes = None, layout: list = None, size: int = 0) -> MessageBuilder:
+    """
+    Create a message builder to update many fields of a fixed-width message in place.
+
+    Arguments:
+
+    - ``template``: the original message encoding by base64.
+
+    - ``layout``: a layout name from `Load Message Layout` or a list of fields, each field is a dictionary of
+      ``name``, ``offset``, ``length`` and ``encode`` (TIS-620 or hex, the default is TIS-620).
+
+    - ``size``: the minimum message size, the message is filled with spaces up to the size.
+      A named layout without a template starts from its blank message.
+
+    Example:
+
+    | &{acct} = | Create Dictionary | name=acctId | offset=4 | length=10 |
+    | &{amt} = | Create Dictionary | name=amount | offset=14 | length=6 | encode=hex |
+    | @{layout} = | Create List | ${acct} | ${amt} |
+    | ${builder} = | Create Message Builder | ${template} | ${layout} |
+    | &{values} = | Create Dictionary | acctId=0012000030 | amount=103050 |
+    | Set Message Fields | ${builder} | ${values} |
+    | Send Message On Socket Connection | ${builder} |
+    """
+    if layout is None:
+        return MessageBuilder(decode_base64(template) if template else b'', None, size)
+    layout = get_message_layout(layout)
+    template = decode_base64(template) if template else layout.blank
+    return MessageBuilder(template, layout.fields, size)
+
+
+@keyword(name="Set Message Field", tags=(TAG,))
+def set_message_field(builder: MessageBuilder, field, value, length: int = None, encode: str = TIS_620):
+    """
+    Write the value of a field in the message builder in place.
+
+    Arguments:
+
+    - ``builder``: the message builder.
+
+    - ``field``: a field name in the layout or an offset.
+
+    - ``value``: a text to update.
+
+    - ``length``: a maximum size of the field, it is required for an offset.
+
+    - ``encode``: TIS-620 or hex, it is used for an offset.
+
+    Examples:
+
+    | Set Message Field | ${builder} | acctId | 0012000030 |
+    | Set Message Field | ${builder} | ${20} | 103050 | 6 | hex |
+    """
+    if length is not None:
+        field, length = int(field), int(length)
+    builder.set(field, value, length, encode)
+
+
+@keyword(name="Set Message Fields", tags=(TAG,))
+def set_message_fields(builder: MessageBuilder, values: dict):
+    """
+    Write the values of many fields in the message builder by their names in the layout.
+    """
+    builder.set_many(values)
+
+
+@keyword(name="Get Message Field", tags=(TAG,))
+def get_message_field(builder: MessageBuilder, field, length: int = None, encode: str = TIS_620) -> str:
+    """
+    Get the text of a field in the message builder by a field name or an offset and a length.
+    """
+    if length is not None:
+        field, length = int(field), int(length)
+    return builder.get(field, length, encode)
+
+
+@keyword(name="Get Message From Builder", tags=(TAG,))
+def get_message_from_builder(builder: MessageBuilder) -> bytes:
+    """
+    Get the message of the builder encoding by base64 like `Update Message Socket`.
+    """
+    return builder.get_base64()
@@ -0,0 +1,176 @@
+"""
+This module provides keywords to send socket messages as a load test.
+"""
+
+import asyncio
+import time
+from robot.api import logger
+from robot.api.deco import keyword
+from .socket_management import decode_base64, convert_field_to_bytes, check_framing, frame_message, \
+    latency_statistics, NO_FRAMING, LENGTH_FRAMING, DELIMITER_FRAMING, TIS_620
+
+TAG = 'socket'
+__all__ = [
+    'run_socket_load']
+
+
+@keyword(name="Run Socket Load", tags=(TAG,))
+def run_socket_load(host: str, port: int, template: bytes, fields: list = None, count: int = 1000,
+                    connections: int = 10, rate: float = None, timeout: float = 30, framing: str = NO_FRAMING,
+                    length_size: int = 2, delimiter: str = None, buffer_size: int = 4096,
+                    idle_timeout: float = 0.1) -> dict:
+    """
+    Send ``count`` messages made from the template concurrently over ``connections`` connections.
+
+    Arguments:
+
+    - ``template``: the original message encoding by base64.
+
+    - ``fields``: a list of fields to update in each message. A field is a dictionary of ``offset``, ``length``,
+      ``encode`` (TIS-620 or hex like `Update Message Socket`) and either ``values`` which is a list used in turn
+      or ``value`` which is a text formatted with ``{index}`` of the message.
+
+    - ``count``: the number of messages.
+
+    - ``connections``: the number of connections, each connection waits for a response before the next message.
+
+    - ``rate``: the target messages per second. Messages are sent as fast as possible if it is not given.
+
+    Other arguments are the same as `Open Socket Connection`.
+
+    Return: A dictionary of count, errors, duration in seconds, tps and the latency in milliseconds
+    (min, mean, p50, p95, p99, max).
+
+    Example:
+
+    | &{stan} = | Create Dictionary | offset=11 | length=6 | value={index} |
+    | &{amount} = | Create Dictionary | offset=17 | length=12 | values=${amounts} |
+    | @{fields} = | Create List | ${stan} | ${amount} |
+    | ${summary} = | Run Socket Load | 192.168.1.1 | 8583 | ${template} | ${fields} | count=10000 | connections=20 | rate=500 | framing=length |
+    """
+    framing = check_framing(framing, delimiter)
+    delimiter = delimiter.encode('latin-1') if isinstance(delimiter, str) else delimiter
+    load = SocketLoad(host, int(port), decode_base64(template), fields or [], int(count), int(connections),
+                      float(rate) if rate else None, float(timeout), framing, int(length_size), delimiter,
+                      int(buffer_size), float(idle_timeout))
+    summary = asyncio.run(load.run())
+    logger.info(f'Socket load summary: {summary}')
+    return summary
+
+
+class SocketLoad:
+    """
+    This is a class for running one load test with asyncio.
+    """
+
+    def __init__(self, host, port, template, fields, count, connections, rate, timeout, framing, length_size,
+                 delimiter, buffer_size, idle_timeout):
+        self.host = host
+        self.port = port
+        self.template = template
+        self.fields = [self.__prepare_field(field) for field in fields]
+        self.count = count
+        self.connections = max(1, min(connections, count))
+        self.rate = rate
+        self.timeout = timeout
+        self.framing = framing
+        self.length_size = length_size
+        self.delimiter = delimiter
+        self.buffer_size = buffer_size
+        self.idle_timeout = idle_timeout
+        self.__next = 0
+        self.__latencies = []
+        self.__errors = 0
+        self.__start = None
+
+    @staticmethod
+    def __prepare_field(field: dict) -> dict:
+        field = dict(field)
+        field['offset'] = int(field['offset'])
+        field['length'] = int(field['length'])
+        field.setdefault('encode', TIS_620)
+        if 'values' not in field and 'value' not in field:
+            raise ValueError(f'Field at offset {field["offset"]} should have value or values')
+        return field
+
+    def build_message(self, index: int) -> bytes:
+        """
+        Returns the template updated with the field values of the message index.
+        """
+        message = bytearray(self.template)
+        for field in self.fields:
+            if 'values' in field:
+                value = field['values'][index % len(field['values'])]
+            else:
+                value = str(field['value']).format(index=index)
+            offset = field['offset']
+            message[offset:offset + field['length']] = convert_field_to_bytes(str(value), field['length'],
+                                                                              field['encode'])
+        return bytes(message)
+
+    async def run(self) -> dict:
+        self.__start = time.perf_counter()
+        await asyncio.gather(*(self.__worker() for _ in range(self.connections)))
+        duration = time.perf_counter() - self.__start
+        summary = {
+            'count': self.count,
+            'errors': self.__errors,
+            'duration': round(duration, 3),
+            'tps': round(len(self.__latencies) / duration, 3) if duration else 0.0}
+        summary.update(latency_statistics(self.__latencies))
+        return summary
+
+    async def __worker(self):
+        reader, writer = None, None
+        while self.__next < self.count:
+            index = self.__next
+            self.__next += 1
+            if self.rate:
+                delay = self.__start + index / self.rate - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.wait_for(
+                        asyncio.open_connection(self.host, self.port), self.timeout)
+                sent_at = time.perf_counter()
+                writer.write(frame_message(self.build_message(index), self.framing, self.length_size,
+                                           self.delimiter))
+                await writer.drain()
+                await asyncio.wait_for(self.__read(reader), self.timeout)
+                self.__latencies.append(time.perf_counter() - sent_at)
+            except Exception as info:
+                if not self.__errors:
+                    logger.warn(f'Run Socket Load: message {index} failed: {info!r}')
+                self.__errors += 1
+                if writer is not None:
+                    await self.__close(writer)
+                reader, writer = None, None
+        if writer is not None:
+            await self.__close(writer)
+
+    @staticmethod
+    async def __close(writer):
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception:
+            # the connection is already broken after a failed message
+            pass
+
+    async def __read(self, reader) -> bytes:
+        if self.framing == LENGTH_FRAMING:
+            size = int.from_bytes(await reader.readexactly(self.length_size), 'big')
+            return await reader.readexactly(size)
+        elif self.framing == DELIMITER_FRAMING:
+            return (await reader.readuntil(self.delimiter))[:-len(self.delimiter)]
+        data = await reader.read(self.buffer_size)
+        try:
+            while True:
+                chunk = await asyncio.wait_for(reader.read(self.buffer_size), self.idle_timeout)
+                if not chunk:
+                    break
+                data += chunk
+        except asyncio.TimeoutError:
+            pass
+        return data
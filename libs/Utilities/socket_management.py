@@ -5,7 +5,13 @@ This module provide keywords to support about socket.
 import socket
 import base64
 import hashlib
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from robot.api import logger
 from robot.api.deco import keyword
+from robot.utils import ConnectionCache
 
 
 UTF_8 = 'UTF-8'
@@ -14,13 +20,36 @@ SPACE = ' '
 ZERO = '0'
 TAG = 'socket'
 
+NO_FRAMING = 'none'
+LENGTH_FRAMING = 'length'
+DELIMITER_FRAMING = 'delimiter'
+FRAMINGS = (NO_FRAMING, LENGTH_FRAMING, DELIMITER_FRAMING)
+
 __all__ = [
     'encrypt_sha256',
     'send_message_socket',
+    'open_socket_connection',
+    'switch_socket_connection',
+    'send_message_on_socket_connection',
+    'receive_message_on_socket_connection',
+    'close_socket_connection',
+    'close_all_socket_connections',
+    'open_socket_session',
+    'switch_socket_session',
+    'send_on_session',
+    'send_messages_on_session',
+    'get_socket_session_statistics',
+    'close_socket_session',
+    'close_all_socket_sessions',
     'update_message_socket',
     'encode_base64',
     'decode_base64']
 
+# keywords are listed in __all__, helpers shared with socket_load and message_builder are public and
+# helpers used only in this module start with _
+_connections = ConnectionCache('No open socket connection.')
+_sessions = ConnectionCache('No open socket session.')
+
 
 @keyword(name="Encrypt Sha256", tags=(TAG,))
 def encrypt_sha256(text: str, salt: str = "", encode: str = UTF_8) -> str:
@@ -51,18 +80,26 @@ def encrypt_sha256(text: str, salt: str = "", encode: str = UTF_8) -> str:
 
 
 @keyword(name="Send Message Socket", tags=(TAG,))
-def send_message_socket(host: str, port: int, message: bytes) -> bytes:
+def send_message_socket(host: str, port: int, message: bytes, timeout: float = 30,
+                        buffer_size: int = 4096) -> bytes:
     """
     First, This method connects to host. Next, It will be sent a message as a byte text.
     And then it will return data encoding by base64.
 
+    The whole response is read until the host closes the connection or stops sending,
+    use `Open Socket Connection` to keep the connection for many messages.
+
     Arguments:
 
     - ``host``: an address of website.
 
     - ``port``: an port.
 
-    - ``message``: an text encoding by base64.
+    - ``message``: an text encoding by base64 or a message builder from `Create Message Builder`.
+
+    - ``timeout``: seconds to wait for connecting and for the response.
+
+    - ``buffer_size``: a size of each read from the socket.
 
     Return: Text has been encoded by base64.
 
@@ -72,15 +109,500 @@ def send_message_socket(host: str, port: int, message: bytes) -> bytes:
 
     It will return 'OSzQyODM4MDAwNzg2ODAyMzEg'.
     """
-    text_byte = decode_base64(message)
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as soc:
-        soc.settimeout(30)
-        soc.connect((host, port))
-        soc.sendall(text_byte)
-        data = soc.recv(1024)
+    connection = SocketConnection(host, port, timeout=timeout, buffer_size=buffer_size)
+    try:
+        data = connection.send(read_message(message))
+    finally:
+        connection.close()
+    return encode_base64(data)
+
+
+class SocketConnection:
+    """
+    This is a class for keeping a TCP connection to send many messages.
+
+    Messages are framed by ``framing``:
+
+    - ``none``: a response is read until the host closes the connection or sends nothing for ``idle_timeout`` seconds.
+
+    - ``length``: each message is prefixed by its length as a ``length_size`` bytes big-endian number.
+
+    - ``delimiter``: each message ends with ``delimiter``.
+
+    The length header and the delimiter are added when sending and removed when receiving.
+    """
+
+    def __init__(self, host: str, port: int, timeout: float = 30, framing: str = NO_FRAMING,
+                 length_size: int = 2, delimiter=None, buffer_size: int = 4096, idle_timeout: float = 0.1):
+        self.host = host
+        self.port = int(port)
+        self.timeout = float(timeout)
+        self.framing = check_framing(framing, delimiter)
+        self.length_size = int(length_size)
+        self.delimiter = delimiter.encode('latin-1') if isinstance(delimiter, str) else delimiter
+        self.buffer_size = int(buffer_size)
+        self.idle_timeout = float(idle_timeout)
+        self.__pending = bytearray()
+        self.__socket = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self.closed = False
+
+    def send(self, data: bytes, timeout: float = None) -> bytes:
+        """
+        Send a message and return the response.
+        """
+        self.write(data, timeout)
+        return self.receive(timeout)
+
+    def write(self, data: bytes, timeout: float = None):
+        """
+        Send a message without waiting for the response.
+        """
+        self.__socket.settimeout(self.__timeout(timeout))
+        self.__socket.sendall(self.__frame(bytes(data)))
+
+    def receive(self, timeout: float = None) -> bytes:
+        """
+        Receive one message.
+        """
+        self.__socket.settimeout(self.__timeout(timeout))
+        if self.framing == LENGTH_FRAMING:
+            size = int.from_bytes(self.__read_exactly(self.length_size), 'big')
+            return self.__read_exactly(size)
+        elif self.framing == DELIMITER_FRAMING:
+            return self.__read_until_delimiter()
+        return self.__read_until_idle()
+
+    def close(self):
+        self.closed = True
+        self.__socket.close()
+
+    def __timeout(self, timeout):
+        return self.timeout if timeout is None else float(timeout)
+
+    def __frame(self, data: bytes) -> bytes:
+        return frame_message(data, self.framing, self.length_size, self.delimiter)
+
+    def __recv(self) -> bytes:
+        chunk = self.__socket.recv(self.buffer_size)
+        if not chunk:
+            raise ConnectionError(f'Connection to {self.host}:{self.port} is closed by the host')
+        return chunk
+
+    def __read_exactly(self, size: int) -> bytes:
+        while len(self.__pending) < size:
+            self.__pending += self.__recv()
+        data = bytes(self.__pending[:size])
+        del self.__pending[:size]
+        return data
+
+    def __read_until_delimiter(self) -> bytes:
+        start = 0
+        while True:
+            index = self.__pending.find(self.delimiter, start)
+            if index != -1:
+                data = bytes(self.__pending[:index])
+                del self.__pending[:index + len(self.delimiter)]
+                return data
+            start = max(0, len(self.__pending) - len(self.delimiter) + 1)
+            self.__pending += self.__recv()
+
+    def __read_until_idle(self) -> bytes:
+        data = self.__pending
+        self.__pending = bytearray()
+        if not data:
+            data += self.__socket.recv(self.buffer_size)
+        self.__socket.settimeout(self.idle_timeout)
+        try:
+            while True:
+                chunk = self.__socket.recv(self.buffer_size)
+                if not chunk:
+                    break
+                data += chunk
+        except socket.timeout:
+            pass
+        return bytes(data)
+
+
+def check_framing(framing: str, delimiter=None) -> str:
+    """
+    Returns the framing in lower case after checking that it is supported.
+    """
+    framing = str(framing).lower()
+    if framing not in FRAMINGS:
+        raise ValueError(f'Framing should be one of {", ".join(FRAMINGS)} but it is {framing}')
+    if framing == DELIMITER_FRAMING and not delimiter:
+        raise ValueError('Delimiter is required for delimiter framing')
+    return framing
+
+
+def frame_message(data: bytes, framing: str, length_size: int = 2, delimiter: bytes = None) -> bytes:
+    """
+    Add the length header or the delimiter to the message.
+    """
+    if framing == LENGTH_FRAMING:
+        return len(data).to_bytes(length_size, 'big') + data
+    elif framing == DELIMITER_FRAMING:
+        return data + delimiter
+    return data
+
+
+@keyword(name="Open Socket Connection", tags=(TAG,))
+def open_socket_connection(host: str, port: int, alias: str = None, timeout: float = 30, framing: str = NO_FRAMING,
+                           length_size: int = 2, delimiter: str = None, buffer_size: int = 4096,
+                           idle_timeout: float = 0.1) -> int:
+    """
+    Open a TCP connection which is kept for many messages and set it as the current connection.
+
+    Arguments:
+
+    - ``host``: an address of the host.
+
+    - ``port``: an port.
+
+    - ``alias``: a name to switch back to this connection.
+
+    - ``timeout``: default seconds to wait for connecting and for each response.
+
+    - ``framing``: ``none``, ``length`` or ``delimiter``.
+
+    - ``length_size``: a size in bytes of the length header for ``length`` framing.
+
+    - ``delimiter``: an end of message for ``delimiter`` framing.
+
+    - ``buffer_size``: a size of each read from the socket.
+
+    - ``idle_timeout``: seconds without data to end a response for ``none`` framing.
+
+    Return: An index of the connection.
+
+    Examples:
+
+    | Open Socket Connection | 192.168.1.1 | 8583 | alias=switch | framing=length | length_size=2 |
+    | Open Socket Connection | 192.168.1.1 | 9000 | framing=delimiter | delimiter=\\x03 |
+    """
+    connection = SocketConnection(host, port, timeout, framing, length_size, delimiter, buffer_size, idle_timeout)
+    return _connections.register(connection, alias)
+
+
+@keyword(name="Switch Socket Connection", tags=(TAG,))
+def switch_socket_connection(alias):
+    """
+    Switch the current connection by the alias or the index from `Open Socket Connection`.
+    A closed connection cannot be switched to.
+    """
+    _switch_open_connection(_connections, alias)
+
+
+@keyword(name="Send Message On Socket Connection", tags=(TAG,))
+def send_message_on_socket_connection(message: bytes, timeout: float = None) -> bytes:
+    """
+    Send a message on the current connection and return the response.
+
+    Arguments:
+
+    - ``message``: an text encoding by base64 or a message builder from `Create Message Builder`.
+
+    - ``timeout``: seconds to wait for the response, the timeout of the connection is used if it is not given.
+
+    Return: Text has been encoded by base64.
+
+    Example:
+
+    | ${response} = | Send Message On Socket Connection | AvKFM4YK02YwMUsxRTlL | timeout=5 |
+    """
+    data = _connections.current.send(read_message(message), timeout)
     return encode_base64(data)
 
 
+@keyword(name="Receive Message On Socket Connection", tags=(TAG,))
+def receive_message_on_socket_connection(timeout: float = None) -> bytes:
+    """
+    Receive one message from the current connection without sending.
+
+    Return: Text has been encoded by base64.
+    """
+    return encode_base64(_connections.current.receive(timeout))
+
+
+@keyword(name="Close Socket Connection", tags=(TAG,))
+def close_socket_connection():
+    """
+    Close the current connection. There is no current connection until `Switch Socket Connection` or
+    `Open Socket Connection`, and the closed connection cannot be switched to. Indexes and aliases of the other
+    connections are kept.
+    """
+    _connections.current.close()
+    _remove_current_connection(_connections)
+
+
+@keyword(name="Close All Socket Connections", tags=(TAG,))
+def close_all_socket_connections():
+    """
+    Close all connections from `Open Socket Connection`. It should be used in the suite teardown.
+    """
+    _connections.close_all()
+
+
+def _switch_open_connection(cache: ConnectionCache, alias):
+    """
+    Switch the current connection of the cache, it fails if the connection is closed.
+    """
+    connection = cache.get_connection(alias)
+    if connection.closed:
+        raise RuntimeError(f"Connection '{alias}' is closed.")
+    cache.switch(alias)
+
+
+def _remove_current_connection(cache: ConnectionCache):
+    """
+    Unset the closed current connection of the cache, it stays registered so indexes and aliases of other
+    connections are kept. The cache is emptied when all connections are closed, so indexes start from 1 again.
+    """
+    cache.current_index = None
+    if all(connection.closed for connection in cache):
+        cache.empty_cache()
+
+
+class SocketSession:
+    """
+    This is a class for sending many messages to the same host through a pool of kept connections.
+
+    Connections are opened when they are needed and a broken connection is opened again by the next message.
+    The latency of every message is recorded for `get_statistics`.
+    """
+
+    def __init__(self, host: str, port: int, pool_size: int = 1, **connection_options):
+        self.host = host
+        self.port = int(port)
+        self.pool_size = int(pool_size)
+        if self.pool_size < 1:
+            raise ValueError(f'Pool size should be at least 1 but it is {pool_size}')
+        self.__options = connection_options
+        self.__pool = queue.LifoQueue()
+        for _ in range(self.pool_size):
+            self.__pool.put(None)
+        self.__lock = threading.Lock()
+        self.__latencies = []
+        self.__errors = 0
+        self.closed = False
+
+    def send(self, data: bytes, timeout: float = None) -> bytes:
+        """
+        Send a message on a free connection and return the response.
+        """
+        return self.__run(lambda connection: self.__send(connection, [data], timeout, 1))[0]
+
+    def send_many(self, messages: list, timeout: float = None, pipeline_depth: int = 1) -> list:
+        """
+        Send messages on all connections of the pool concurrently and return the responses in the same order.
+
+        With ``pipeline_depth`` more than 1, each connection sends up to that number of messages before
+        reading their responses. It needs ``length`` or ``delimiter`` framing to split the responses.
+        """
+        pipeline_depth = int(pipeline_depth)
+        if pipeline_depth > 1 and self.__options.get('framing', NO_FRAMING) == NO_FRAMING:
+            raise ValueError('Pipelined sending needs length or delimiter framing')
+        chunks = [messages[i::self.pool_size] for i in range(self.pool_size)]
+        with ThreadPoolExecutor(max_workers=self.pool_size) as executor:
+            results = list(executor.map(
+                lambda chunk: self.__run(lambda connection: self.__send(connection, chunk, timeout, pipeline_depth)),
+                chunks))
+        responses = [None] * len(messages)
+        for i, chunk_responses in enumerate(results):
+            responses[i::self.pool_size] = chunk_responses
+        return responses
+
+    def get_statistics(self) -> dict:
+        """
+        Returns the count, the error count and the latency in milliseconds (min, mean, p50, p95, p99, max).
+        """
+        with self.__lock:
+            latencies = list(self.__latencies)
+            errors = self.__errors
+        statistics = {'count': len(latencies), 'errors': errors}
+        statistics.update(latency_statistics(latencies))
+        return statistics
+
+    def close(self) -> dict:
+        """
+        Close all connections and return the statistics.
+        """
+        if not self.closed:
+            self.closed = True
+            while not self.__pool.empty():
+                connection = self.__pool.get_nowait()
+                if connection is not None:
+                    connection.close()
+        return self.get_statistics()
+
+    def __run(self, function):
+        if self.closed:
+            raise ConnectionError(f'Socket session to {self.host}:{self.port} is closed')
+        connection = self.__pool.get()
+        try:
+            if connection is None:
+                connection = SocketConnection(self.host, self.port, **self.__options)
+            result = function(connection)
+        except Exception:
+            with self.__lock:
+                self.__errors += 1
+            if connection is not None:
+                connection.close()
+            self.__pool.put(None)
+            raise
+        self.__pool.put(connection)
+        return result
+
+    def __send(self, connection, messages, timeout, pipeline_depth) -> list:
+        responses = []
+        sent_at = []
+        for data in messages:
+            if len(sent_at) - len(responses) >= pipeline_depth:
+                responses.append(self.__receive(connection, timeout, sent_at[len(responses)]))
+            sent_at.append(time.perf_counter())
+            connection.write(data, timeout)
+        while len(responses) < len(sent_at):
+            responses.append(self.__receive(connection, timeout, sent_at[len(responses)]))
+        return responses
+
+    def __receive(self, connection, timeout, sent_at) -> bytes:
+        response = connection.receive(timeout)
+        latency = time.perf_counter() - sent_at
+        with self.__lock:
+            self.__latencies.append(latency)
+        return response
+
+
+def latency_statistics(latencies: list) -> dict:
+    """
+    Returns min, mean, p50, p95, p99 and max in milliseconds of latencies in seconds.
+    """
+    if not latencies:
+        return {}
+    latencies = sorted(latencies)
+    return {
+        'min': round(latencies[0] * 1000, 3),
+        'mean': round(sum(latencies) / len(latencies) * 1000, 3),
+        'p50': round(_percentile(latencies, 50) * 1000, 3),
+        'p95': round(_percentile(latencies, 95) * 1000, 3),
+        'p99': round(_percentile(latencies, 99) * 1000, 3),
+        'max': round(latencies[-1] * 1000, 3)}
+
+
+def _percentile(sorted_values: list, percent: float):
+    """
+    Returns the nearest-rank percentile of sorted values.
+    """
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
+
+
+@keyword(name="Open Socket Session", tags=(TAG,))
+def open_socket_session(host: str, port: int, alias: str = None, pool_size: int = 1, timeout: float = 30,
+                        framing: str = NO_FRAMING, length_size: int = 2, delimiter: str = None,
+                        buffer_size: int = 4096, idle_timeout: float = 0.1) -> int:
+    """
+    Open a session with a pool of kept connections to replay many messages to the same host.
+
+    Arguments are the same as `Open Socket Connection` and
+
+    - ``pool_size``: the number of connections, it is also the number of messages sent concurrently.
+
+    Return: An index of the session.
+
+    Example:
+
+    | Open Socket Session | 192.168.1.1 | 8583 | pool_size=8 | framing=length |
+    | ${responses} = | Send Messages On Session | ${messages} | pipeline_depth=10 |
+    | ${statistics} = | Close Socket Session |
+    """
+    session = SocketSession(host, port, pool_size, timeout=timeout, framing=framing, length_size=length_size,
+                            delimiter=delimiter, buffer_size=buffer_size, idle_timeout=idle_timeout)
+    return _sessions.register(session, alias)
+
+
+@keyword(name="Switch Socket Session", tags=(TAG,))
+def switch_socket_session(alias):
+    """
+    Switch the current session by the alias or the index from `Open Socket Session`.
+    A closed session cannot be switched to.
+    """
+    _switch_open_connection(_sessions, alias)
+
+
+@keyword(name="Send On Session", tags=(TAG,))
+def send_on_session(message: bytes, timeout: float = None) -> bytes:
+    """
+    Send a message on the current session and return the response.
+
+    Arguments:
+
+    - ``message``: an text encoding by base64 or a message builder from `Create Message Builder`.
+
+    - ``timeout``: seconds to wait for the response.
+
+    Return: Text has been encoded by base64.
+    """
+    return encode_base64(_sessions.current.send(read_message(message), timeout))
+
+
+@keyword(name="Send Messages On Session", tags=(TAG,))
+def send_messages_on_session(messages: list, timeout: float = None, pipeline_depth: int = 1) -> list:
+    """
+    Send messages concurrently on all connections of the current session.
+
+    Arguments:
+
+    - ``messages``: a list of text encoding by base64 or message builders.
+
+    - ``timeout``: seconds to wait for each response.
+
+    - ``pipeline_depth``: the number of messages sent on a connection before reading the responses.
+
+    Return: A list of responses encoded by base64 in the same order as ``messages``.
+    """
+    responses = _sessions.current.send_many([read_message(message) for message in messages],
+                                            timeout, pipeline_depth)
+    return [encode_base64(response) for response in responses]
+
+
+@keyword(name="Get Socket Session Statistics", tags=(TAG,))
+def get_socket_session_statistics() -> dict:
+    """
+    Get the message count, the error count and the latency in milliseconds of the current session.
+
+    Example:
+
+    | ${statistics} = | Get Socket Session Statistics |
+
+    =>
+
+    | ${statistics} = {'count': 1000, 'errors': 0, 'min': 0.8, 'mean': 1.2, 'p50': 1.1, 'p95': 2.0, 'p99': 3.4, 'max': 5.1}
+    """
+    return _sessions.current.get_statistics()
+
+
+@keyword(name="Close Socket Session", tags=(TAG,))
+def close_socket_session() -> dict:
+    """
+    Close all connections of the current session and return its statistics like `Get Socket Session Statistics`.
+    There is no current session until `Switch Socket Session` or `Open Socket Session`, and the closed session
+    cannot be switched to.
+    """
+    statistics = _sessions.current.close()
+    _remove_current_connection(_sessions)
+    logger.info(f'Socket session statistics: {statistics}')
+    return statistics
+
+
+@keyword(name="Close All Socket Sessions", tags=(TAG,))
+def close_all_socket_sessions():
+    """
+    Close all sessions from `Open Socket Session`. It should be used in the suite teardown.
+    """
+    _sessions.close_all()
+
+
 @keyword(name="Update Message Socket", tags=(TAG,))
 def update_message_socket(text_base64: bytes, message: str, offset: int, length: int,
                           encode: str = TIS_620) -> bytes:
@@ -109,17 +631,23 @@ def update_message_socket(text_base64: bytes, message: str, offset: int, length:
 
     It will return 'OSzQyODM4MDAwNzg2ODAyMzEg'.
     """
-    if message is None:
-        message = ''
-    if encode == TIS_620:
-        text_byte = convert_str_to_bytes(message, length, encode)
-    else:
-        text_byte = convert_int_to_hex(message, length)
+    text_byte = convert_field_to_bytes(message, length, encode)
     text_decode = decode_base64(text_base64)
     new_message = text_decode[:offset] + text_byte + text_decode[offset + length:]
     return encode_base64(new_message)
 
 
+def convert_field_to_bytes(message: str, length: int, encode: str = TIS_620) -> bytes:
+    """
+    Convert a field value to bytes of the length, padded with spaces for TIS-620 or zeros for hex.
+    """
+    if message is None:
+        message = ''
+    if encode == TIS_620:
+        return convert_str_to_bytes(message, length, encode)
+    return convert_int_to_hex(message, length)
+
+
 def convert_str_to_bytes(text: str, length: int, encode: str) -> bytes:
     """
     Convert string to Bytes.
@@ -175,6 +703,16 @@ def encode_base64(text: bytes) -> bytes:
     return base64.b64encode(bytes(text))
 
 
+def read_message(message) -> bytes:
+    """
+    Returns bytes of a message which is a text encoding by base64 or an object supporting bytes(),
+    ex. a message builder, so that the builder is not encoded to base64 before sending.
+    """
+    if isinstance(message, (str, bytes)):
+        return decode_base64(message)
+    return bytes(message)
+
+
 @keyword(name="Decode Base64", tags=(TAG,))
 def decode_base64(text: bytes) -> bytes:
     """
@@ -0,0 +1,30 @@
+import unittest
+from Utilities.dict_management import get_list_diffs
+
+
+class Test(unittest.TestCase):
+
+    def test1(self):
+        result = get_list_diffs([10, 15, 20, 25, 30, 35, 40], [25, 40, 35])
+        assert result == [10, 15, 20, 30]
+
+    def test2(self):
+        '''Duplicated items are kept in the original order'''
+        result = get_list_diffs(['0012000030', '0012000049', '0012000030', '0012000011'], ['0012000049'])
+        assert result == ['0012000030', '0012000030', '0012000011']
+
+    def test3(self):
+        list1 = [{'acctId': '0012000030', 'branch': ['0001']}, {'acctId': '0012000049', 'branch': ['0001']}, [1, 2]]
+        list2 = [{'branch': ['0001'], 'acctId': '0012000049'}, (1, 2)]
+        result = get_list_diffs(list1, list2)
+        assert result == [{'acctId': '0012000030', 'branch': ['0001']}, [1, 2]]
+
+    def test4(self):
+        result = get_list_diffs([10, 15, 20], [15, 20, 25, 25], symmetric=True)
+        assert result == [10, 25, 25]
+
+    def test5(self):
+        list1 = [str(i).zfill(10) for i in range(100000)]
+        list2 = [str(i).zfill(10) for i in range(1, 100000, 2)]
+        result = get_list_diffs(list1, list2)
+        assert result == [str(i).zfill(10) for i in range(0, 100000, 2)]
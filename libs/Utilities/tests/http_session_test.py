@@ -0,0 +1,165 @@
+import unittest
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+from Utilities.http_session import configure_http_session, get_http_session, get_http_session_statistics, \
+    get_freshness_lifetime, import_http_session, HTTPCache
+from Utilities.tests.server_fixture import HTTPServerTestCase
+
+
+def create_response(status, **headers):
+    response = Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict({name.replace('_', '-'): value for name, value in headers.items()})
+    return response
+
+
+class OkHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        body = (self.headers.get('Cookie') or 'ok').encode()
+        self.send_response(200)
+        if self.path == '/login':
+            self.send_header('Set-Cookie', 'sid=abc; Path=/')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class HttpSessionTest(HTTPServerTestCase):
+    handler = OkHandler
+
+    def test1(self):
+        configure_http_session()
+        for _ in range(5):
+            assert get_http_session().get(self.url).text == 'ok'
+        statistics = get_http_session_statistics()
+        assert statistics == {'requests': 5, 'connections': 1, 'reused': 4, 'reuse_ratio': 0.8}
+
+    def test2(self):
+        '''Configure HTTP Session replaces the session and resets the statistics'''
+        session = get_http_session()
+        configure_http_session(pool_maxsize=2, max_retries=3, backoff_factor=0.1)
+        assert get_http_session() is not session
+        assert get_http_session_statistics()['requests'] == 0
+        assert get_http_session().get_adapter(self.url).max_retries.total == 3
+
+    def test3(self):
+        '''Cookies set for one request are not sent by the next request of the shared session'''
+        configure_http_session()
+        assert get_http_session().get(self.url + '/login').text == 'ok'
+        assert get_http_session().get(self.url + '/other').text == 'ok'
+        assert not get_http_session().cookies
+
+    def test4(self):
+        '''Another import with the same options keeps the session, its configuration and the statistics'''
+        import_http_session(pool_maxsize=5)
+        configure_http_session(pool_maxsize=50)
+        session = get_http_session()
+        session.get(self.url)
+        import_http_session(pool_maxsize=5)
+        assert get_http_session() is session
+        import_http_session(pool_maxsize=6)
+        assert get_http_session() is not session
+        get_http_session().get(self.url)
+        assert get_http_session_statistics() == {'requests': 2, 'connections': 2, 'reused': 0, 'reuse_ratio': 0.0}
+
+
+class HttpCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.sent = []
+
+    def send(self, *responses):
+        responses = list(responses)
+
+        def send(headers):
+            self.sent.append(headers)
+            return responses.pop(0)
+        return send
+
+    def test1(self):
+        cache = HTTPCache()
+        fresh = create_response(200, Cache_Control='max-age=60')
+        fresh.elapsed = timedelta(seconds=5)
+        send = self.send(fresh)
+        assert cache.request('GET', 'http://api/users', {'page': 1}, {}, send) is fresh
+        cached = cache.request('get', 'http://api/users', {'page': '1'}, {}, send)
+        assert cached.headers == fresh.headers and cached.status_code == 200
+        assert cached.elapsed < timedelta(seconds=1)
+        assert len(self.sent) == 1
+        assert cache.statistics() == {'hits': 1, 'revalidated': 0, 'misses': 1, 'stored': 1, 'evicted': 0,
+                                      'entries': 1, 'hit_ratio': 0.5}
+
+    def test2(self):
+        '''A stale response is revalidated by ETag and kept on 304'''
+        cache = HTTPCache()
+        cached = create_response(200, Cache_Control='no-cache', ETag='"v1"')
+        send = self.send(cached, create_response(304, ETag='"v1"', Cache_Control='max-age=60'))
+        cache.request('GET', 'http://api/config', None, {'Accept': 'application/json'}, send)
+        revalidated = cache.request('GET', 'http://api/config', None, {'Accept': 'application/json'}, send)
+        assert revalidated.headers == {'Cache-Control': 'max-age=60', 'ETag': '"v1"'}
+        assert cached.headers['Cache-Control'] == 'no-cache'
+        assert self.sent[1] == {'Accept': 'application/json', 'If-None-Match': '"v1"'}
+        assert cache.request('GET', 'http://api/config', None, {'Accept': 'application/json'}, send).status_code == 200
+        assert len(self.sent) == 2
+        assert cache.statistics()['revalidated'] == 1
+
+    def test3(self):
+        '''Key headers, no-store, other statuses, LRU eviction and other methods'''
+        cache = HTTPCache(max_entries=1)
+        send = self.send(*[create_response(200, Cache_Control='max-age=60') for _ in range(4)] +
+                         [create_response(200, Cache_Control='no-store'), create_response(404, ETag='"x"')])
+        cache.request('GET', 'http://api/a', None, {'Authorization': 'one'}, send)
+        cache.request('GET', 'http://api/a', None, {'authorization': 'two'}, send)
+        assert cache.statistics()['evicted'] == 1
+        cache.request('POST', 'http://api/a', None, {}, send)
+        cache.request('GET', 'http://api/a', None, {'Authorization': 'two'}, send)
+        cache.request('GET', 'http://api/b', None, {}, send)
+        cache.request('GET', 'http://api/c', None, {}, send)
+        assert len(self.sent) == 6
+        assert cache.statistics()['stored'] == 3
+
+    def test4(self):
+        assert get_freshness_lifetime(CaseInsensitiveDict({'Cache-Control': 'public, max-age=60', 'Age': '10'})) == 50
+        assert get_freshness_lifetime(CaseInsensitiveDict({'Cache-Control': 'max-age=60, no-cache'})) == 0
+        assert get_freshness_lifetime(CaseInsensitiveDict({'Date': 'Mon, 19 Oct 2020 10:00:00 GMT',
+                                                           'Expires': 'Mon, 19 Oct 2020 10:05:00 GMT'})) == 300
+        assert get_freshness_lifetime(CaseInsensitiveDict({'Expires': '0'})) == 0
+
+    def test5(self):
+        '''The Cookie header is a part of the key and Vary headers must be the same'''
+        cache = HTTPCache()
+        send = self.send(*[create_response(200, Cache_Control='max-age=60', Vary='X-Tenant') for _ in range(3)] +
+                         [create_response(200, Cache_Control='max-age=60', Vary='*') for _ in range(2)])
+        cache.request('GET', 'http://api/me', None, {'Cookie': 'sid=one', 'X-Tenant': 'a'}, send)
+        cache.request('GET', 'http://api/me', None, {'Cookie': 'sid=two', 'X-Tenant': 'a'}, send)
+        cache.request('GET', 'http://api/me', None, {'Cookie': 'sid=two', 'x-tenant': 'a'}, send)
+        assert len(self.sent) == 2
+        cache.request('GET', 'http://api/me', None, {'Cookie': 'sid=two', 'X-Tenant': 'b'}, send)
+        cache.request('GET', 'http://api/me', None, {'Cookie': 'sid=two', 'X-Tenant': 'b'}, send)
+        assert len(self.sent) == 3
+        cache.request('GET', 'http://api/any', None, {}, send)
+        cache.request('GET', 'http://api/any', None, {}, send)
+        assert len(self.sent) == 5
+
+    def test6(self):
+        '''Changing a returned response does not change the cached one'''
+        cache = HTTPCache(max_entries=1)
+        send = self.send(create_response(200, Cache_Control='max-age=60', X_Version='1'),
+                         create_response(200, ETag='"a"'), create_response(304, ETag='"a"'))
+        cache.request('GET', 'http://api/a', None, {}, send).headers['X-Version'] = 'changed'
+        hit = cache.request('GET', 'http://api/a', None, {}, send)
+        assert hit.headers['X-Version'] == '1'
+        hit.headers['X-Version'] = 'changed'
+        assert cache.request('GET', 'http://api/a', None, {}, send).headers['X-Version'] == '1'
+        # a revalidated response is stored through the LRU like other responses
+        cache.request('GET', 'http://api/b', None, {}, send)
+        cache.request('GET', 'http://api/b', None, {}, send)
+        assert cache.statistics()['entries'] == 1
+        assert cache.statistics()['evicted'] == 1
@@ -0,0 +1,47 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from Utilities import get_values_from_json_file
+from Utilities.json_stream import iter_json_values, parse_json_query
+
+
+class JsonStreamTest(unittest.TestCase):
+
+    def setUp(self):
+        self.source = {'meta': {'count': 2, 'rate': 1.5}, 'items': [
+            {'id': 1, 'name': 'first', 'tags': ['a', 'b'], 'owner': {'name': 'x'}},
+            {'id': 2, 'name': 'second', 'tags': [], 'owner': None}]}
+        handle, self.file_path = tempfile.mkstemp(suffix='.json')
+        with os.fdopen(handle, 'w') as file:
+            json.dump(self.source, file)
+
+    def tearDown(self):
+        os.remove(self.file_path)
+
+    def test1(self):
+        assert get_values_from_json_file(self.file_path, '$.items[*].name') == ['first', 'second']
+        assert get_values_from_json_file(self.file_path, 'items.*.name') == ['first', 'second']
+        assert get_values_from_json_file(self.file_path, 'items 1 id') == [2]
+        assert get_values_from_json_file(self.file_path, '$.meta.rate') == [1.5]
+
+    def test2(self):
+        '''Objects, arrays and the whole document are built as values'''
+        assert get_values_from_json_file(self.file_path, '$.items[0].owner') == [{'name': 'x'}]
+        assert get_values_from_json_file(self.file_path, "$['items'][0]['tags']") == [['a', 'b']]
+        assert get_values_from_json_file(self.file_path, '$') == [self.source]
+
+    def test3(self):
+        '''Recursive descent matches any level but not inside a matched value'''
+        assert get_values_from_json_file(self.file_path, '$..name') == ['first', 'x', 'second']
+        assert get_values_from_json_file(self.file_path, '$..tags[0]') == ['a']
+        assert get_values_from_json_file(self.file_path, '$..name', limit=1) == ['first']
+        assert get_values_from_json_file(self.file_path, '$.notExist') == []
+
+    def test4(self):
+        assert list(iter_json_values(io.BytesIO(b'[{"a": [1, {"b": 2}]}, {"a": []}]'), '$[*].a')) == \
+               [[1, {'b': 2}], []]
+        assert parse_json_query('$..[0]') == ['..', '0']
+        with self.assertRaises(ValueError):
+            parse_json_query('$.items[?(@.id)]')
@@ -0,0 +1,31 @@
+import unittest
+from Utilities.dict_management import build_key_index, get_values_by_key_from_index, get_paths_by_key_from_index
+
+
+class KeyIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.source = {'kbankHeader': {'funcNm': 'VS3D2077O01', 'statusCode': '10', 'errors': [{'errorAppId': '257', 'errorCode': '30195'}, {'errorAppId': '681', 'errorCode': '2001'}]}, 'errorCode': '99', 'cardInfo': {'ticketId': 'f859f32ad7f447b1bf79639b4733590a', 'otp': None}}
+
+    def test1(self):
+        index = build_key_index(self.source)
+        assert get_values_by_key_from_index(index, 'funcNm') == ['VS3D2077O01']
+        assert get_values_by_key_from_index(index, 'errorAppId') == ['257', '681']
+
+    def test2(self):
+        index = build_key_index(self.source)
+        actual = get_paths_by_key_from_index(index, 'errorCode')
+        expect = [['kbankHeader', 'errors', 0, 'errorCode'], ['kbankHeader', 'errors', 1, 'errorCode'], ['errorCode']]
+        assert actual == expect
+
+    def test3(self):
+        '''Keys holding a dictionary or None are indexed as well'''
+        index = build_key_index(self.source)
+        assert get_values_by_key_from_index(index, 'cardInfo') == [self.source['cardInfo']]
+        assert get_values_by_key_from_index(index, 'otp') == [None]
+        assert 'errors' in index
+
+    def test4(self):
+        index = build_key_index([{'accNumber': '123456'}, {'accNumber': '654321'}])
+        assert get_values_by_key_from_index(index, 'accNumber') == ['123456', '654321']
+        assert get_values_by_key_from_index(index, 'notExist') == []
@@ -0,0 +1,62 @@
+import unittest
+from Utilities import encode_base64, decode_base64, update_message_socket
+from Utilities.socket_management import read_message, convert_field_to_bytes
+from Utilities.message_builder import create_message_builder, set_message_field, set_message_fields, \
+    get_message_field, get_message_from_builder, MessageField
+
+
+class MessageBuilderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.template = encode_base64(b'0200' + b' ' * 16 + b'\x00' * 4)
+        self.layout = [{'name': 'acctId', 'offset': 4, 'length': 10}, {'name': 'branch', 'offset': 14, 'length': 6}, {'name': 'amount', 'offset': 20, 'length': 4, 'encode': 'hex'}]
+
+    def test1(self):
+        '''Builder gives the same message as Update Message Socket'''
+        builder = create_message_builder(self.template, self.layout)
+        set_message_fields(builder, {'acctId': '0012000030', 'branch': 'สาขา', 'amount': 103050})
+        expect = update_message_socket(self.template, '0012000030', 4, 10)
+        expect = update_message_socket(expect, 'สาขา', 14, 6)
+        expect = update_message_socket(expect, '103050', 20, 4, 'hex')
+        assert get_message_from_builder(builder) == expect
+        assert bytes(builder) == decode_base64(expect)
+
+    def test2(self):
+        builder = create_message_builder(self.template, self.layout)
+        set_message_field(builder, 'branch', 'สาขา')
+        set_message_field(builder, 0, '0210', 4)
+        set_message_field(builder, 'amount', 255)
+        assert get_message_field(builder, 'branch') == 'สาขา'
+        assert get_message_field(builder, 0, 4) == '0210'
+        assert get_message_field(builder, 'amount') == '255'
+
+    def test3(self):
+        builder = create_message_builder(size=10)
+        assert bytes(builder) == b' ' * 10
+        with self.assertRaises(ValueError):
+            set_message_field(builder, 8, 'ABCD', 4)
+        with self.assertRaises(ValueError):
+            set_message_field(builder, 0, 'ABCDE', 4)
+        with self.assertRaises(ValueError):
+            create_message_builder(encode_base64(b' ' * 10), [{'name': 'acctId', 'offset': 4, 'length': 10}])
+
+    def test4(self):
+        '''Socket keywords send the builder without base64'''
+        builder = create_message_builder(self.template, self.layout)
+        set_message_field(builder, 'acctId', '0012000030')
+        assert read_message(builder) == bytes(builder)
+        assert read_message(get_message_from_builder(builder)) == bytes(builder)
+
+    def test5(self):
+        '''Precomputed field encoders give the same bytes as convert_field_to_bytes'''
+        for encode, values, too_long in (('TIS-620', ['', 'A', '0012000030', 'สาขา', 12345, None], '12345678901'),
+                                         ('hex', [0, 1, 255, 256, 103050, '4294967295'], 4294967296)):
+            field = MessageField('field', 0, 10 if encode == 'TIS-620' else 4, encode)
+            for value in values:
+                expect = convert_field_to_bytes('' if value is None else str(value), field.length, encode)
+                assert field.encode_value(value) == expect
+            with self.assertRaises(ValueError):
+                convert_field_to_bytes(str(too_long), field.length, encode)
+            with self.assertRaises(ValueError):
+                field.encode_value(too_long)
+
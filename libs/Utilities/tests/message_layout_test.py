@@ -0,0 +1,54 @@
+import json
+import os
+import tempfile
+import unittest
+import openpyxl
+from Utilities import encode_base64, decode_base64, update_message_socket
+from Utilities.message_builder import load_message_layout, encode_message_fields, decode_message_fields, \
+    create_message_builder, get_message_field
+
+
+class MessageLayoutTest(unittest.TestCase):
+
+    def setUp(self):
+        self.fields = [{'name': 'mti', 'offset': 0, 'length': 4}, {'name': 'acctId', 'offset': 4, 'length': 10}, {'name': 'branch', 'offset': 14, 'length': 6}, {'name': 'amount', 'offset': 20, 'length': 4, 'encode': 'hex'}]
+        self.folder = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test1(self):
+        path = os.path.join(self.folder.name, 'transfer.json')
+        with open(path, 'w', encoding='utf-8') as layout_file:
+            json.dump({'fields': self.fields}, layout_file)
+        load_message_layout('transfer_json', path)
+        message = encode_message_fields('transfer_json', {'mti': '0200', 'acctId': '0012000030', 'branch': 'สาขา', 'amount': 103050})
+        expect = encode_base64(b' ' * 20 + b'\x00' * 4)
+        for value, offset, length, encode in (('0200', 0, 4, 'TIS-620'), ('0012000030', 4, 10, 'TIS-620'), ('สาขา', 14, 6, 'TIS-620'), ('103050', 20, 4, 'hex')):
+            expect = update_message_socket(expect, value, offset, length, encode)
+        assert message == expect
+        assert decode_message_fields('transfer_json', message) == {'mti': '0200', 'acctId': '0012000030', 'branch': 'สาขา', 'amount': '103050'}
+
+    def test2(self):
+        path = os.path.join(self.folder.name, 'layouts.xlsx')
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.title = 'transfer'
+        sheet.append(['Name', 'Offset', 'Length', 'Encode'])
+        for field in self.fields:
+            sheet.append([field['name'], field['offset'], field['length'], field.get('encode')])
+        workbook.save(path)
+        load_message_layout('transfer_xlsx', path, 'transfer')
+        template = encode_message_fields('transfer_xlsx', {'mti': '0200', 'acctId': '0012000030'})
+        message = encode_message_fields('transfer_xlsx', {'mti': '0210', 'amount': 1}, template)
+        assert decode_message_fields('transfer_xlsx', message) == {'mti': '0210', 'acctId': '0012000030', 'branch': '', 'amount': '1'}
+
+    def test3(self):
+        '''Fields after the end of a short response are skipped'''
+        assert decode_message_fields(self.fields, encode_base64(b'0210ABC')) == {'mti': '0210'}
+
+    def test4(self):
+        builder = create_message_builder(layout=self.fields)
+        assert get_message_field(builder, 'amount') == '0'
+        with self.assertRaises(ValueError):
+            encode_message_fields(self.fields, {'amount': 2 ** 32})
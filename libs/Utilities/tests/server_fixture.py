@@ -0,0 +1,40 @@
+import socketserver
+import threading
+import unittest
+from http.server import ThreadingHTTPServer
+
+
+class EchoHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        while True:
+            data = self.request.recv(65536)
+            if not data:
+                break
+            self.request.sendall(data)
+
+
+class ServerTestCase(unittest.TestCase):
+    '''
+    Starts a local server of the handler for the test class, TCP echo by default or HTTP for a request handler.
+    '''
+
+    handler = EchoHandler
+    server_class = socketserver.ThreadingTCPServer
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server_class.allow_reuse_address = True
+        cls.server = cls.server_class(('127.0.0.1', 0), cls.handler)
+        cls.server.daemon_threads = True
+        cls.port = cls.server.server_address[1]
+        cls.url = 'http://127.0.0.1:%d' % cls.port
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+
+class HTTPServerTestCase(ServerTestCase):
+    server_class = ThreadingHTTPServer
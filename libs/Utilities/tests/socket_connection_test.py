@@ -0,0 +1,54 @@
+from Utilities import encode_base64, decode_base64
+from Utilities.socket_management import send_message_socket, open_socket_connection, \
+    send_message_on_socket_connection, switch_socket_connection, close_socket_connection, \
+    close_all_socket_connections
+from Utilities.tests.server_fixture import ServerTestCase
+
+
+class SocketConnectionTest(ServerTestCase):
+
+    def tearDown(self):
+        close_all_socket_connections()
+
+    def test1(self):
+        '''Response longer than one read is not truncated'''
+        message = b'0200' + b'9' * 5000
+        result = send_message_socket('127.0.0.1', self.port, encode_base64(message), buffer_size=1024)
+        assert decode_base64(result) == message
+
+    def test2(self):
+        open_socket_connection('127.0.0.1', self.port, framing='length', length_size=2, buffer_size=512)
+        for size in (10, 3000, 0, 40000):
+            message = bytes(i % 256 for i in range(size))
+            result = send_message_on_socket_connection(encode_base64(message), timeout=5)
+            assert decode_base64(result) == message
+
+    def test3(self):
+        open_socket_connection('127.0.0.1', self.port, alias='first', framing='delimiter', delimiter='\x03')
+        open_socket_connection('127.0.0.1', self.port, alias='second', framing='length', length_size=4)
+        switch_socket_connection('first')
+        result = send_message_on_socket_connection(encode_base64('สวัสดี'.encode('TIS-620')))
+        assert decode_base64(result).decode('TIS-620') == 'สวัสดี'
+        switch_socket_connection('second')
+        result = send_message_on_socket_connection(encode_base64(b'\x03' * 10))
+        assert decode_base64(result) == b'\x03' * 10
+
+    def test4(self):
+        with self.assertRaises(ValueError):
+            open_socket_connection('127.0.0.1', self.port, framing='delimiter')
+
+    def test5(self):
+        '''A closed connection is removed, the others keep their indexes'''
+        assert open_socket_connection('127.0.0.1', self.port, alias='first', framing='length') == 1
+        assert open_socket_connection('127.0.0.1', self.port, alias='second', framing='length') == 2
+        close_socket_connection()
+        with self.assertRaises(RuntimeError):
+            send_message_on_socket_connection(encode_base64(b'0200'))
+        with self.assertRaises(RuntimeError):
+            switch_socket_connection('second')
+        switch_socket_connection('first')
+        assert decode_base64(send_message_on_socket_connection(encode_base64(b'0200'))) == b'0200'
+        close_socket_connection()
+        # all connections are closed, indexes start from 1 again
+        assert open_socket_connection('127.0.0.1', self.port, framing='length') == 1
+
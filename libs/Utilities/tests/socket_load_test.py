@@ -0,0 +1,33 @@
+from Utilities import encode_base64, decode_base64, update_message_socket, run_socket_load
+from Utilities.socket_load import SocketLoad
+from Utilities.tests.server_fixture import ServerTestCase
+
+
+class SocketLoadTest(ServerTestCase):
+
+    def setUp(self):
+        self.template = encode_base64(b'0200' + b' ' * 10 + b'\x00' * 2)
+        self.fields = [{'offset': 4, 'length': 10, 'value': 'TX{index}'}, {'offset': 14, 'length': 2, 'encode': 'hex', 'values': ['1', '255']}]
+
+    def test1(self):
+        '''Messages are the same as updating the template by Update Message Socket'''
+        load = SocketLoad('127.0.0.1', self.port, decode_base64(self.template), self.fields, 2, 1, None, 30, 'none', 2, None, 4096, 0.1)
+        expect = update_message_socket(update_message_socket(self.template, 'TX1', 4, 10), '255', 14, 2, 'hex')
+        assert load.build_message(1) == decode_base64(expect)
+
+    def test2(self):
+        summary = run_socket_load('127.0.0.1', self.port, self.template, self.fields, count=300, connections=5, framing='length')
+        assert summary['count'] == 300
+        assert summary['errors'] == 0
+        assert summary['p50'] <= summary['p95'] <= summary['p99'] <= summary['max']
+        assert summary['tps'] > 0
+
+    def test3(self):
+        summary = run_socket_load('127.0.0.1', self.port, self.template, count=20, connections=2, rate=200, framing='delimiter', delimiter='\x03')
+        assert summary['errors'] == 0
+        assert summary['duration'] >= 0.09
+
+    def test4(self):
+        '''Connection errors are counted instead of failing the keyword'''
+        summary = run_socket_load('127.0.0.1', 1, self.template, count=3, connections=1, timeout=1)
+        assert summary['errors'] == 3
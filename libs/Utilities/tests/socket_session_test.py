@@ -0,0 +1,49 @@
+from Utilities import encode_base64, decode_base64, update_message_socket
+from Utilities.socket_management import open_socket_session, send_on_session, send_messages_on_session, \
+    close_socket_session, close_all_socket_sessions, switch_socket_session, latency_statistics
+from Utilities.tests.server_fixture import ServerTestCase
+
+
+class SocketSessionTest(ServerTestCase):
+
+    def test1(self):
+        template = encode_base64(b'0200' + b' ' * 20)
+        messages = [update_message_socket(template, str(i), 4, 10) for i in range(200)]
+        open_socket_session('127.0.0.1', self.port, pool_size=4, framing='length')
+        assert send_on_session(messages[0]) == messages[0]
+        assert send_messages_on_session(messages) == messages
+        assert send_messages_on_session(messages, pipeline_depth=16) == messages
+        statistics = close_socket_session()
+        assert statistics['count'] == 401
+        assert statistics['errors'] == 0
+        assert statistics['p50'] <= statistics['p95'] <= statistics['p99'] <= statistics['max']
+
+    def test2(self):
+        open_socket_session('127.0.0.1', self.port, pool_size=2)
+        with self.assertRaises(ValueError):
+            send_messages_on_session([encode_base64(b'0200')], pipeline_depth=2)
+        assert close_socket_session() == {'count': 0, 'errors': 0}
+
+    def test3(self):
+        statistics = latency_statistics([index / 1000 for index in range(100, 0, -1)])
+        assert statistics == {'min': 1, 'mean': 50.5, 'p50': 50, 'p95': 95, 'p99': 99, 'max': 100}
+        assert latency_statistics([0.007])['p99'] == 7
+        assert latency_statistics([]) == {}
+
+    def test4(self):
+        '''A closed session is removed and Close All Socket Sessions closes the rest'''
+        open_socket_session('127.0.0.1', self.port, alias='first', framing='length')
+        open_socket_session('127.0.0.1', self.port, alias='second', framing='length')
+        close_socket_session()
+        with self.assertRaises(RuntimeError):
+            send_on_session(encode_base64(b'0200'))
+        with self.assertRaises(RuntimeError):
+            switch_socket_session('second')
+        switch_socket_session('first')
+        assert send_on_session(encode_base64(b'0200')) == encode_base64(b'0200')
+        close_all_socket_sessions()
+        with self.assertRaises(RuntimeError):
+            send_on_session(encode_base64(b'0200'))
+        assert open_socket_session('127.0.0.1', self.port) == 1
+        close_all_socket_sessions()
+
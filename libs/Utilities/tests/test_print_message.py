@@ -1,5 +1,7 @@
+import os
+import tempfile
 import unittest
-from Utilities.utilities import print_friendly_message
+from Utilities.utilities import print_friendly_message, iter_friendly_messages
 
 
 class TestPrintMessage(unittest.TestCase):
@@ -71,3 +73,38 @@ The value of "MDWCommonTransferK2K.toAvailBal" is changed from "90111171015.69"
 The value of "errorAppAbbrv.abc" at index "0" of "kbankHeader.errors" is changed from "EAI" to "EAIaa"
 The value of "result.authzResponses.wsa.sessionIID" is changed from "QE1wPkZGDfltG8nn3pDClg" to "v0M0lsmwSdorvs78mGMPpA"'''
         assert actual == expect
+
+    def test11(self):
+        input_data = [('change', ['kbankHeader', 'errors', 0], ('EAI', 'EAIaa')), ('change', [0, 'errorCode'], ('1', '2'))]
+        actual = print_friendly_message(input_data)
+        expect = '''The value of "" at index "0" of "kbankHeader.errors" is changed from "EAI" to "EAIaa"
+The value of "errorCode" at index "0" of "" is changed from "1" to "2"'''
+        assert actual == expect
+
+    def test12(self):
+        input_data = [('change', 'accounts.balance', (i, i + 1)) for i in range(5000)]
+        actual = print_friendly_message(input_data, max_messages=2)
+        expect = '''The value of "accounts.balance" is changed from "0" to "1"
+The value of "accounts.balance" is changed from "1" to "2"
+... and 4,998 more differences'''
+        assert actual == expect
+
+    def test13(self):
+        input_data = [('change', 'kbankHeader.funcNm', ('VS3D2077O01', 'VS3D2077O02')), ('add', '', [('cvrsInfo', "aaaa")])]
+        with tempfile.TemporaryDirectory() as folder:
+            report_file = os.path.join(folder, 'diffs.txt')
+            actual = print_friendly_message(input_data, max_messages=1, report_file=report_file)
+            with open(report_file, encoding='utf-8') as report:
+                assert report.read().splitlines() == list(iter_friendly_messages(input_data))
+        assert actual == '''The value of "kbankHeader.funcNm" is changed from "VS3D2077O01" to "VS3D2077O02"
+... and 1 more difference'''
+
+    def test14(self):
+        '''Only a summary is returned when the full message is written to the report file'''
+        input_data = [('change', 'accounts.balance', (i, i + 1)) for i in range(25)]
+        with tempfile.TemporaryDirectory() as folder:
+            report_file = os.path.join(folder, 'diffs.txt')
+            actual = print_friendly_message(input_data, report_file=report_file)
+            with open(report_file, encoding='utf-8') as report:
+                assert len(report.read().splitlines()) == 25
+        assert actual.splitlines() == list(iter_friendly_messages(input_data))[:10] + ['... and 15 more differences']
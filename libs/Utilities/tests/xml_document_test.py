@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+from xml.etree import ElementTree as et
+from Utilities.xml_management import open_xml_document, update_value_in_xml_document, \
+    update_values_in_xml_document, get_value_from_xml_document, get_values_from_xml_document, \
+    convert_xml_document_to_string, save_xml_document
+
+RESPONSE = '''<response><header><appId>000</appId></header><errors><error><errorCode>30195</errorCode></error>
+<error><errorCode>2001</errorCode><detail><errorCode>9</errorCode></detail></error></errors>
+<errorCode>99</errorCode></response>'''
+
+
+class XMLDocumentTest(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.data_file = tempfile.mkstemp(suffix='.xml')
+        with os.fdopen(handle, 'w', encoding='UTF-8') as file:
+            file.write(RESPONSE)
+
+    def tearDown(self):
+        os.remove(self.data_file)
+
+    def test1(self):
+        '''Paths are found in document order like ElementTree'''
+        document = open_xml_document(self.data_file)
+        root = et.fromstring(RESPONSE)
+        for path in ['errorCode', 'error.errorCode', 'errors.error', 'detail.errorCode', 'response.header',
+                     'errors.error[2].errorCode', 'notExist']:
+            expect = [element.text for element in root.findall('.//' + path.replace('.', '/'))]
+            assert get_values_from_xml_document(document, path) == expect, path
+
+    def test2(self):
+        '''The file is written only on save'''
+        document = open_xml_document(self.data_file)
+        update_values_in_xml_document(document, {'header.appId': '681', 'error.errorCode': '1'})
+        update_value_in_xml_document(document, 'notExist', '1')
+        assert get_value_from_xml_document(document, 'appId') == '681'
+        assert get_values_from_xml_document(document, 'error.errorCode') == ['1', '2001']
+        assert '<appId>681</appId>' in convert_xml_document_to_string(document)
+        assert et.parse(self.data_file).getroot().find('.//appId').text == '000'
+        save_xml_document(document)
+        assert et.parse(self.data_file).getroot().find('.//appId').text == '681'
+
+    def test3(self):
+        document = open_xml_document(self.data_file)
+        with self.assertRaises(ValueError):
+            get_value_from_xml_document(document, 'header.notExist')
@@ -0,0 +1,78 @@
+import os
+import stat
+import tempfile
+import unittest
+from xml.etree import ElementTree as et
+from Utilities.xml_management import update_value_to_xml, update_values_to_xml
+
+REQUEST = '''<?xml version="1.0" encoding="UTF-8"?>
+<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/">
+<soap:Body><request><header><appId>000</appId><rqUID>old<extra>keep</extra>tail</rqUID></header><amount/></request></soap:Body>
+</soap:Envelope>'''
+
+HEADER = '''<request><header><appId>000</appId><rqUID>old</rqUID></header><amount/></request>'''
+
+
+class XMLUpdateTest(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.data_file = tempfile.mkstemp(suffix='.xml')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.data_file)
+
+    def write(self, content):
+        with open(self.data_file, 'w', encoding='UTF-8') as file:
+            file.write(content)
+
+    def test1(self):
+        self.write(HEADER)
+        update_values_to_xml(self.data_file, {'header.appId': '681', 'amount': '100.00', 'notExist': '1'})
+        root = et.parse(self.data_file).getroot()
+        assert root.find('.//header/appId').text == '681'
+        assert root.find('.//amount').text == '100.00'
+        assert root.find('.//rqUID').text == 'old'
+
+    def test2(self):
+        self.write(HEADER)
+        update_value_to_xml(self.data_file, 'header.rqUID', '681_20200701')
+        assert et.parse(self.data_file).getroot().find('.//rqUID').text == '681_20200701'
+
+    def test3(self):
+        '''Streaming mode matches local names and keeps child elements and prefixes'''
+        self.write(REQUEST)
+        update_values_to_xml(self.data_file, {'header.appId': '681', 'rqUID': 'new', 'amount': 5}, streaming=True)
+        with open(self.data_file, encoding='UTF-8') as file:
+            content = file.read()
+        assert '<soap:Envelope' in content
+        root = et.fromstring(content.encode('UTF-8'))
+        assert root.find('.//header/appId').text == '681'
+        assert root.find('.//rqUID').text == 'new'
+        assert root.find('.//rqUID/extra').text == 'keep'
+        assert root.find('.//rqUID/extra').tail == 'tail'
+        assert root.find('.//amount').text == '5'
+
+    def test4(self):
+        '''A broken file is left untouched in streaming mode'''
+        self.write('<request><header>')
+        with self.assertRaises(Exception):
+            update_values_to_xml(self.data_file, {'header': '1'}, streaming=True)
+        with open(self.data_file, encoding='UTF-8') as file:
+            assert file.read() == '<request><header>'
+
+    def test5(self):
+        '''Streaming mode keeps the permissions and leaves no temporary file'''
+        with tempfile.TemporaryDirectory() as folder:
+            data_file = os.path.join(folder, 'shared.xml')
+            with open(data_file, 'w', encoding='UTF-8') as file:
+                file.write(HEADER)
+            os.chmod(data_file, 0o664)
+            update_values_to_xml(data_file, {'appId': '681'}, streaming=True)
+            assert stat.S_IMODE(os.stat(data_file).st_mode) == 0o664
+            with open(data_file, 'w', encoding='UTF-8') as file:
+                file.write('<request><header>')
+            with self.assertRaises(Exception):
+                update_values_to_xml(data_file, {'appId': '1'}, streaming=True)
+            assert os.listdir(folder) == ['shared.xml']
+
@@ -8,10 +8,10 @@ import re
 from json import loads
 from dictdiffer import diff
 from robot.api import logger
-import requests
 from robot.api.deco import keyword
 from datetime import date
 from random import randint
+from .http_session import get_http_session
 
 TAG = 'utilities'
 __all__ = ['load_json_from_file',
@@ -20,6 +20,8 @@ __all__ = ['load_json_from_file',
            'upload_image_without_data',
            'generate_request_uid']
 
+REPORT_FILE_MAX_MESSAGES = 10
+
 
 @keyword(name="Load JSON From File", tags=(TAG,))
 def load_json_from_file(file_path):
@@ -27,63 +29,95 @@ def load_json_from_file(file_path):
     return loads(open(file_path, encoding='utf-8').read())
 
 
-def print_friendly_message(result):
+def print_friendly_message(result, max_messages=None, report_file=None):
     """
     Customize returning message after comparing the value between two dictionaries.
 
     Result: The result after comparing two dictionaries.
+
+    The lines are rendered lazily by `iter_friendly_messages`, so only the returned lines are kept in memory.
+
+    - ``max_messages``: the maximum number of lines to return. The rest is summarized as
+      "... and 4,812 more differences".
+
+    - ``report_file``: the file path to write the full message instead of keeping it in the Robot log.
+      Only the first 10 lines are returned if ``max_messages`` is not given.
     """
     try:
-        message = ""
-        for arr in result:
-            msg = ""
-            if str(arr[0]) == 'change':
-                elements = ""
-                flags = False
-                if isinstance(arr[1], str):
-                    msg = "The value of \"{}\" is changed from \"{}\" to \"{}\"\n".format(str(arr[1]), str(arr[2][0]),
-                                                                                          str(arr[2][1]))
-                elif isinstance(arr[1], list):
-                    narr = arr[1]
-                    for i in range(len(narr)):
-                        elements += str(narr[i]) + "."
-                        if isinstance(narr[i], int):
-                            flags = True
-                            list1 = narr[0:i]
-                            for j in range(len(list1)):
-                                nlist1 = ".".join(list1)
-                            list2 = narr[i + 1:]
-                            for k in range(len(list2)):
-                                nlist2 = ".".join(list2)
-                            msg = "The value of \"{}\" at index \"{}\" of \"{}\" is changed from \"{}\" to \"{}\"\n".format(
-                                nlist2, narr[i], nlist1, str(arr[2][0]), str(arr[2][1]))
-                            break
-                    if flags == False:
-                        elements = elements[:-1]
-                        msg = "The value of \"{}\" is changed from \"{}\" to \"{}\"\n".format(elements, str(arr[2][0]),
-                                                                                              str(arr[2][1]))
-            elif str(arr[0]) == "remove":
-                if str(arr[1]) == "":
-                    msg = "The attribute \"{}\" is removed from actual result\n".format(str(arr[2][0][0]))
-                elif isinstance(arr[1], list):
-                    msg = "The attribute \"{}\" at index \"{}\" of \"{}.{}\" is removed into actual result\n".format(
-                        str(arr[2][0][0]), str(arr[1][2]), str(arr[1][0]), str(arr[1][1]))
+        if max_messages is None and report_file:
+            max_messages = REPORT_FILE_MAX_MESSAGES
+        lines = []
+        more = 0
+        report = open(report_file, 'w', encoding='utf-8') if report_file else None
+        try:
+            for line in iter_friendly_messages(result):
+                if report:
+                    report.write(line + '\n')
+                if max_messages is None or len(lines) < int(max_messages):
+                    lines.append(line)
                 else:
-                    msg = "The attribute \"{}.{}\" is removed from actual result\n".format(str(arr[1]),
-                                                                                           str(arr[2][0][0]))
-            elif str(arr[0]) == "add":
-                if str(arr[1]) == "":
-                    msg = "The attribute \"{}\" is added into actual result\n".format(str(arr[2][0][0]))
-                elif isinstance(arr[1], list):
-                    msg = "The attribute \"{}\" at index \"{}\" of \"{}.{}\" is added into actual result\n".format(
-                        str(arr[2][0][0]), str(arr[1][2]), str(arr[1][0]), str(arr[1][1]))
-                else:
-                    msg = "The attribute \"{}.{}\" is added into actual result\n".format(str(arr[1]), str(arr[2][0][0]))
-            message += msg
-        message = message[:-1]
-        return message
+                    more += 1
+        finally:
+            if report:
+                report.close()
+        if more:
+            lines.append("... and {:,} more {}".format(more, "difference" if more == 1 else "differences"))
+        if report_file:
+            logger.info(f"The full message is written to '{report_file}'")
+        return "\n".join(lines)
     except Exception as e:
         logger.error('Print Message Value method: ' + str(e))
+        raise
+
+
+def iter_friendly_messages(result):
+    """
+    Yield a friendly message line for each difference of the result after comparing two dictionaries.
+    """
+    for arr in result:
+        msg = format_friendly_message(arr)
+        if msg:
+            yield msg
+
+
+def format_friendly_message(arr) -> str:
+    """
+    Returns a friendly message of one difference from dictdiffer, ex. ('change', 'data.accNumber', (1, 2)).
+    """
+    msg = ""
+    if str(arr[0]) == 'change':
+        if isinstance(arr[1], str):
+            msg = "The value of \"{}\" is changed from \"{}\" to \"{}\"".format(str(arr[1]), str(arr[2][0]),
+                                                                                str(arr[2][1]))
+        elif isinstance(arr[1], list):
+            narr = arr[1]
+            index = next((i for i in range(len(narr)) if isinstance(narr[i], int)), None)
+            if index is not None:
+                nlist1 = ".".join(str(element) for element in narr[:index])
+                nlist2 = ".".join(str(element) for element in narr[index + 1:])
+                msg = "The value of \"{}\" at index \"{}\" of \"{}\" is changed from \"{}\" to \"{}\"".format(
+                    nlist2, narr[index], nlist1, str(arr[2][0]), str(arr[2][1]))
+            else:
+                elements = ".".join(str(element) for element in narr)
+                msg = "The value of \"{}\" is changed from \"{}\" to \"{}\"".format(elements, str(arr[2][0]),
+                                                                                    str(arr[2][1]))
+    elif str(arr[0]) == "remove":
+        if str(arr[1]) == "":
+            msg = "The attribute \"{}\" is removed from actual result".format(str(arr[2][0][0]))
+        elif isinstance(arr[1], list):
+            msg = "The attribute \"{}\" at index \"{}\" of \"{}.{}\" is removed into actual result".format(
+                str(arr[2][0][0]), str(arr[1][2]), str(arr[1][0]), str(arr[1][1]))
+        else:
+            msg = "The attribute \"{}.{}\" is removed from actual result".format(str(arr[1]), str(arr[2][0][0]))
+    elif str(arr[0]) == "add":
+        if str(arr[1]) == "":
+            msg = "The attribute \"{}\" is added into actual result".format(str(arr[2][0][0]))
+        elif isinstance(arr[1], list):
+            msg = "The attribute \"{}\" at index \"{}\" of \"{}.{}\" is added into actual result".format(
+                str(arr[2][0][0]), str(arr[1][2]), str(arr[1][0]), str(arr[1][1]))
+        else:
+            msg = "The attribute \"{}.{}\" is added into actual result".format(str(arr[1]), str(arr[2][0][0]))
+    return msg
 
 
 def check_type(actual, expect):
@@ -152,7 +186,7 @@ def get_list_testdata(path: str, filetype: str) -> list:
 @keyword(name="Upload Image Without Data", tags=(TAG,))
 def upload_image_without_data(url, filepath):
     """
-    Upload an image without data from the path given.
+    Upload an image without data from the path given by the shared HTTP session (`Configure HTTP Session`).
 
     Example:
 
@@ -160,8 +194,8 @@ def upload_image_without_data(url, filepath):
 
     Return: HTML Status Code (Ex: 200, 400, 500 . . .)
     """
-    files = {'media': open(filepath, 'rb')}
-    response = requests.post(url, files=files, verify=False)
+    with open(filepath, 'rb') as media:
+        response = get_http_session().post(url, files={'media': media}, verify=False)
     return response.status_code
 
 
@@ -2,8 +2,12 @@
 This module provides keywords to support xml processing.
 """
 
-
+import os
+import re
+import tempfile
+from xml import sax
 from xml.etree import ElementTree as et
+from xml.sax.saxutils import XMLGenerator
 from robot.api import logger
 from robot.api.deco import keyword
 
@@ -11,7 +15,18 @@ from robot.api.deco import keyword
 TAG = 'xml'
 __all__ = [
     'update_value_to_xml',
-    'adjust_xml_to_zeep_format']
+    'update_values_to_xml',
+    'adjust_xml_to_zeep_format',
+    'open_xml_document',
+    'update_value_in_xml_document',
+    'update_values_in_xml_document',
+    'get_value_from_xml_document',
+    'get_values_from_xml_document',
+    'convert_xml_document_to_string',
+    'save_xml_document']
+
+# a path of tag names only can be answered by the element index, other paths are left to ElementTree
+SIMPLE_PATH = re.compile(r'^[\w\-]+(/[\w\-]+)*$')
 
 
 @keyword(name="Update Value To XML File", tags=(TAG,))
@@ -24,15 +39,298 @@ def update_value_to_xml(data_file, path, value, encode="UTF-8"):
 
     Return type: bool
     """
-    tree = et.parse(data_file)
-    path = str(path).replace('.', '/')
-    logger.info(f"{path}")
+    update_values_to_xml(data_file, {path: value}, encode)
+
+
+@keyword(name="Update Values To XML File", tags=(TAG,))
+def update_values_to_xml(data_file, values: dict, encode="UTF-8", streaming=False):
+    """
+    Update many values in xml file follow by paths (json path) with one read and one write.
+
+    Arguments:
+
+    - ``data_file``: the xml file.
+
+    - ``values``: a dictionary of paths and values.
+
+    - ``encode``: the encoding of the written file.
+
+    - ``streaming``: If true, the file is copied element by element to a temporary file which replaces it at the end,
+      so the memory stays flat for very large files. Paths are matched by local names without namespaces.
+
+    Example:
+    | &{values} = | Create Dictionary | header.appId=681 | header.rqUID=681_20200701_000000000000102 |
+    | Update Values To XML File | request.xml | ${values} |
+    | Update Values To XML File | big_request.xml | ${values} | streaming=True |
+    """
+    if streaming:
+        stream_update_values_to_xml(data_file, values, encode)
+        return
+    document = XMLDocument(data_file, encode)
+    document.update_values(values)
+    document.save()
+
+
+def stream_update_values_to_xml(data_file, values: dict, encode="UTF-8"):
+    """
+    Update many values in xml file without loading the whole document into memory.
+    """
+    paths = {tuple(str(path).split('.')): value for path, value in values.items()}
+    folder = os.path.dirname(os.path.abspath(data_file))
+    handle, temp_file = tempfile.mkstemp(suffix='.xml', dir=folder)
     try:
-        tree.find(f'.//{path}').text = value
-    except Exception as info:
-        logger.info(f"update_value_to_xml {info}")
-        pass
-    tree.write(data_file, encoding=encode)
+        with os.fdopen(handle, 'w', encoding=encode, newline='') as output:
+            updater = XMLStreamUpdater(XMLGenerator(output, encode, short_empty_elements=True), paths)
+            parser = sax.make_parser()
+            parser.setFeature(sax.handler.feature_namespaces, True)
+            parser.setContentHandler(updater)
+            parser.parse(data_file)
+        # keep permissions of the replaced file, mkstemp creates the file for the owner only
+        os.chmod(temp_file, os.stat(data_file).st_mode)
+        os.replace(temp_file, data_file)
+    except BaseException:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+    for path in updater.pending:
+        logger.info(f"update_value_to_xml {'/'.join(path)} is not found")
+
+
+class XMLStreamUpdater(sax.handler.ContentHandler):
+    """
+    This is a class for copying SAX events to a generator and replacing the text of the first element
+    found by each path.
+    """
+
+    def __init__(self, generator: XMLGenerator, paths: dict):
+        super().__init__()
+        self.generator = generator
+        self.pending = dict(paths)
+        self.__stack = []
+        self.__skip_text = False
+
+    def startDocument(self):
+        self.generator.startDocument()
+
+    def endDocument(self):
+        self.generator.endDocument()
+
+    def startPrefixMapping(self, prefix, uri):
+        self.generator.startPrefixMapping(prefix, uri)
+
+    def endPrefixMapping(self, prefix):
+        self.generator.endPrefixMapping(prefix)
+
+    def startElementNS(self, name, qname, attrs):
+        self.generator.startElementNS(name, qname, attrs)
+        self.__stack.append(name[1])
+        self.__skip_text = False
+        for path in self.pending:
+            if tuple(self.__stack[-len(path):]) == path:
+                value = self.pending.pop(path)
+                self.generator.characters('' if value is None else str(value))
+                # the old text is replaced until the first child element like ElementTree text
+                self.__skip_text = True
+                break
+
+    def endElementNS(self, name, qname):
+        self.__stack.pop()
+        self.__skip_text = False
+        self.generator.endElementNS(name, qname)
+
+    def characters(self, content):
+        if not self.__skip_text:
+            self.generator.characters(content)
+
+    def ignorableWhitespace(self, whitespace):
+        self.generator.ignorableWhitespace(whitespace)
+
+    def processingInstruction(self, target, data):
+        self.generator.processingInstruction(target, data)
+
+
+class XMLDocument:
+    """
+    This is a class for keeping a parsed xml file in memory until it is saved.
+
+    Found elements are cached by path. Paths of tag names only are found in an index of elements by their tag
+    paths which is built on the first find. The cache and the index stay valid because only texts are updated.
+    """
+
+    def __init__(self, data_file: str, encode: str = "UTF-8"):
+        self.data_file = data_file
+        self.encode = encode
+        self.tree = et.parse(data_file)
+        self.root = self.tree.getroot()
+        self.__found = {}
+        self.__index = None
+
+    @staticmethod
+    def to_xpath(path: str) -> str:
+        """
+        Returns the xpath of the path (json path) like `Update Value To XML File`.
+        """
+        return str(path).replace('.', '/')
+
+    def __build_index(self) -> dict:
+        index = {}
+        # iterative pre-order walk, so the elements of each tag path are in document order
+        stack = [(child, (child.tag,)) for child in reversed(self.root)]
+        position = 0
+        while stack:
+            element, tags = stack.pop()
+            index.setdefault(tags, []).append((position, element))
+            position += 1
+            stack.extend((child, tags + (child.tag,)) for child in reversed(element))
+        return index
+
+    def findall(self, path: str) -> list:
+        """
+        Returns all elements found by the path (json path) in document order.
+        """
+        xpath = self.to_xpath(path)
+        if xpath not in self.__found:
+            if SIMPLE_PATH.match(xpath):
+                if self.__index is None:
+                    self.__index = self.__build_index()
+                tags = tuple(xpath.split('/'))
+                found = [item for key, items in self.__index.items() if key[-len(tags):] == tags for item in items]
+                self.__found[xpath] = [element for _, element in sorted(found, key=lambda item: item[0])]
+            else:
+                self.__found[xpath] = self.root.findall(f'.//{xpath}')
+        return list(self.__found[xpath])
+
+    def find(self, path: str):
+        """
+        Returns the first element found by the path (json path) or None.
+        """
+        found = self.findall(path)
+        return found[0] if found else None
+
+    def update_value(self, path: str, value):
+        """
+        Update text of the first element found by the path (json path).
+        """
+        logger.info(f"{self.to_xpath(path)}")
+        try:
+            self.find(path).text = value
+        except Exception as info:
+            logger.info(f"update_value_to_xml {info}")
+
+    def update_values(self, values: dict):
+        """
+        Update texts of the first elements found by the paths (json path).
+        """
+        for path, value in values.items():
+            self.update_value(path, value)
+
+    def serialize(self) -> str:
+        """
+        Returns the document as a string.
+        """
+        return et.tostring(self.root, encoding='unicode')
+
+    def save(self, data_file: str = None, encode: str = None):
+        """
+        Write the document to the file, the opened file is used if it is not given.
+        """
+        self.tree.write(data_file or self.data_file, encoding=encode or self.encode)
+
+    def __str__(self):
+        return f'XML document: {self.data_file}'
+
+
+@keyword(name="Open XML Document", tags=(TAG,))
+def open_xml_document(data_file, encode="UTF-8") -> XMLDocument:
+    """
+    Open xml file into memory to update and find values many times without reading and writing the file.
+    The file is written only by `Save XML Document`.
+
+    Example:
+    | ${document} = | Open XML Document | request.xml |
+    | Update Value In XML Document | ${document} | header.appId | 681 |
+    | ${app_id} = | Get Value From XML Document | ${document} | header.appId |
+    | Save XML Document | ${document} |
+    """
+    return XMLDocument(data_file, encode)
+
+
+@keyword(name="Update Value In XML Document", tags=(TAG,))
+def update_value_in_xml_document(document: XMLDocument, path, value):
+    """
+    Update value in the opened xml document follow by path (json path).
+
+    Example:
+    | Update Value In XML Document | ${document} | header.appId | 681 |
+    """
+    document.update_value(path, value)
+
+
+@keyword(name="Update Values In XML Document", tags=(TAG,))
+def update_values_in_xml_document(document: XMLDocument, values: dict):
+    """
+    Update many values in the opened xml document follow by paths (json path).
+
+    Example:
+    | &{values} = | Create Dictionary | header.appId=681 | header.rqUID=681_20200701_000000000000102 |
+    | Update Values In XML Document | ${document} | ${values} |
+    """
+    document.update_values(values)
+
+
+@keyword(name="Get Value From XML Document", tags=(TAG,))
+def get_value_from_xml_document(document: XMLDocument, path):
+    """
+    Get text of the first element found by path (json path) in the opened xml document.
+
+    Example:
+    | ${app_id} = | Get Value From XML Document | ${document} | header.appId |
+
+    Return type: string
+    """
+    element = document.find(path)
+    if element is None:
+        raise ValueError(f'{path} is not found in {document.data_file}')
+    return element.text
+
+
+@keyword(name="Get Values From XML Document", tags=(TAG,))
+def get_values_from_xml_document(document: XMLDocument, path) -> list:
+    """
+    Get texts of all elements found by path (json path) in the opened xml document.
+
+    Example:
+    | @{error_codes} = | Get Values From XML Document | ${document} | errors.error.errorCode |
+
+    Return Type: List
+    """
+    return [element.text for element in document.findall(path)]
+
+
+@keyword(name="Convert XML Document To String", tags=(TAG,))
+def convert_xml_document_to_string(document: XMLDocument) -> str:
+    """
+    Convert the opened xml document to a string.
+
+    Example:
+    | ${body} = | Convert XML Document To String | ${document} |
+
+    Return type: string
+    """
+    return document.serialize()
+
+
+@keyword(name="Save XML Document", tags=(TAG,))
+def save_xml_document(document: XMLDocument, data_file=None, encode=None):
+    """
+    Write the opened xml document to the file. It is written to the opened file if ``data_file`` is not given.
+
+    Example:
+    | Save XML Document | ${document} |
+    | Save XML Document | ${document} | request_copy.xml |
+    """
+    document.save(data_file, encode)
+
 
 @keyword(name="Convert XML File To Zeep XML File", tags=(TAG,))
 def adjust_xml_to_zeep_format(data_file, encode="UTF-8"):